@@ -1,51 +1,28 @@
+from alphabet import mod_inverse  # extended Euclid, None if no inverse
+from substitution import affine_translate
 
-def mod_inverse(a, m):
-    for i in range(1, m):
-        if (a * i) % m == 1:
-            return i
-    return None
+def encrypt(text, a, b, alphabet=None):
+    # (a * x + b) % 26 for every letter, via a cached translation table
+    # (or modulo the size of an Alphabet from alphabet.py)
+    return affine_translate(text, a, b, alphabet=alphabet)
 
-def encrypt(text, a, b):
-    result = ""
-    for char in text:
-        if char.isalpha():
-            if char.isupper():
-                x = ord(char) - ord('A')
-                encrypted = (a * x + b) % 26
-                result += chr(encrypted + ord('A'))
-            else:
-                x = ord(char) - ord('a')
-                encrypted = (a * x + b) % 26
-                result += chr(encrypted + ord('a'))
-        else:
-            result += char
-    return result
-
-def decrypt(text, a, b):
+def decrypt(text, a, b, alphabet=None):
+    if alphabet is not None:
+        a_inv, b_inv = alphabet.affine_inverse(a, b)
+        return affine_translate(text, a_inv, b_inv, alphabet=alphabet)
     a_inv = mod_inverse(a, 26)
-    result = ""
-    for char in text:
-        if char.isalpha():
-            if char.isupper():
-                y = ord(char) - ord('A')
-                decrypted = (a_inv * (y - b)) % 26
-                result += chr(decrypted + ord('A'))
-            else:
-                y = ord(char) - ord('a')
-                decrypted = (a_inv * (y - b)) % 26
-                result += chr(decrypted + ord('a'))
-        else:
-            result += char
-    return result
+    # a_inv * (y - b) is the affine map y -> a_inv*y - a_inv*b
+    return affine_translate(text, a_inv, -a_inv * b)
 
 
-a = 5  
-b = 8
-plaintext = "Hello"
+if __name__ == "__main__":
+    a = 5  
+    b = 8
+    plaintext = "Hello"
 
-encrypted = encrypt(plaintext, a, b)
-print(f"Plaintext: {plaintext}")
-print(f"Encrypted: {encrypted}")
+    encrypted = encrypt(plaintext, a, b)
+    print(f"Plaintext: {plaintext}")
+    print(f"Encrypted: {encrypted}")
 
-decrypted = decrypt(encrypted, a, b)
-print(f"Decrypted: {decrypted}")
\ No newline at end of file
+    decrypted = decrypt(encrypted, a, b)
+    print(f"Decrypted: {decrypted}")
\ No newline at end of file
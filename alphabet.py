@@ -0,0 +1,121 @@
+# ===============================================================
+# ALPHABETS - INDEX MAPS AND MODULAR INVERSE TABLES
+# ===============================================================
+# Libraries needed: string (built-in)
+# Description: The classical ciphers all work on letter POSITIONS modulo
+# the alphabet size m.  An Alphabet precomputes, once:
+#
+#   - the position of every symbol (and the symbol at every position)
+#   - the multiplicative inverse of every number modulo m (or None)
+#
+# so a cipher over any alphabet costs the same per character as the
+# hard-coded 26-letter versions.  An alphabet may have several "rows" of
+# the same length that share positions: LETTERS has an uppercase and a
+# lowercase row, so 'a' and 'A' are both position 0 and a cipher keeps
+# the case of every letter (the behaviour of the original functions).
+#
+# Inverses use the extended Euclidean algorithm, which needs only
+# O(log m) steps - fine for large moduli where a linear search is not.
+# ===============================================================
+
+import string
+
+
+def egcd(a, b):
+    """Extended Euclid: return (g, x, y) with a*x + b*y == g == gcd(a, b)"""
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+
+def mod_inverse(a, m):
+    """Return x with (a * x) % m == 1, or None if no inverse exists"""
+    g, x, _ = egcd(a % m, m)
+    if g != 1:
+        return None
+    return x % m
+
+
+class Alphabet:
+    """
+    A cipher alphabet.
+
+    Args:
+        rows: one or more strings of the same length; every row maps its
+              symbols to positions 0..m-1 (several rows = several cases)
+        name: label used in repr()
+    """
+
+    def __init__(self, *rows, name=None):
+        if not rows or not rows[0] or any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError("Alphabet rows must be non-empty and the same length")
+        self.rows = tuple(rows)
+        self.size = len(rows[0])
+        self.name = name
+
+        # symbol -> (row, position)
+        self.index = {}
+        for r, row in enumerate(rows):
+            for i, ch in enumerate(row):
+                self.index.setdefault(ch, (r, i))
+        # Every symbol once, within a row and across rows (a repeat would
+        # make the cipher maps non-bijective)
+        if len(self.index) != sum(len(row) for row in rows):
+            raise ValueError("Alphabet symbols must be unique")
+        self.position = {ch: i for ch, (_, i) in self.index.items()}
+
+        # inverses[a] = inverse of a modulo size (None if gcd(a, size) != 1)
+        self.inverses = [mod_inverse(a, self.size) for a in range(self.size)]
+        # Every symbol fits in a byte -> bytes input can be supported too
+        self.single_byte = all(ord(ch) < 256 for ch in self.index)
+
+    def __repr__(self):
+        return f"Alphabet({self.name or self.rows!r}, size={self.size})"
+
+    def __eq__(self, other):
+        return isinstance(other, Alphabet) and self.rows == other.rows
+
+    def __hash__(self):
+        return hash(self.rows)
+
+    def inverse(self, a):
+        """Inverse of a modulo the alphabet size, or None"""
+        return self.inverses[a % self.size]
+
+    def units(self):
+        """All valid multiplicative keys (numbers with an inverse)"""
+        return [a for a, inv in enumerate(self.inverses) if inv is not None]
+
+    def affine_inverse(self, a, b):
+        """Return the (a, b) pair that undoes x -> (a * x + b) % size"""
+        a_inv = self.inverse(a)
+        if a_inv is None:
+            raise ValueError("No multiplicative inverse exists for this key!")
+        return a_inv, (-a_inv * b) % self.size
+
+    def key_shifts(self, key):
+        """Vigenère shifts: the position of every key symbol"""
+        try:
+            return [self.position[k] for k in key]
+        except KeyError as e:
+            raise ValueError(f"Key symbol {e.args[0]!r} is not in {self!r}") from None
+
+    def affine_map(self, a, b):
+        """{ord(symbol): ord(new symbol)} for x -> (a * x + b) % size"""
+        m = self.size
+        return {
+            ord(ch): ord(self.rows[r][(a * i + b) % m])
+            for ch, (r, i) in self.index.items()
+        }
+
+
+# Ready-made alphabets
+UPPERCASE = Alphabet(string.ascii_uppercase, name="uppercase")
+LETTERS = Alphabet(string.ascii_uppercase, string.ascii_lowercase, name="letters")
+MIXED_CASE = Alphabet(string.ascii_uppercase + string.ascii_lowercase, name="mixed case")
+ALPHANUMERIC = Alphabet(string.ascii_uppercase + string.ascii_lowercase + string.digits,
+                        name="alphanumeric")
+PRINTABLE = Alphabet("".join(chr(c) for c in range(32, 127)), name="printable")
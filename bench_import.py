@@ -0,0 +1,75 @@
+# ===============================================================
+# BENCHMARK - IMPORT TIME OF EVERY MODULE
+# ===============================================================
+# Imports each module in a fresh interpreter and reports how long the
+# import took, how many lines it printed (should be 0) and which heavy
+# backends (NumPy, cryptography, PyCryptodome) it pulled in (should be
+# none - they are loaded lazily, see lazy.py).  The backends themselves
+# are timed too, for reference.
+#
+# Usage: python bench_import.py [--repeat N] [modules ...]
+# ===============================================================
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "cipherss", "breakingdes", "labassignment1", "Labassignment2", "firstcipher",
+    "hhashing", "substitution", "alphabet", "vigenere", "otp", "keypool",
+    "desfilter", "vigenere_crack", "ngram_model", "classical_crack",
+    "filehash", "hmac_cache", "fernet_stream", "fernet_rotate", "cli", "metrics", "scheduler", "crypto_service",
+    "columnar",
+]
+BACKENDS = ["numpy", "cryptography.fernet", "Crypto.Cipher.DES"]
+HEAVY = ("numpy", "cryptography", "Crypto")
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}), file=sys.stderr)
+"""
+
+
+def probe(module):
+    """Import module in a new interpreter; returns (seconds, printed lines, heavy modules)"""
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+        capture_output=True, text=True, stdin=subprocess.DEVNULL,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr}")
+    report = json.loads(proc.stderr.strip().splitlines()[-1])
+    return report["seconds"], len(proc.stdout.splitlines()), report["heavy"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of every module")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh imports per module")
+    args = parser.parse_args()
+
+    print(f"{'module':<22} {'median ms':>10} {'printed':>8}  heavy backends loaded")
+    print("=" * 70)
+    for group in (args.modules, BACKENDS):
+        for module in group:
+            try:
+                runs = [probe(module) for _ in range(args.repeat)]
+            except RuntimeError as e:
+                print(f"{module:<22} {'error':>10}  {str(e).splitlines()[-1]}")
+                continue
+            median = statistics.median(seconds for seconds, _, _ in runs)
+            printed = runs[0][1]
+            heavy = ", ".join(runs[0][2]) or "-"
+            print(f"{module:<22} {median * 1000:10.1f} {printed:8d}  {heavy}")
+        if group is args.modules:
+            print("-" * 70 + "\nfor reference:")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# ===============================================================
+# BENCHMARK - OTP KEY GENERATION
+# ===============================================================
+# Compares the old random.randint-per-byte generator with
+# secrets.token_bytes and the prefetching KeyPool.
+#
+# Usage: python bench_keypool.py [--keys N] [--length BYTES]
+# ===============================================================
+
+import argparse
+import random
+import secrets
+import time
+
+from keypool import KeyPool
+
+
+def randint_key(length):
+    """The original otp_generate_key (for comparison)"""
+    return [random.randint(0, 255) for _ in range(length)]
+
+
+def run(func, keys, length):
+    """Generate 'keys' keys and return the elapsed time"""
+    start = time.perf_counter()
+    for _ in range(keys):
+        func(length)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OTP key generation throughput")
+    parser.add_argument("--keys", type=int, default=20000, help="keys to generate")
+    parser.add_argument("--length", type=int, default=256, help="key length in bytes")
+    args = parser.parse_args()
+
+    with KeyPool() as pool:
+        time.sleep(0.2)  # let the refill thread fill the pool first
+        cases = [
+            ("random.randint per byte", randint_key),
+            ("secrets.token_bytes    ", secrets.token_bytes),
+            ("KeyPool.take           ", pool.take),
+            ("KeyPool.take_view      ", pool.take_view),
+        ]
+
+        print(f"{args.keys} keys of {args.length} bytes")
+        print("=" * 60)
+        for name, func in cases:
+            seconds = run(func, args.keys, args.length)
+            mb = args.keys * args.length / (1024 * 1024)
+            print(f"{name}: {args.keys / seconds:12.0f} keys/s  {mb / seconds:8.1f} MB/s")
+
+        print("\nPool stats:", pool.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# ===============================================================
+# BENCHMARK - PER-CHARACTER LOOP vs TABLE-DRIVEN SUBSTITUTION
+# ===============================================================
+# Compares the old "result += chr(...)" Caesar / affine loops with the
+# cached translation tables in substitution.py and prints MB/s.
+#
+# Usage: python bench_substitution.py [--size MB] [--repeat N]
+# ===============================================================
+
+import argparse
+import random
+import string
+import time
+
+from substitution import affine_translate, caesar_translate
+
+
+def loop_caesar(text, shift):
+    """The original per-character Caesar loop (for comparison)"""
+    result = ""
+    for ch in text:
+        if ch.isalpha():
+            base = ord('A') if ch.isupper() else ord('a')
+            new_pos = (ord(ch) - base + shift) % 26
+            result += chr(new_pos + base)
+        else:
+            result += ch
+    return result
+
+
+def loop_affine(text, a, b):
+    """The original per-character affine loop (for comparison)"""
+    result = ""
+    for char in text:
+        if char.isalpha():
+            base = ord('A') if char.isupper() else ord('a')
+            result += chr((a * (ord(char) - base) + b) % 26 + base)
+        else:
+            result += char
+    return result
+
+
+def make_payload(size):
+    """Random English-looking text of 'size' characters"""
+    rng = random.Random(1234)
+    alphabet = string.ascii_letters + "     ,.!\n"
+    return "".join(rng.choices(alphabet, k=size))
+
+
+def measure(func, repeat):
+    """Return the best wall time of 'repeat' runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Substitution cipher throughput")
+    parser.add_argument("--size", type=float, default=4, help="payload size in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = make_payload(int(args.size * 1024 * 1024))
+    data = text.encode("ascii")
+    mb = len(text) / (1024 * 1024)
+
+    cases = [
+        ("caesar  loop      (str)", lambda: loop_caesar(text, 3)),
+        ("caesar  table     (str)", lambda: caesar_translate(text, 3)),
+        ("caesar  table   (bytes)", lambda: caesar_translate(data, 3)),
+        ("affine  loop      (str)", lambda: loop_affine(text, 5, 8)),
+        ("affine  table     (str)", lambda: affine_translate(text, 5, 8)),
+        ("affine  table   (bytes)", lambda: affine_translate(data, 5, 8)),
+    ]
+
+    print(f"Payload: {mb:.1f} MB, best of {args.repeat}")
+    print("=" * 60)
+    for name, func in cases:
+        seconds = measure(func, args.repeat)
+        print(f"{name}: {mb / seconds:10.1f} MB/s  ({seconds * 1000:8.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
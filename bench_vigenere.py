@@ -0,0 +1,62 @@
+# ===============================================================
+# BENCHMARK - VIGENÈRE PYTHON LOOP vs NUMPY BACKEND
+# ===============================================================
+# Usage: python bench_vigenere.py [--size MB] [--repeat N]
+# ===============================================================
+
+import argparse
+
+import vigenere
+from bench_substitution import make_payload, measure
+
+
+def loop_vigenere(text, key):
+    """The original per-character Vigenère loop (for comparison)"""
+    result = ""
+    key = key.lower()
+    klen = len(key)
+    key_index = 0
+    for ch in text:
+        if ch.isalpha():
+            base = ord('A') if ch.isupper() else ord('a')
+            shift = ord(key[key_index % klen]) - ord('a')
+            result += chr((ord(ch) - base + shift) % 26 + base)
+            key_index += 1
+        else:
+            result += ch
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vigenère cipher throughput")
+    parser.add_argument("--size", type=float, default=4, help="payload size in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--key", default="lemon")
+    args = parser.parse_args()
+
+    text = make_payload(int(args.size * 1024 * 1024))
+    data = text.encode("ascii")
+    mb = len(text) / (1024 * 1024)
+    shifts = vigenere.key_shifts(args.key)
+
+    cases = [
+        ("original loop     (str)", lambda: loop_vigenere(text, args.key)),
+        ("python backend    (str)", lambda: vigenere._transform_str(text, shifts, 0)),
+    ]
+    if vigenere.np is not None:
+        cases += [
+            ("numpy backend     (str)", lambda: vigenere.vigenere_encrypt(text, args.key)),
+            ("numpy backend   (bytes)", lambda: vigenere.vigenere_encrypt(data, args.key)),
+        ]
+    else:
+        print("NumPy not installed - only the pure Python backend is measured")
+
+    print(f"Payload: {mb:.1f} MB, best of {args.repeat}")
+    print("=" * 60)
+    for name, func in cases:
+        seconds = measure(func, args.repeat)
+        print(f"{name}: {mb / seconds:10.1f} MB/s  ({seconds * 1000:8.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
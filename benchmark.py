@@ -0,0 +1,328 @@
+# ===============================================================
+# BENCHMARK HARNESS - EVERY CIPHER, HASH AND ATTACK
+# ===============================================================
+# Libraries needed: cryptography, pycryptodome (optional - their cases
+# are skipped when missing)
+# Description: Times every primitive of cipherss.py (Caesar, Vigenère,
+# transposition - reversal, columnar and double columnar - both OTP
+# versions, Fernet, MD5, SHA-256, HMAC), the multiplicative
+# (labassignment1.py) and affine (Labassignment2.py) ciphers, and the
+# DES key test rate of breakingdes.py.
+#
+# Every case runs at every input size (16 B ... 100 MB by default); each
+# call is timed on its own, so besides throughput we report latency
+# percentiles (p50 / p90 / p99).  Results can be saved as a JSON
+# baseline and a later run compared against it: cases whose throughput
+# dropped by more than --threshold are flagged as regressions (exit
+# status 1).
+#
+# Usage:
+#   python benchmark.py                                  # all cases
+#   python benchmark.py --sizes 16,1K,1M --cases caesar,des_check_key
+#   python benchmark.py --save baseline.json
+#   python benchmark.py --compare baseline.json --threshold 0.15
+# ===============================================================
+
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+
+from bench_substitution import make_payload
+from metrics import percentile
+
+DEFAULT_SIZES = "16,1K,64K,1M,16M,100M"
+# Key counts per call for the DES key-rate cases
+DES_SIZES = (256, 4096)
+
+# A call is repeated until both limits are reached (or MAX_RUNS)
+MIN_TIME = 0.5
+MIN_RUNS = 3
+MAX_RUNS = 10000
+
+# Numeric OTP works on Python lists of ints (8+ bytes per character)
+OTP_LIST_MAX = 16 << 20
+
+_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text):
+    """'16' -> 16, '64K' -> 65536, '1M' -> 1048576"""
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in _UNITS:
+        return int(float(text[:-1]) * _UNITS[text[-1]])
+    return int(text)
+
+
+def format_size(size):
+    for suffix, factor in (("G", 1 << 30), ("M", 1 << 20), ("K", 1 << 10)):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{suffix}"
+    return str(size)
+
+
+_payload_block = None
+
+
+def payload(size):
+    """ASCII text of 'size' characters (a 64 KB random block, repeated)"""
+    global _payload_block
+    if _payload_block is None:
+        _payload_block = make_payload(1 << 16)
+    repeats = size // len(_payload_block) + 1
+    return (_payload_block * repeats)[:size]
+
+
+# ---------------------------------------------------------------
+# Cases: each make(size) builds the input once and returns the
+# zero-argument function that is timed
+# ---------------------------------------------------------------
+
+class Case:
+    """
+    One benchmark.
+
+    Args:
+        name: case name (used in baselines)
+        make: make(size) -> function to time
+        unit: what 'size' counts ("B" for bytes, "keys" for keys)
+        sizes: fixed sizes instead of the --sizes list
+        max_size: skip larger sizes
+    """
+
+    def __init__(self, name, make, unit="B", sizes=None, max_size=None):
+        self.name = name
+        self.make = make
+        self.unit = unit
+        self.sizes = sizes
+        self.max_size = max_size
+
+
+def _cipherss_case(func_name, build_args):
+    def make(size):
+        func = getattr(importlib.import_module("cipherss"), func_name)
+        args = build_args(size)
+        return lambda: func(*args)
+    return make
+
+
+def _otp_args(size):
+    cipherss = importlib.import_module("cipherss")
+    return payload(size), cipherss.otp_generate_key(size)
+
+
+def _otp_string_args(size):
+    text = payload(size)
+    return text, payload(size + 7)[7:]
+
+
+def _fernet_make(size):
+    from cryptography.fernet import Fernet
+    fernet = Fernet(Fernet.generate_key())
+    data = payload(size).encode("ascii")
+    return lambda: fernet.encrypt(data)
+
+
+def _hmac_args(size):
+    return b"my_secret_key", payload(size).encode("ascii")
+
+
+def _multiplicative_make(size):
+    lab1 = importlib.import_module("labassignment1")
+    text = payload(size)
+    return lambda: lab1.encrypt(text, 7)
+
+
+def _affine_make(size):
+    lab2 = importlib.import_module("Labassignment2")
+    text = payload(size)
+    return lambda: lab2.encrypt(text, 5, 8)
+
+
+def _des_keys(count):
+    """'count' distinct 8-byte keys from the brute force key space"""
+    from keyspace import Keyspace
+    breakingdes = importlib.import_module("breakingdes")
+    keyspace = Keyspace(breakingdes.CHARSET, 4, pad_to=8)
+    return [bytes(key) for key in keyspace.iter_range(0, count)]
+
+
+def _des_check_make(count):
+    breakingdes = importlib.import_module("breakingdes")
+    keys = _des_keys(count)
+    check_key = breakingdes.check_key
+    return lambda: [check_key(key) for key in keys]
+
+
+def _des_raw_make(count):
+    from Crypto.Cipher import DES
+    breakingdes = importlib.import_module("breakingdes")
+    keys = _des_keys(count)
+    block = breakingdes.ciphertext[:8]  # key schedule + one block, no filtering
+    return lambda: [DES.new(key, DES.MODE_ECB).decrypt(block) for key in keys]
+
+
+CASES = [
+    Case("caesar", _cipherss_case("caesar_encrypt", lambda n: (payload(n), 3))),
+    Case("vigenere", _cipherss_case("vigenere_encrypt", lambda n: (payload(n), "lemon"))),
+    Case("transposition", _cipherss_case("transposition_encrypt", lambda n: (payload(n),))),
+    Case("columnar", _cipherss_case("transposition_encrypt", lambda n: (payload(n), "ZEBRAS"))),
+    Case("columnar_double", _cipherss_case("transposition_encrypt", lambda n: (payload(n), "ZEBRAS", "LEMON"))),
+    Case("otp_numeric", _cipherss_case("otp_encrypt", _otp_args), max_size=OTP_LIST_MAX),
+    Case("otp_string", _cipherss_case("otp_string_encrypt", _otp_string_args)),
+    Case("fernet", _fernet_make),
+    Case("md5", _cipherss_case("md5_hash", lambda n: (payload(n),))),
+    Case("sha256", _cipherss_case("sha256_hash", lambda n: (payload(n),))),
+    Case("hmac", _cipherss_case("create_hmac", _hmac_args)),
+    Case("multiplicative", _multiplicative_make),
+    Case("affine", _affine_make),
+    Case("des_check_key", _des_check_make, unit="keys", sizes=DES_SIZES),
+    Case("des_raw", _des_raw_make, unit="keys", sizes=DES_SIZES),
+]
+
+
+# ---------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------
+
+def measure(func, size, min_time=MIN_TIME, min_runs=MIN_RUNS, max_runs=MAX_RUNS):
+    """
+    Time func() repeatedly.
+
+    Returns:
+        Dict with runs, latency percentiles in ms and units per second
+        (size / median latency)
+    """
+    func()  # warm up (caches, lazy tables)
+    timings = []
+    clock = time.perf_counter
+    deadline = clock() + min_time
+    while len(timings) < max_runs and (len(timings) < min_runs or clock() < deadline):
+        start = clock()
+        func()
+        timings.append(clock() - start)
+    timings.sort()
+    p50 = percentile(timings, 0.50)
+    return {
+        "runs": len(timings),
+        "p50_ms": p50 * 1e3,
+        "p90_ms": percentile(timings, 0.90) * 1e3,
+        "p99_ms": percentile(timings, 0.99) * 1e3,
+        "per_sec": size / max(p50, 1e-12),
+    }
+
+
+def run(cases, sizes, min_time=MIN_TIME, min_runs=MIN_RUNS, max_runs=MAX_RUNS, out=sys.stdout):
+    """Run every case at every size; returns {"case/size": result}"""
+    results = {}
+    print(f"{'case':<16} {'size':>6} {'runs':>6} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10}  throughput",
+          file=out)
+    print("=" * 80, file=out)
+    for case in cases:
+        for size in case.sizes or sizes:
+            if case.max_size and size > case.max_size:
+                continue
+            label = f"{case.name}/{format_size(size)}"
+            try:
+                func = case.make(size)
+            except ImportError as e:
+                print(f"{label:<23} skipped ({e})", file=out)
+                break
+            result = measure(func, size, min_time, min_runs, max_runs)
+            result["unit"] = case.unit
+            results[label] = result
+            del func
+            if case.unit == "B":
+                rate = f"{result['per_sec'] / 1e6:10.1f} MB/s"
+            else:
+                rate = f"{result['per_sec']:10,.0f} {case.unit}/s"
+            print(f"{case.name:<16} {format_size(size):>6} {result['runs']:>6} {result['p50_ms']:>10.3f} "
+                  f"{result['p90_ms']:>10.3f} {result['p99_ms']:>10.3f}  {rate}", file=out)
+    return results
+
+
+# ---------------------------------------------------------------
+# Baselines
+# ---------------------------------------------------------------
+
+def save_baseline(results, path):
+    """Write results plus machine information as JSON"""
+    data = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+
+
+def compare(results, baseline):
+    """
+    Compare against a saved baseline.
+
+    Returns:
+        List of (label, old per_sec, new per_sec, change) for every case
+        present in both, where change = new / old - 1
+    """
+    rows = []
+    for label, result in results.items():
+        old = baseline["results"].get(label)
+        if old:
+            rows.append((label, old["per_sec"], result["per_sec"], result["per_sec"] / old["per_sec"] - 1))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every cipher, hash and attack")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma separated, e.g. 16,1K,1M")
+    parser.add_argument("--cases", help="comma separated case names (default: all)")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="seconds per case and size")
+    parser.add_argument("--min-runs", type=int, default=MIN_RUNS)
+    parser.add_argument("--max-runs", type=int, default=MAX_RUNS)
+    parser.add_argument("--save", help="write results to this JSON baseline")
+    parser.add_argument("--compare", help="compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="throughput drop that counts as a regression (default: 0.10)")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for case in CASES:
+            print(case.name)
+        return 0
+
+    cases = CASES
+    if args.cases:
+        wanted = set(args.cases.split(","))
+        unknown = wanted - {case.name for case in CASES}
+        if unknown:
+            parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+        cases = [case for case in CASES if case.name in wanted]
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+
+    results = run(cases, sizes, args.min_time, args.min_runs, args.max_runs)
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline)
+        regressions = [row for row in rows if row[3] < -args.threshold]
+        print(f"\nCompared with {args.compare} ({baseline.get('created', '?')}):")
+        for label, old, new, change in rows:
+            flag = "  REGRESSION" if change < -args.threshold else ""
+            print(f"  {label:<24} {change:+7.1%}{flag}")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,16 @@
 import base64
-from Crypto.Cipher import DES
-from Crypto.Util.Padding import unpad
-import itertools
+import multiprocessing
+import os
 import string
+import time
+
+from desfilter import DES, STAGES, CandidateFilter, des_key, effective_key, reduce_charset, reduction_ratio
+from keyspace import Checkpoint, Keyspace
+from metrics import Metrics
+from wordlist import BloomFilter, batched, iter_words, mangle
 
 # Your encrypted data
 encrypted_data = "QPmYtnxcXR7w3LgmlsAUIE6INgvEGts"
-print(f"Attempting to decrypt: {encrypted_data}")
 
 # Fix base64 padding
 def fix_base64_padding(b64_string):
@@ -16,42 +20,51 @@ def fix_base64_padding(b64_string):
         b64_string += '=' * (4 - missing_padding)
     return b64_string
 
-# Try to decode with fixed padding
-try:
-    fixed_b64 = fix_base64_padding(encrypted_data)
-    ciphertext = base64.b64decode(fixed_b64)
-    print(f"Successfully decoded {len(ciphertext)} bytes")
-except Exception as e:
-    print(f"Base64 decode error: {e}")
-    # Let's also try decoding as raw bytes
+def load_ciphertext(data, verbose=False):
+    """Decode the target (base64, else hex); returns None if neither works"""
+    log = print if verbose else (lambda *args: None)
+    log(f"Attempting to decrypt: {data}")
+
+    # Try to decode with fixed padding
     try:
-        ciphertext = bytes.fromhex(encrypted_data)
-        print(f"Interpreted as hex, got {len(ciphertext)} bytes")
-    except:
-        print("Cannot decode as base64 or hex")
-        exit()
-
-# Confirm this looks like DES (8 bytes) or AES (16 bytes)
-if len(ciphertext) % 8 != 0:
-    print(f"Warning: Length {len(ciphertext)} is not a multiple of 8")
-else:
-    print(f"Ciphertext length: {len(ciphertext)} bytes (likely {'DES' if len(ciphertext) <= 8 else 'DES/AES'})")
+        fixed_b64 = fix_base64_padding(data)
+        raw = base64.b64decode(fixed_b64)
+        log(f"Successfully decoded {len(raw)} bytes")
+    except Exception as e:
+        log(f"Base64 decode error: {e}")
+        # Let's also try decoding as raw bytes
+        try:
+            raw = bytes.fromhex(data)
+            log(f"Interpreted as hex, got {len(raw)} bytes")
+        except ValueError:
+            log("Cannot decode as base64 or hex")
+            return None
+
+    # Confirm this looks like DES (8 bytes) or AES (16 bytes)
+    if len(raw) % 8 != 0:
+        log(f"Warning: Length {len(raw)} is not a multiple of 8")
+    else:
+        log(f"Ciphertext length: {len(raw)} bytes (likely {'DES' if len(raw) <= 8 else 'DES/AES'})")
+    return raw
+
+# Decoded quietly on import; the report is printed when run as a script
+ciphertext = load_ciphertext(encrypted_data)
+
+# Staged checks for the current ciphertext (see desfilter.py)
+_filter = None
+
+def candidate_filter():
+    """Return the CandidateFilter for the current ciphertext"""
+    global _filter
+    if _filter is None or _filter.ciphertext is not ciphertext:
+        _filter = CandidateFilter(ciphertext)
+    return _filter
 
 def try_decrypt_des(key_candidate):
     """Attempt DES decryption with padding validation"""
-    try:
-        # Ensure 8-byte key
-        key_bytes = key_candidate.encode('utf-8')[:8].ljust(8, b'\x00')
-        cipher = DES.new(key_bytes, DES.MODE_ECB)
-        decrypted = cipher.decrypt(ciphertext)
-        # Try to unpad
-        plaintext = unpad(decrypted, DES.block_size)
-        # Validate as readable text
-        if all(32 <= c <= 126 or c in [10, 13] for c in plaintext):
-            return plaintext.decode('utf-8', errors='ignore')
-    except Exception as e:
-        pass
-    return None
+    # Padding is checked on the last block before decrypting the rest,
+    # then the plaintext is validated as readable text
+    return candidate_filter().decrypt_text(key_candidate)
 
 # Method 1: Check for ECB pattern (duplicate blocks)
 def analyze_ecb_pattern():
@@ -67,81 +80,486 @@ def analyze_ecb_pattern():
     return False
 
 # Method 2: Dictionary attack with common keys
-def dictionary_attack():
+# Common short keys/passwords
+COMMON_KEYS = [
+    "password", "123456", "admin", "root", "guest", "default",
+    "qwerty", "abc123", "letmein", "welcome", "monkey", "dragon",
+    "1234", "12345", "123456", "1234567", "12345678",
+    "PASSWORD", "ADMIN", "ROOT", "GUEST",
+    # Default keys sometimes used in implementations
+    "01234567", "abcdefgh", "DEADBEEF", "CAFEBABE"
+]
+
+def dictionary_attack(metrics=None):
     print("Trying dictionary attack...")
-    # Common short keys/passwords
-    common_keys = [
-        "password", "123456", "admin", "root", "guest", "default",
-        "qwerty", "abc123", "letmein", "welcome", "monkey", "dragon",
-        "1234", "12345", "123456", "1234567", "12345678",
-        "PASSWORD", "ADMIN", "ROOT", "GUEST",
-        # Default keys sometimes used in implementations
-        "01234567", "abcdefgh", "DEADBEEF", "CAFEBABE"
-    ]
+    common_keys = COMMON_KEYS
+    metrics = metrics or Metrics("dictionary_attack")
+    keys = metrics.counter("dictionary keys", total=len(common_keys))
     
-    for i, key in enumerate(common_keys):
-        if i % 10 == 0:
-            print(f"Tried {i}/{len(common_keys)} keys...")
-            
+    tried = set()  # effective (parity-stripped) keys already tested
+    with metrics.stage("dictionary"), metrics.progress(keys):
+        for i, key in enumerate(common_keys):
+            keys.value = i + 1
+
+            effective = effective_key(key)
+            if effective in tried:
+                continue  # same DES key as an earlier candidate
+            tried.add(effective)
+            result = try_decrypt_des(key)
+            if result and len(result.strip()) > 0:
+                print(f"SUCCESS! Key: '{key}'")
+                print(f"Plaintext: {result}")
+                metrics.info["key"] = key
+                return key, result
+    print(f"Tested {len(tried)} distinct DES keys out of {len(common_keys)} candidates")
+    return None, None
+
+# Method 2b: Dictionary attack with a real wordlist file
+# The file is streamed line by line and every word is expanded with
+# mangling rules (see wordlist.py) as it is read. Candidates whose DES key
+# was already tried are dropped by a Bloom filter sized from the file (at
+# most WORDLIST_CAPACITY keys), and the rest are tested in batches,
+# optionally on a process pool. A full filter would start dropping keys
+# that were never tried, so once it reaches its capacity it is switched
+# off (with a warning) and only the variants of each word are deduplicated.
+
+WORDLIST_BATCH = 5000        # candidates per batch
+WORDLIST_CAPACITY = 50000000  # most distinct keys the Bloom filter is sized for
+
+def wordlist_capacity(path, rules=True):
+    """
+    Upper bound on the candidates a wordlist can produce: every word line
+    takes at least 2 bytes, and mangling turns a word into at most
+    len(mangle(word)) variants.  Capped at WORDLIST_CAPACITY.
+    """
+    lines = os.path.getsize(path) // 2 + 1  # a last line may lack its newline
+    per_word = sum(1 for _ in mangle(b"word")) if rules else 1
+    return min(WORDLIST_CAPACITY, lines * per_word)
+
+def _wordlist_candidates(path, rules, seen, words, candidates):
+    """Yield distinct (by effective DES key) candidates from a wordlist"""
+    for word in iter_words(path):
+        words.value += 1
+        word_keys = set()  # the variants of one word repeat often (e.g. "123".upper())
+        for candidate in (mangle(word) if rules else (word,)):
+            candidates.value += 1
+            key = effective_key(candidate)
+            if key in word_keys:
+                continue
+            word_keys.add(key)
+            if seen is None or seen.add(key):
+                yield candidate
+        if seen is not None and seen.full:
+            print(f"Warning: Bloom filter full after {seen.count:,} keys - from word "
+                  f"{words.value:,} on, keys are only deduplicated per word")
+            seen = None
+
+def _test_wordlist_batch(batch):
+    """Worker: return (tested, key, plaintext) for the first hit in batch"""
+    for tested, key in enumerate(batch, 1):
         result = try_decrypt_des(key)
         if result and len(result.strip()) > 0:
-            print(f"SUCCESS! Key: '{key}'")
-            print(f"Plaintext: {result}")
-            return key, result
-    return None, None
+            return tested, key, result
+    return len(batch), None, None
+
+def wordlist_attack(path, rules=True, workers=0, batch_size=WORDLIST_BATCH,
+                    capacity=None, metrics=None):
+    """capacity: distinct keys the Bloom filter is sized for (default: wordlist_capacity())"""
+    print(f"Trying wordlist {path} ({'with' if rules else 'without'} mangling rules)...")
+    metrics = metrics or Metrics("wordlist_attack")
+    seen = BloomFilter(capacity or wordlist_capacity(path, rules))
+    found = (None, None)
+    started = time.perf_counter()
+
+    with metrics.stage("wordlist"):
+        words = metrics.counter("wordlist words")
+        candidates = metrics.counter("wordlist candidates")
+        tested = metrics.counter("wordlist keys")
+        batches = batched(_wordlist_candidates(path, rules, seen, words, candidates), batch_size)
+        with metrics.progress(tested, words):
+            if workers:
+                with multiprocessing.Pool(workers, initializer=_init_worker,
+                                          initargs=(ciphertext, None)) as pool:
+                    # imap keeps batch order, so the first hit in file order wins
+                    for count, key, result in pool.imap(_test_wordlist_batch, batches):
+                        tested.value += count
+                        if key is not None:
+                            found = (key, result)
+                            break
+            else:
+                for batch in batches:
+                    count, key, result = _test_wordlist_batch(batch)
+                    tested.value += count
+                    if key is not None:
+                        found = (key, result)
+                        break
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(f"Read {words.value} words, generated {candidates.value} candidates, "
+          f"tested {tested.value} distinct keys in {elapsed:.1f}s ({tested.value / elapsed:,.0f} keys/sec)")
+    print(f"Bloom filter: {seen.memory_bytes() / 2**20:.1f} MB")
+
+    key, result = found
+    if key is not None:
+        key = key.decode('utf-8', errors='replace')
+        print(f"SUCCESS! Key: '{key}'")
+        print(f"Plaintext: {result}")
+        metrics.info["key"] = key
+    return key, result
+
+# Characters used for the short key brute force
+CHARSET = string.ascii_lowercase + string.digits
+
+def search_charset(parity_reduction=True, max_length=6):
+    """
+    Charset to enumerate: with parity reduction only one character per
+    DES-equivalent pair is tried (see desfilter.reduce_charset).
+    """
+    if not parity_reduction:
+        return CHARSET
+    reduced = reduce_charset(CHARSET)
+    ratio = reduction_ratio(CHARSET, reduced, range(1, max_length + 1))
+    print(f"Parity reduction: {len(CHARSET)} -> {len(reduced)} characters per position, "
+          f"{ratio:,.1f}x fewer keys to test")
+    return reduced
+
+def check_key(key):
+    """Return the plaintext if key gives readable English, else None"""
+    # Readable, non-blank and containing a common English word
+    # (additional validation to filter false positives)
+    return candidate_filter().test(key)
 
 # Method 3: Brute force very short keys
-def brute_force_short():
+# Keys are enumerated with keyspace.Keyspace, which builds each key in a
+# reused buffer. With a Checkpoint, the last finished key index is saved
+# every few seconds and an interrupted run resumes from there. Progress
+# is shown by a metrics.ProgressReporter thread; the loop itself only
+# stores its count into a counter every PUBLISH_INTERVAL keys.
+
+PUBLISH_INTERVAL = 4096  # keys between counter updates / checkpoint checks
+
+def brute_force_short(checkpoint=None, max_length=6, parity_reduction=True, metrics=None):
     print("Brute forcing short keys...")
-    charset = string.ascii_lowercase + string.digits
+    metrics = metrics or Metrics("brute_force_short")
+    charset = search_charset(parity_reduction, max_length)
+    first_length, first_index = _resume_point(checkpoint, charset)
     
-    # Try 1-6 character keys
-    for length in range(1, 7):
-        print(f"Trying {length}-character keys...")
-        total = len(charset) ** length
-        count = 0
-        
-        for attempt in itertools.product(charset, repeat=length):
-            count += 1
-            if count % 10000 == 0:
-                print(f"  Progress: {count}/{total} ({100*count/total:.1f}%)")
-                
-            key = ''.join(attempt)
-            result = try_decrypt_des(key)
-            if result and len(result.strip()) > 0:
-                # Additional validation to filter false positives
-                if any(word in result.lower() for word in 
-                      ['the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'its', 'may', 'new', 'now', 'old', 'see', 'two', 'who', 'boy', 'did', 'man', 'men', 'put', 'too', 'use']):
-                    print(f"\nLIKELY MATCH! Key: '{key}'")
-                    print(f"Plaintext: {result}")
-                    return key, result
+    with metrics.stage("brute force"):
+        keys = metrics.counter("brute force keys", total=sum(
+            len(charset) ** n for n in range(first_length, max_length + 1)) - first_index)
+        done = 0  # keys of finished lengths
+        with metrics.progress(keys):
+            # Try 1-6 character keys
+            for length in range(first_length, max_length + 1):
+                keyspace = Keyspace(charset, length, pad_to=8)
+                start = count = first_index if length == first_length else 0
+
+                with metrics.stage(f"{length}-character keys"):
+                    for key_buffer in keyspace.iter_range(count):
+                        if count % PUBLISH_INTERVAL == 0 and count:
+                            keys.value = done + count - start
+                            if checkpoint:
+                                checkpoint.maybe_save({"charset": charset, "length": length, "index": count})
+                        count += 1
+
+                        result = check_key(key_buffer)
+                        if result:
+                            keys.value = done + count - start
+                            key = key_buffer[:length].decode()
+                            print(f"\nLIKELY MATCH! Key: '{key}'")
+                            print(f"Plaintext: {result}")
+                            candidate_filter().report()
+                            metrics.info.update(key=key, filter=candidate_filter().stats())
+                            if checkpoint:
+                                checkpoint.clear()
+                            return key, result
+                done += count - start
+                keys.value = done
+    if checkpoint:
+        checkpoint.clear()
+    candidate_filter().report()
+    metrics.info["filter"] = candidate_filter().stats()
     return None, None
 
+def _resume_point(checkpoint, charset):
+    """Return (length, index) to start from, using a saved checkpoint"""
+    state = checkpoint.load() if checkpoint else None
+    if not state:
+        return 1, 0
+    if state.get("charset") != charset:
+        print("Checkpoint was made with a different charset - starting over")
+        return 1, 0
+    print(f"Resuming {state['length']}-character keys from index {state['index']}")
+    return state["length"], state["index"]
+
+# Method 3b: Same search spread over all CPU cores
+# The keyspace of each length is numbered in itertools.product order and
+# cut into contiguous index ranges (batches) that the workers pull from.
+# When a worker confirms a match it lowers the shared "stop_at" index, so
+# every worker abandons keys after it - but batches *before* the match
+# still finish, which makes the parallel search return exactly the key the
+# serial search would have found first.
+
+BATCH_SIZE = 20000     # keys per batch handed to a worker
+CHECK_INTERVAL = 1024  # how often a worker looks at stop_at
+
+_stop_at = None  # shared multiprocessing.Value, set in each worker
+
+def _init_worker(data, stop_at):
+    """Pool initializer: give the worker the ciphertext and stop flag"""
+    global ciphertext, _stop_at
+    ciphertext = data
+    _stop_at = stop_at
+
+def _search_batch(task):
+    """Worker: test keys start..stop-1 of one length"""
+    length, start, stop, charset = task
+    tested = 0
+    stage_filter = candidate_filter()
+    rejected_before = stage_filter.stats()["rejected"]
+    keyspace = Keyspace(charset, length, pad_to=8)
+    for index, key_buffer in enumerate(keyspace.iter_range(start, stop), start):
+        if tested % CHECK_INTERVAL == 0 and index >= _stop_at.value:
+            break  # another worker already found an earlier match
+        tested += 1
+        result = check_key(key_buffer)
+        if result:
+            with _stop_at.get_lock():
+                if index < _stop_at.value:
+                    _stop_at.value = index
+            return start, tested, _rejected_since(rejected_before), index, key_buffer[:length].decode(), result
+    return start, tested, _rejected_since(rejected_before), None, None, None
+
+def _rejected_since(before):
+    """Per-stage rejections in this worker since the 'before' snapshot"""
+    now = candidate_filter().stats()["rejected"]
+    return {stage: now[stage] - before[stage] for stage in now}
+
+def brute_force_parallel(workers=None, batch_size=BATCH_SIZE, max_length=6, checkpoint=None,
+                         parity_reduction=True, metrics=None):
+    """Brute force 1..max_length character keys on a process pool"""
+    workers = workers or multiprocessing.cpu_count()
+    metrics = metrics or Metrics("brute_force_parallel")
+    charset = search_charset(parity_reduction, max_length)
+    first_length, first_index = _resume_point(checkpoint, charset)
+    print(f"Brute forcing short keys on {workers} workers...")
+    stop_at = multiprocessing.Value('q', 0)
+    rejected = dict.fromkeys(STAGES, 0)
+    metrics.info["workers"] = workers
+    metrics.info["rejected"] = rejected
+    best = None  # (index, key, plaintext); stays None if no length is left to search
+
+    with metrics.stage("brute force"), multiprocessing.Pool(
+            workers, initializer=_init_worker, initargs=(ciphertext, stop_at)) as pool:
+        tested = metrics.counter("brute force keys", total=sum(
+            len(charset) ** n for n in range(first_length, max_length + 1)) - first_index)
+        with metrics.progress(tested):
+            for length in range(first_length, max_length + 1):
+                total = len(charset) ** length
+                stop_at.value = total
+                # Resume at the checkpointed index (the batches stay aligned to it)
+                first = first_index if length == first_length else 0
+                tasks = ((length, start, min(start + batch_size, total), charset)
+                         for start in range(first, total, batch_size))
+
+                finished = set()
+                next_unfinished = first  # every batch before this start is done
+                with metrics.stage(f"{length}-character keys"):
+                    for start, count, batch_rejected, index, key, result in pool.imap_unordered(_search_batch, tasks):
+                        tested.value += count
+                        for stage, n in batch_rejected.items():
+                            rejected[stage] += n
+                        finished.add(start)
+                        while next_unfinished in finished:
+                            finished.remove(next_unfinished)
+                            next_unfinished += batch_size
+                        if checkpoint:
+                            checkpoint.maybe_save({"charset": charset, "length": length,
+                                                   "index": min(next_unfinished, total)})
+                        if key is not None and (best is None or index < best[0]):
+                            best = (index, key, result)
+                        # Stop once every batch up to the match has finished
+                        if best is not None and next_unfinished > best[0]:
+                            break
+
+                if best is not None:
+                    break
+
+    print(f"Tested {tested.value} keys in {metrics.stages['brute force']:.1f}s "
+          f"({metrics.rate(tested):,.0f} keys/sec)")
+    print(f"Rejected per stage: {rejected}")
+    if checkpoint:
+        checkpoint.clear()
+    if best is None:
+        return None, None
+    _, key, result = best
+    print(f"\nLIKELY MATCH! Key: '{key}'")
+    print(f"Plaintext: {result}")
+    metrics.info["key"] = key
+    return key, result
+
+# Method 4: Crack many ciphertexts in one pass over the keys
+# Every candidate key's DES key schedule is expanded once (one DES.new) and
+# that cipher object is tried against every target that is still unsolved.
+# Solved targets are dropped right away, and the search stops when none
+# are left, so the key schedule cost is shared by all targets.
+
+def decode_ciphertext(text):
+    """Decode one hex or base64 ciphertext string to bytes"""
+    text = text.strip()
+    if len(text) % 2 == 0 and all(c in string.hexdigits for c in text):
+        return bytes.fromhex(text)
+    return base64.b64decode(fix_base64_padding(text))
+
+def load_targets(path):
+    """Read a file with one hex / base64 ciphertext per line"""
+    targets = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                targets.append((f"line {line_no}", decode_ciphertext(line)))
+            except ValueError as e:
+                print(f"Skipping line {line_no}: cannot decode ({e})")
+    return targets
+
+def _batch_candidates(max_length, parity_reduction):
+    """Dictionary keys first, then every short key"""
+    tried = set()
+    for key in COMMON_KEYS:
+        effective = effective_key(key)
+        if effective not in tried:
+            tried.add(effective)
+            yield key.encode('utf-8')
+    charset = search_charset(parity_reduction, max_length)
+    for length in range(1, max_length + 1):
+        for key_buffer in Keyspace(charset, length, pad_to=8).iter_range():
+            yield key_buffer
+
+def batch_crack(targets, max_length=6, parity_reduction=True, metrics=None):
+    """
+    Attack many DES-ECB ciphertexts at once.
+
+    Args:
+        targets: list of (label, ciphertext bytes)
+        metrics: metrics.Metrics collecting counters and stage times
+
+    Returns:
+        dict label -> (key, plaintext) for every solved target
+    """
+    metrics = metrics or Metrics("batch_crack")
+    pending = {}
+    for label, data in targets:
+        stage_filter = CandidateFilter(data)
+        if stage_filter.valid:
+            pending[label] = stage_filter
+        else:
+            print(f"Skipping {label}: length {len(data)} is not a multiple of 8")
+    print(f"Batch cracking {len(pending)} ciphertexts...")
+
+    solved = {}
+    with metrics.stage("batch"):
+        keys = metrics.counter("batch keys")
+        tests = metrics.counter("batch tests")
+        solved_count = metrics.counter("solved", total=len(pending))
+        with metrics.progress(keys, solved_count):
+            for key_buffer in _batch_candidates(max_length, parity_reduction):
+                if not pending:
+                    break
+                keys.value += 1
+                cipher = DES.new(des_key(key_buffer), DES.MODE_ECB)  # one key schedule...
+                tests.value += len(pending)
+                for label, stage_filter in list(pending.items()):    # ...for every target
+                    result = stage_filter.test_cipher(cipher)
+                    if result:
+                        key = bytes(key_buffer).rstrip(b'\x00').decode('utf-8', errors='replace')
+                        solved[label] = (key, result)
+                        del pending[label]
+                        solved_count.value += 1
+                        print(f"SOLVED {label}: key '{key}' -> {result}")
+
+    elapsed = max(metrics.stages["batch"], 1e-9)
+    print(f"Solved {len(solved)}/{len(solved) + len(pending)} targets")
+    print(f"Expanded {keys.value} key schedules, ran {tests.value} target tests in {elapsed:.1f}s "
+          f"({keys.value / elapsed:,.0f} keys/sec, {tests.value / elapsed:,.0f} tests/sec)")
+    return solved
+
 # Execute the attack
-print("=== ECB DES BREAKER (AUTHORIZED PENETRATION TEST) ===")
-
-# Analyze ECB pattern
-analyze_ecb_pattern()
-
-# Try dictionary attack first
-print("\n[1] Dictionary attack...")
-key, plaintext = dictionary_attack()
-
-if not key:
-    print("\n[2] Brute force short keys...")
-    key, plaintext = brute_force_short()
-
-if not key:
-    print("\nNo simple keys found.")
-    print("\nConsider:")
-    print("- A longer or more complex key")
-    print("- Different encryption algorithm")
-    print("- Using specialized tools like hashcat")
-    print("- Creating a targeted wordlist")
-else:
-    print("\n=== DECRYPTION SUCCESSFUL ===")
-    print(f"Found key: {key}")
-    print(f"Decrypted text: {plaintext}")
-
-# Show first few bytes as hex for manual inspection
-print(f"\nRaw ciphertext (first 32 bytes): {ciphertext[:32].hex()}")
\ No newline at end of file
+if __name__ == "__main__":
+    import argparse
+
+    if load_ciphertext(encrypted_data, verbose=True) is None:
+        raise SystemExit(1)
+
+    parser = argparse.ArgumentParser(description="ECB DES breaker")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="brute force on this many processes (0 = serial)")
+    parser.add_argument("--checkpoint", metavar="FILE",
+                        help="save brute force progress here and resume from it")
+    parser.add_argument("--wordlist", metavar="FILE",
+                        help="also try every word (and its variants) from this file")
+    parser.add_argument("--no-rules", action="store_true",
+                        help="use wordlist words as-is, without mangling rules")
+    parser.add_argument("--targets", metavar="FILE",
+                        help="batch mode: crack every hex/base64 ciphertext in this file")
+    parser.add_argument("--no-parity-reduction", action="store_true",
+                        help="also test keys that differ only in DES parity bits")
+    parser.add_argument("--metrics-json", metavar="FILE",
+                        help="write counters and per-stage timings here as JSON")
+    args = parser.parse_args()
+    checkpoint = Checkpoint(args.checkpoint) if args.checkpoint else None
+    # One Metrics for the whole run; METRICS_PROFILE=FILE also samples the stack
+    metrics = Metrics("breakingdes")
+
+    if args.targets:
+        with metrics:
+            batch_crack(load_targets(args.targets),
+                        parity_reduction=not args.no_parity_reduction, metrics=metrics)
+        if args.metrics_json:
+            metrics.save_json(args.metrics_json)
+        raise SystemExit(0)
+
+    print("=== ECB DES BREAKER (AUTHORIZED PENETRATION TEST) ===")
+
+    with metrics:
+        # Analyze ECB pattern
+        analyze_ecb_pattern()
+
+        # Try dictionary attack first
+        print("\n[1] Dictionary attack...")
+        key, plaintext = dictionary_attack(metrics)
+
+        if not key and args.wordlist:
+            print("\n[1b] Wordlist attack...")
+            key, plaintext = wordlist_attack(args.wordlist, rules=not args.no_rules,
+                                             workers=args.workers, metrics=metrics)
+
+        if not key:
+            print("\n[2] Brute force short keys...")
+            if args.workers:
+                key, plaintext = brute_force_parallel(args.workers, checkpoint=checkpoint,
+                                                      parity_reduction=not args.no_parity_reduction,
+                                                      metrics=metrics)
+            else:
+                key, plaintext = brute_force_short(checkpoint,
+                                                   parity_reduction=not args.no_parity_reduction,
+                                                   metrics=metrics)
+    if args.metrics_json:
+        metrics.save_json(args.metrics_json)
+
+    if not key:
+        print("\nNo simple keys found.")
+        print("\nConsider:")
+        print("- A longer or more complex key")
+        print("- Different encryption algorithm")
+        print("- Using specialized tools like hashcat")
+        print("- Creating a targeted wordlist")
+    else:
+        print("\n=== DECRYPTION SUCCESSFUL ===")
+        print(f"Found key: {key}")
+        print(f"Decrypted text: {plaintext}")
+
+    # Show first few bytes as hex for manual inspection
+    print(f"\nRaw ciphertext (first 32 bytes): {ciphertext[:32].hex()}")
@@ -6,43 +6,32 @@
 # Libraries needed: None (uses built-in Python functions)
 # Description: Shifts each letter by a fixed number of positions in the alphabet
 
-def caesar_encrypt(text, shift):
+from substitution import caesar_translate
+
+def caesar_encrypt(text, shift, alphabet=None):
     """Encrypt text using Caesar cipher"""
-    result = ""
-    for ch in text:
-        if ch.isalpha():  # only letters
-            # Handle both uppercase and lowercase
-            base = ord('A') if ch.isupper() else ord('a')
-            new_pos = (ord(ch) - base + shift) % 26
-            result += chr(new_pos + base)
-        else:
-            result += ch  # keep non-alphabetic characters same
-    return result
-
-def caesar_decrypt(text, shift):
+    # Shift letters through a cached translation table (see substitution.py),
+    # handling both uppercase and lowercase; non-letters stay the same.
+    # An Alphabet (alphabet.py) can replace the 26 letters.
+    return caesar_translate(text, shift, alphabet=alphabet)
+
+def caesar_decrypt(text, shift, alphabet=None):
     """Decrypt text using Caesar cipher"""
-    result = ""
-    for ch in text:
-        if ch.isalpha():
-            base = ord('A') if ch.isupper() else ord('a')
-            new_pos = (ord(ch) - base - shift) % 26
-            result += chr(new_pos + base)
-        else:
-            result += ch
-    return result
-
-# Example usage for Caesar Cipher
-print("=" * 60)
-print("CAESAR CIPHER EXAMPLE")
-print("=" * 60)
-msg = "Hello Pakistan"
-shift = 3
-enc = caesar_encrypt(msg, shift)
-print(f"Original: {msg}")
-print(f"Encrypted: {enc}")
-dec = caesar_decrypt(enc, shift)
-print(f"Decrypted: {dec}")
-print()
+    return caesar_translate(text, -shift, alphabet=alphabet)
+
+def _caesar_example():
+    """Example usage for Caesar Cipher"""
+    print("=" * 60)
+    print("CAESAR CIPHER EXAMPLE")
+    print("=" * 60)
+    msg = "Hello Pakistan"
+    shift = 3
+    enc = caesar_encrypt(msg, shift)
+    print(f"Original: {msg}")
+    print(f"Encrypted: {enc}")
+    dec = caesar_decrypt(enc, shift)
+    print(f"Decrypted: {dec}")
+    print()
 
 
 # ============================================================================
@@ -51,125 +40,117 @@ print()
 # Libraries needed: None (uses built-in Python functions)
 # Description: Uses a keyword to shift letters by different amounts
 
-def vigenere_encrypt(text, key):
+from vigenere import vigenere_transform
+
+def vigenere_encrypt(text, key, alphabet=None):
     """Encrypt text using Vigenère cipher"""
-    result = ""
-    key = key.lower()
-    klen = len(key)
-    key_index = 0  # Track position in key (skip non-alphabetic chars)
-    
-    for ch in text:
-        if ch.isalpha():
-            base = ord('A') if ch.isupper() else ord('a')
-            shift = ord(key[key_index % klen]) - ord('a')
-            new_pos = (ord(ch) - base + shift) % 26
-            result += chr(new_pos + base)
-            key_index += 1
-        else:
-            result += ch
-    return result
-
-def vigenere_decrypt(text, key):
+    # Non-alphabetic chars are skipped and do not advance the key.
+    # vigenere.py picks the NumPy backend for large inputs.
+    return vigenere_transform(text, key, alphabet=alphabet)[0]
+
+def vigenere_decrypt(text, key, alphabet=None):
     """Decrypt text using Vigenère cipher"""
-    result = ""
-    key = key.lower()
-    klen = len(key)
-    key_index = 0
-    
-    for ch in text:
-        if ch.isalpha():
-            base = ord('A') if ch.isupper() else ord('a')
-            shift = ord(key[key_index % klen]) - ord('a')
-            new_pos = (ord(ch) - base - shift) % 26
-            result += chr(new_pos + base)
-            key_index += 1
-        else:
-            result += ch
-    return result
-
-# Example usage for Vigenère Cipher
-print("=" * 60)
-print("VIGENÈRE CIPHER EXAMPLE")
-print("=" * 60)
-msg = "Hello Pakistan"
-key = "key"
-enc = vigenere_encrypt(msg, key)
-print(f"Original: {msg}")
-print(f"Key: {key}")
-print(f"Encrypted: {enc}")
-dec = vigenere_decrypt(enc, key)
-print(f"Decrypted: {dec}")
-print()
+    return vigenere_transform(text, key, decrypt=True, alphabet=alphabet)[0]
+
+def _vigenere_example():
+    """Example usage for Vigenère Cipher"""
+    print("=" * 60)
+    print("VIGENÈRE CIPHER EXAMPLE")
+    print("=" * 60)
+    msg = "Hello Pakistan"
+    key = "key"
+    enc = vigenere_encrypt(msg, key)
+    print(f"Original: {msg}")
+    print(f"Key: {key}")
+    print(f"Encrypted: {enc}")
+    dec = vigenere_decrypt(enc, key)
+    print(f"Decrypted: {dec}")
+    print()
 
 
 # ============================================================================
 # 3. TRANSPOSITION CIPHER (Simple Reversal)
 # ============================================================================
-# Libraries needed: None (uses built-in Python functions)
-# Description: Reverses the order of characters in the message
+# Libraries needed: None (numpy optional, via columnar.py)
+# Description: Reverses the order of characters in the message; with a
+# key it is a keyed columnar transposition (double with key2)
 
-def transposition_encrypt(text):
-    """Encrypt text by reversing it"""
+from columnar import columnar_decrypt, columnar_encrypt
+
+def transposition_encrypt(text, key=None, key2=None):
+    """Encrypt text by reversing it (or by columnar transposition with a key)"""
+    if key is not None:
+        return columnar_encrypt(text, key, key2)
     return text[::-1]
 
-def transposition_decrypt(text):
-    """Decrypt text by reversing it again"""
+def transposition_decrypt(text, key=None, key2=None):
+    """Decrypt text by reversing it again (or undo the columnar transposition)"""
+    if key is not None:
+        return columnar_decrypt(text, key, key2)
     return text[::-1]
 
-# Example usage for Transposition Cipher
-print("=" * 60)
-print("TRANSPOSITION CIPHER EXAMPLE")
-print("=" * 60)
-msg = "Hello Pakistan"
-enc = transposition_encrypt(msg)
-print(f"Original: {msg}")
-print(f"Encrypted: {enc}")
-dec = transposition_decrypt(enc)
-print(f"Decrypted: {dec}")
-print()
+def _transposition_example():
+    """Example usage for Transposition Cipher"""
+    print("=" * 60)
+    print("TRANSPOSITION CIPHER EXAMPLE")
+    print("=" * 60)
+    msg = "Hello Pakistan"
+    enc = transposition_encrypt(msg)
+    print(f"Original: {msg}")
+    print(f"Encrypted: {enc}")
+    dec = transposition_decrypt(enc)
+    print(f"Decrypted: {dec}")
+    print()
 
 
 # ============================================================================
 # 4. ONE-TIME PAD (OTP) - Version 1 (Numeric Key)
 # ============================================================================
-# Libraries needed: random (built-in)
+# Libraries needed: os (built-in, via keypool.py)
 # Description: Uses a random key of numbers for XOR encryption (most secure when used correctly)
 
-import random
+from keypool import random_bytes
+from otp import otp_xor
 
 def otp_generate_key(length):
     """Generate a random key for OTP cipher"""
-    return [random.randint(0, 255) for _ in range(length)]
+    # Key bytes come from a cryptographically secure pool (os.urandom)
+    return list(random_bytes(length))
 
 def otp_encrypt(text, key):
     """Encrypt text using OTP with numeric key"""
+    try:
+        # Fast path: XOR the whole message at once (see otp.py)
+        return list(otp_xor(text.encode('latin-1'), bytes(key[:len(text)])))
+    except (UnicodeEncodeError, ValueError, TypeError):
+        pass  # characters or key numbers beyond one byte - XOR one by one
     cipher = []
     for i, ch in enumerate(text):
-        cipher_num = ord(ch) ^ key[i]  # XOR operation
-        cipher.append(cipher_num)
+        cipher.append(ord(ch) ^ key[i])  # XOR operation
     return cipher  # returns list of numbers
 
 def otp_decrypt(cipher, key):
     """Decrypt OTP cipher text"""
-    result = ""
-    for i, num in enumerate(cipher):
-        ch = chr(num ^ key[i])  # XOR again to decrypt
-        result += ch
-    return result
-
-# Example usage for OTP (Version 1)
-print("=" * 60)
-print("ONE-TIME PAD (OTP) - NUMERIC KEY EXAMPLE")
-print("=" * 60)
-msg = "Hello"
-key = otp_generate_key(len(msg))
-print(f"Original: {msg}")
-print(f"Key: {key}")
-enc = otp_encrypt(msg, key)
-print(f"Encrypted (numbers): {enc}")
-dec = otp_decrypt(enc, key)
-print(f"Decrypted: {dec}")
-print()
+    try:
+        return otp_xor(bytes(cipher), bytes(key[:len(cipher)])).decode('latin-1')
+    except (ValueError, TypeError):
+        pass
+    return "".join(chr(num ^ key[i]) for i, num in enumerate(cipher))  # XOR again to decrypt
+
+def _otp_numeric_example():
+    """Example usage for OTP (Version 1)"""
+    print("=" * 60)
+    print("ONE-TIME PAD (OTP) - NUMERIC KEY EXAMPLE")
+    print("=" * 60)
+    msg = "Hello"
+    key = otp_generate_key(len(msg))
+    print(f"Original: {msg}")
+    print(f"Key: {key}")
+    enc = otp_encrypt(msg, key)
+    print(f"Encrypted (numbers): {enc}")
+    dec = otp_decrypt(enc, key)
+    print(f"Decrypted: {dec}")
+    print()
 
 
 # ============================================================================
@@ -178,45 +159,40 @@ print()
 # Libraries needed: None (uses built-in Python functions)
 # Description: Uses a string key of same length for XOR encryption
 
+def _xor_strings(first, second):
+    """XOR two equal-length strings character by character"""
+    try:
+        data = otp_xor(first.encode('latin-1'), second.encode('latin-1'))
+        return data.decode('latin-1')
+    except UnicodeEncodeError:
+        return "".join(chr(ord(a) ^ ord(b)) for a, b in zip(first, second))
+
 def otp_string_encrypt(message, key):
     """Encrypt message using string-based OTP"""
     if len(message) != len(key):
         raise ValueError("Message and key must be the same length!")
-    
-    cipher_text = ""
-    for i in range(len(message)):
-        m_char = message[i]
-        k_char = key[i]
-        c_char = chr(ord(m_char) ^ ord(k_char))
-        cipher_text += c_char
-    return cipher_text
+    return _xor_strings(message, key)
 
 def otp_string_decrypt(cipher_text, key):
     """Decrypt OTP cipher text with string key"""
     if len(cipher_text) != len(key):
         raise ValueError("Cipher text and key must be the same length!")
-    
-    decrypted_text = ""
-    for i in range(len(cipher_text)):
-        c_char = cipher_text[i]
-        k_char = key[i]
-        d_char = chr(ord(c_char) ^ ord(k_char))
-        decrypted_text += d_char
-    return decrypted_text
-
-# Example usage for OTP (Version 2)
-print("=" * 60)
-print("ONE-TIME PAD (OTP) - STRING KEY EXAMPLE")
-print("=" * 60)
-message = "HELLO"
-key = "abcde"
-print(f"Original: {message}")
-print(f"Key: {key}")
-enc = otp_string_encrypt(message, key)
-print(f"Encrypted: {repr(enc)}")  # Using repr to show special characters
-dec = otp_string_decrypt(enc, key)
-print(f"Decrypted: {dec}")
-print()
+    return _xor_strings(cipher_text, key)
+
+def _otp_string_example():
+    """Example usage for OTP (Version 2)"""
+    print("=" * 60)
+    print("ONE-TIME PAD (OTP) - STRING KEY EXAMPLE")
+    print("=" * 60)
+    message = "HELLO"
+    key = "abcde"
+    print(f"Original: {message}")
+    print(f"Key: {key}")
+    enc = otp_string_encrypt(message, key)
+    print(f"Encrypted: {repr(enc)}")  # Using repr to show special characters
+    dec = otp_string_decrypt(enc, key)
+    print(f"Decrypted: {dec}")
+    print()
 
 
 # ============================================================================
@@ -225,42 +201,44 @@ print()
 # Libraries needed: cryptography (install with: pip install cryptography)
 # Description: Modern symmetric encryption using Fernet (based on AES)
 
-try:
+def fernet_demo():
+    """Demonstrate Fernet encryption"""
+    # cryptography is only imported when Fernet is actually used
     from cryptography.fernet import Fernet
 
-    def fernet_demo():
-        """Demonstrate Fernet encryption"""
-        # Generate a secret key
-        key = Fernet.generate_key()
-        print(f"Generated Key: {key}")
-        
-        # Create a Fernet objecth
-        cipher_suite = Fernet(key)
-        
-        # Define the message
-        message = "Hello, World we are here to learn IS!".encode()
-        
-        # Encrypt the message
-        encrypted_message = cipher_suite.encrypt(message)
-        print(f"Encrypted Message: {encrypted_message}")
-        
-        # Decrypt the message
-        decrypted_message = cipher_suite.decrypt(encrypted_message)
-        print(f"Decrypted Message: {decrypted_message.decode()}")
-
-    # Example usage for Fernet
-    print("=" * 60)
-    print("FERNET ENCRYPTION EXAMPLE")
-    print("=" * 60)
-    fernet_demo()
-    print()
-
-except ImportError:
-    print("=" * 60)
-    print("FERNET ENCRYPTION - LIBRARY NOT INSTALLED")
-    print("=" * 60)
-    print("To use Fernet encryption, install: pip install cryptography")
-    print()
+    # Generate a secret key
+    key = Fernet.generate_key()
+    print(f"Generated Key: {key}")
+    
+    # Create a Fernet objecth
+    cipher_suite = Fernet(key)
+    
+    # Define the message
+    message = "Hello, World we are here to learn IS!".encode()
+    
+    # Encrypt the message
+    encrypted_message = cipher_suite.encrypt(message)
+    print(f"Encrypted Message: {encrypted_message}")
+    
+    # Decrypt the message
+    decrypted_message = cipher_suite.decrypt(encrypted_message)
+    print(f"Decrypted Message: {decrypted_message.decode()}")
+
+def _fernet_example():
+    """Example usage for Fernet"""
+    try:
+        print("=" * 60)
+        print("FERNET ENCRYPTION EXAMPLE")
+        print("=" * 60)
+        fernet_demo()
+        print()
+
+    except ImportError:
+        print("=" * 60)
+        print("FERNET ENCRYPTION - LIBRARY NOT INSTALLED")
+        print("=" * 60)
+        print("To use Fernet encryption, install: pip install cryptography")
+        print()
 
 
 # ============================================================================
@@ -278,16 +256,17 @@ def md5_hash(input_string):
     hash_value = md5.hexdigest()
     return hash_value
 
-# Example usage for MD5
-print("=" * 60)
-print("MD5 HASH EXAMPLE")
-print("=" * 60)
-input_string = "Hello, World!"
-hash_result = md5_hash(input_string)
-print(f"Input: {input_string}")
-print(f"MD5 Hash: {hash_result}")
-print("Note: MD5 is deprecated for security purposes. Use SHA-256 instead.")
-print()
+def _md5_example():
+    """Example usage for MD5"""
+    print("=" * 60)
+    print("MD5 HASH EXAMPLE")
+    print("=" * 60)
+    input_string = "Hello, World!"
+    hash_result = md5_hash(input_string)
+    print(f"Input: {input_string}")
+    print(f"MD5 Hash: {hash_result}")
+    print("Note: MD5 is deprecated for security purposes. Use SHA-256 instead.")
+    print()
 
 
 # ============================================================================
@@ -303,15 +282,16 @@ def sha256_hash(input_string):
     hash_value = sha256.hexdigest()
     return hash_value
 
-# Example usage for SHA-256
-print("=" * 60)
-print("SHA-256 HASH EXAMPLE")
-print("=" * 60)
-input_string = "Hello, World!"
-hash_result = sha256_hash(input_string)
-print(f"Input: {input_string}")
-print(f"SHA-256 Hash: {hash_result}")
-print()
+def _sha256_example():
+    """Example usage for SHA-256"""
+    print("=" * 60)
+    print("SHA-256 HASH EXAMPLE")
+    print("=" * 60)
+    input_string = "Hello, World!"
+    hash_result = sha256_hash(input_string)
+    print(f"Input: {input_string}")
+    print(f"SHA-256 Hash: {hash_result}")
+    print()
 
 
 # ============================================================================
@@ -320,34 +300,39 @@ print()
 # Libraries needed: hmac, hashlib (both built-in)
 # Description: Creates a hash with a secret key for message authentication
 
-import hmac
+from hmac_cache import hexsign
 
 def create_hmac(key, message):
     """Create HMAC digest for message authentication"""
-    hmac_object = hmac.new(key, message, hashlib.sha256)
-    digest = hmac_object.hexdigest()
-    return digest
-
-# Example usage for HMAC
-print("=" * 60)
-print("HMAC EXAMPLE")
-print("=" * 60)
-key = b"my_secret_key"
-message = b"Hello, World!"
-digest = create_hmac(key, message)
-print(f"Key: {key}")
-print(f"Message: {message}")
-print(f"HMAC Digest: {digest}")
-print()
+    # Same digest as hmac.new(key, message, hashlib.sha256), but the keyed
+    # inner/outer state is cached per key (see hmac_cache.py); use
+    # hmac_cache.sign_many / verify_many for batches
+    return hexsign(key, message)
+
+def _hmac_example():
+    """Example usage for HMAC"""
+    print("=" * 60)
+    print("HMAC EXAMPLE")
+    print("=" * 60)
+    key = b"my_secret_key"
+    message = b"Hello, World!"
+    digest = create_hmac(key, message)
+    print(f"Key: {key}")
+    print(f"Message: {message}")
+    print(f"HMAC Digest: {digest}")
+    print()
 
 
 # ============================================================================
 # SUMMARY
 # ============================================================================
-print("=" * 60)
-print("SUMMARY OF AVAILABLE CIPHERS")
-print("=" * 60)
-print("""
+
+def _print_summary():
+    """List every cipher in this file"""
+    print("=" * 60)
+    print("SUMMARY OF AVAILABLE CIPHERS")
+    print("=" * 60)
+    print("""
 1. Caesar Cipher - Simple letter shift cipher
 2. Vigenère Cipher - Polyalphabetic substitution cipher
 3. Transposition Cipher - Reverses message order
@@ -358,6 +343,25 @@ print("""
 8. SHA-256 Hash - Secure hashing algorithm
 9. HMAC - Message authentication with secret key
 
-Note: All examples above run automatically when you execute this file.
+Note: All examples above run when you execute this file (not on import).
 You can also import and use individual functions in your own code.
 """)
+
+
+# ============================================================================
+# RUN ALL EXAMPLES
+# ============================================================================
+# Only when this file is executed (python cipherss.py); importing it just
+# defines the functions.
+
+if __name__ == "__main__":
+    _caesar_example()
+    _vigenere_example()
+    _transposition_example()
+    _otp_numeric_example()
+    _otp_string_example()
+    _fernet_example()
+    _md5_example()
+    _sha256_example()
+    _hmac_example()
+    _print_summary()
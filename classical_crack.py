@@ -0,0 +1,225 @@
+# ===============================================================
+# RANKED BRUTE FORCE - MULTIPLICATIVE AND AFFINE CIPHERS
+# ===============================================================
+# Libraries needed: numpy (optional, install with: pip install numpy)
+# Description: Non-interactive version of the brute force attack in
+# labassignment1.py, extended to the affine cipher of Labassignment2.py.
+#
+#   Multiplicative: 12 keys   (key coprime with 26)
+#   Affine:        312 keys   (12 values of a x 26 values of b)
+#
+# The decryption table of every key (letter -> letter) is computed once
+# at import, using a precomputed inverse table instead of calling
+# mod_inverse per key.  With NumPy a message is decrypted under ALL keys
+# with one gather (tables[:, letters]) and all candidates are scored by
+# the quadgram model in one pass; crack_many() does this for a whole
+# batch of messages at once.  The top-N keys are returned with a
+# confidence (each key's share of the total likelihood).
+# ===============================================================
+
+from math import gcd
+
+from lazy import optional_module
+from metrics import Metrics
+from ngram_model import QuadgramModel, default_model, letter_values
+from substitution import affine_translate
+
+np = optional_module("numpy")  # None if missing, imported on first use
+
+# Multiplicative inverse of every valid key modulo 26, computed once
+INVERSES = {a: pow(a, -1, 26) for a in range(1, 26) if gcd(a, 26) == 1}
+
+MULTIPLICATIVE_KEYS = sorted(INVERSES)
+AFFINE_KEYS = [(a, b) for a in MULTIPLICATIVE_KEYS for b in range(26)]
+
+
+def _decrypt_table(a, b):
+    """Plaintext letter (0-25) for every ciphertext letter under key (a, b)"""
+    a_inv = INVERSES[a]
+    return [(a_inv * (c - b)) % 26 for c in range(26)]
+
+
+# Decryption tables for every key, built once
+TABLES = {
+    "multiplicative": [_decrypt_table(k, 0) for k in MULTIPLICATIVE_KEYS],
+    "affine": [_decrypt_table(a, b) for a, b in AFFINE_KEYS],
+}
+KEYS = {
+    "multiplicative": MULTIPLICATIVE_KEYS,
+    "affine": AFFINE_KEYS,
+}
+_table_arrays = {}
+
+
+def _tables_array(cipher):
+    """NumPy (keys x 26) version of TABLES[cipher], built once"""
+    if cipher not in _table_arrays:
+        _table_arrays[cipher] = np.asarray(TABLES[cipher], dtype=np.int32)
+    return _table_arrays[cipher]
+
+
+def _scores(values, cipher, model):
+    """Quadgram score of the message under every key"""
+    if np is not None:
+        rows = _tables_array(cipher)[:, np.asarray(values, dtype=np.int64)]
+        return model.score_batch(rows).tolist()
+    return [model.score_values([table[v] for v in values]) for table in TABLES[cipher]]
+
+
+def decrypt_with(ciphertext, cipher, key):
+    """Decrypt with a multiplicative key or an affine (a, b) key"""
+    if cipher == "multiplicative":
+        # Same output as labassignment1.decrypt (works on uppercase text)
+        return affine_translate(ciphertext.upper(), INVERSES[key], 0, mode="upper")
+    a, b = key
+    a_inv = INVERSES[a]
+    return affine_translate(ciphertext, a_inv, -a_inv * b)
+
+
+def _rank(ciphertext, scores, cipher, top):
+    """Turn the per-key scores of one message into its top-N list"""
+    # Confidence = share of total likelihood (scores are log10)
+    best = max(scores)
+    weights = [10 ** (s - best) for s in scores]
+    total = sum(weights)
+
+    ranked = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:top]
+    keys = KEYS[cipher]
+    return [
+        (keys[i], weights[i] / total, scores[i], decrypt_with(ciphertext, cipher, keys[i]))
+        for i in ranked
+    ]
+
+
+def _check_cipher(cipher):
+    if cipher not in TABLES:
+        raise ValueError(f"Unknown cipher {cipher!r}, expected one of {sorted(TABLES)}")
+
+
+def rank_keys(ciphertext, cipher="affine", top=5, model=None):
+    """
+    Try every key and rank the decryptions by how English they look.
+
+    Args:
+        ciphertext: the intercepted message
+        cipher: "multiplicative" or "affine"
+        top: how many keys to return
+        model: QuadgramModel (default_model() if not given)
+
+    Returns:
+        List of (key, confidence, score, plaintext), best first
+    """
+    _check_cipher(cipher)
+    model = model or default_model()
+    scores = _scores(letter_values(ciphertext), cipher, model)
+    return _rank(ciphertext, scores, cipher, top)
+
+
+# Letters per NumPy batch in crack_many (bounds the keys x letters arrays)
+BATCH_LETTERS = 20000
+
+
+def _scores_many_numpy(messages, cipher, model):
+    """
+    Scores of many messages under every key, a batch of messages at a time.
+
+    All messages of a batch are joined into one letter array, decrypted
+    under every key with one gather and scored with one table lookup.  A
+    running sum along each row then gives every message's total as the
+    difference of two prefix sums; quadgrams that would cross from one
+    message into the next are never counted.
+    """
+    tables = _tables_array(cipher)
+    logp = model.array()
+    results = []
+    batch, batch_letters = [], 0
+    for values in list(messages) + [None]:
+        if values is not None and (not batch or batch_letters + len(values) <= BATCH_LETTERS):
+            batch.append(values)
+            batch_letters += len(values)
+            continue
+
+        lengths = np.asarray([len(v) for v in batch], dtype=np.int64)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        letters = np.asarray([x for v in batch for x in v], dtype=np.intp)
+        rows = tables[:, letters]
+        if rows.shape[1] >= 4:
+            codes = rows[:, :-3] * 17576 + rows[:, 1:-2] * 676 + rows[:, 2:-1] * 26 + rows[:, 3:]
+            prefix = np.zeros((rows.shape[0], codes.shape[1] + 1))  # float64 sums
+            np.cumsum(logp[codes], axis=1, out=prefix[:, 1:])
+        for start, length in zip(starts, lengths):
+            if length >= 4:
+                results.append((prefix[:, start + length - 3] - prefix[:, start]).tolist())
+            else:
+                results.append([0.0] * tables.shape[0])
+
+        if values is None:
+            break
+        batch, batch_letters = [values], len(values)
+    return results
+
+
+def crack_many(ciphertexts, cipher="affine", top=1, model=None, metrics=None):
+    """
+    Rank keys for many messages; returns one rank_keys() list per message.
+
+    With a metrics.Metrics, the time of each step (letters / score / rank)
+    and the messages and keys scored are recorded in it.
+    """
+    _check_cipher(cipher)
+    metrics = metrics or Metrics("crack_many", progress=False)
+    model = model or default_model()
+    ciphertexts = list(ciphertexts)
+    metrics.counter("messages").add(len(ciphertexts))
+    metrics.counter("keys scored").add(len(ciphertexts) * len(KEYS[cipher]))
+    with metrics.stage("letters"):
+        values = [letter_values(text) for text in ciphertexts]
+    with metrics.stage("score"):
+        if np is not None and ciphertexts:
+            all_scores = _scores_many_numpy(values, cipher, model)
+        else:
+            all_scores = [_scores(v, cipher, model) for v in values]
+    with metrics.stage("rank"):
+        return [_rank(text, scores, cipher, top) for text, scores in zip(ciphertexts, all_scores)]
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Ranked multiplicative / affine cracker")
+    parser.add_argument("cipher", choices=sorted(TABLES))
+    parser.add_argument("file", nargs="?", help="one ciphertext per line (default: stdin)")
+    parser.add_argument("--top", type=int, default=3)
+    parser.add_argument("--quadgrams", metavar="FILE",
+                        help="'QUAD COUNT' quadgram file (default: model trained on built-in text)")
+    parser.add_argument("--metrics-json", metavar="FILE",
+                        help="write counters and per-stage timings here as JSON")
+    args = parser.parse_args()
+
+    model = None
+    if args.quadgrams:
+        try:
+            model = QuadgramModel.from_file(args.quadgrams)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot load quadgrams: {e}")
+
+    source = open(args.file, "r", encoding="utf-8") if args.file else sys.stdin
+    with source:
+        messages = [line.rstrip("\n") for line in source if line.strip()]
+
+    started = time.perf_counter()
+    with Metrics("classical_crack") as metrics:
+        metrics.info["cipher"] = args.cipher
+        results = crack_many(messages, args.cipher, args.top, model=model, metrics=metrics)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    if args.metrics_json:
+        metrics.save_json(args.metrics_json)
+
+    for message, ranking in zip(messages, results):
+        print(message)
+        for key, confidence, score, plaintext in ranking:
+            print(f"  key={key!s:<8} confidence={confidence:6.1%}  score={score:9.1f}  {plaintext}")
+    print(f"\n{len(messages)} messages in {elapsed:.3f}s ({len(messages) / elapsed:,.0f} messages/sec)",
+          file=sys.stderr)
@@ -0,0 +1,494 @@
+# ===============================================================
+# COMMAND LINE - STREAMING FRONT END FOR EVERY CIPHER, HASH AND CRACKER
+# ===============================================================
+# Libraries needed: whatever the chosen command needs (numpy, cryptography
+# and pycryptodome are optional and only loaded by the commands using them)
+# Description: One entry point instead of editing the literals in each
+# script.  Every command reads a file or stdin in fixed-size chunks and
+# writes each result chunk to stdout straight away, so commands can be
+# chained through pipes without ever holding the whole input:
+#
+#   python cli.py caesar --shift 3 < big.txt \
+#       | python cli.py vigenere --key lemon \
+#       | python cli.py sha256
+#
+#   python cli.py vigenere --key lemon --decrypt secret.txt -o plain.txt
+#   python cli.py transposition --key zebras --key2 lemon big.txt -o big.tr
+#   python cli.py hash -a md5,sha256 --threads 8 *.iso
+#   python cli.py fernet encrypt --key-file k.key big.bin -o big.fseg
+#   python cli.py crack-vigenere secret.txt
+#
+# Data is handled as bytes: the letter ciphers shift ASCII letters only
+# (or the symbols of --alphabet), exactly like their bytes code paths.
+# --threads is accepted by the commands that can use it (hash of many
+# files, fernet).
+# ===============================================================
+
+import argparse
+import contextlib
+import hashlib
+import hmac
+import io
+import os
+import sys
+import tempfile
+
+from alphabet import ALPHANUMERIC, LETTERS, MIXED_CASE, PRINTABLE, UPPERCASE
+from substitution import affine_inverse, affine_translate, mod_inverse
+from vigenere import CHUNK_SIZE, VigenereStream
+
+ALPHABETS = {
+    "letters": LETTERS,
+    "uppercase": UPPERCASE,
+    "mixed-case": MIXED_CASE,
+    "alphanumeric": ALPHANUMERIC,
+    "printable": PRINTABLE,
+}
+# Lines per crack_many() call in crack-affine / crack-multiplicative
+CRACK_BATCH = 1000
+# Bytes read before a Vigenère key is estimated
+VIGENERE_SAMPLE = 256 << 10
+
+
+class CommandError(Exception):
+    """Bad arguments or input for a command (printed without a traceback)"""
+
+
+# ---------------------------------------------------------------
+# Streams
+# ---------------------------------------------------------------
+
+@contextlib.contextmanager
+def _streams(args):
+    """(input, output) binary streams for args.input / args.output ("-" = stdin / stdout)"""
+    fin = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    fout = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        yield fin, fout
+    finally:
+        fout.flush()
+        if fout is not sys.stdout.buffer:
+            fout.close()
+        if fin is not sys.stdin.buffer:
+            fin.close()
+
+
+def _chunks(fin, chunk_size):
+    """Yield chunks of at most chunk_size bytes, as soon as they arrive"""
+    read = getattr(fin, "read1", fin.read)
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _pipe(args, transform):
+    """Write transform(chunk) for every input chunk"""
+    with _streams(args) as (fin, fout):
+        for chunk in _chunks(fin, args.chunk_size):
+            fout.write(transform(chunk))
+
+
+def _alphabet(args):
+    return ALPHABETS[args.alphabet] if args.alphabet else None
+
+
+def _modulus(alphabet):
+    return alphabet.size if alphabet else 26
+
+
+# ---------------------------------------------------------------
+# Ciphers
+# ---------------------------------------------------------------
+
+def cmd_caesar(args):
+    alphabet = _alphabet(args)
+    shift = -args.shift if args.decrypt else args.shift
+    _pipe(args, lambda chunk: affine_translate(chunk, 1, shift, alphabet=alphabet))
+
+
+def cmd_multiplicative(args):
+    alphabet = _alphabet(args)
+    key = args.key
+    if args.decrypt:
+        key = mod_inverse(args.key, _modulus(alphabet))
+        if key is None:
+            raise CommandError(f"key {args.key} has no inverse modulo {_modulus(alphabet)}")
+    _pipe(args, lambda chunk: affine_translate(chunk, key, 0, alphabet=alphabet))
+
+
+def cmd_affine(args):
+    alphabet = _alphabet(args)
+    a, b = args.a, args.b
+    if args.decrypt:
+        try:
+            a, b = affine_inverse(a, b, _modulus(alphabet))
+        except ValueError as e:
+            raise CommandError(str(e)) from None
+    _pipe(args, lambda chunk: affine_translate(chunk, a, b, alphabet=alphabet))
+
+
+def cmd_vigenere(args):
+    try:
+        stream = VigenereStream(args.key, args.decrypt, _alphabet(args))
+    except ValueError as e:
+        raise CommandError(str(e)) from None
+    _pipe(args, stream.update)
+
+
+def _spooled(fin, chunk_size):
+    """A seekable copy of a non-seekable input (kept in memory up to 64 chunks)"""
+    spool = tempfile.SpooledTemporaryFile(max_size=64 * chunk_size)
+    for chunk in _chunks(fin, chunk_size):
+        spool.write(chunk)
+    return spool
+
+
+def cmd_transposition(args):
+    if args.key:
+        from columnar import ColumnarStream
+        stream = ColumnarStream(args.key, args.key2, args.decrypt, args.block_size)
+        with _streams(args) as (fin, fout):
+            for chunk in _chunks(fin, args.chunk_size):
+                fout.write(stream.update(chunk))
+            fout.write(stream.final())
+        return
+    if args.key2:
+        raise CommandError("--key2 needs --key")
+    # Reversal is its own inverse: read blocks from the END of the input
+    # and write each one reversed.  Pipes are spooled first (the last
+    # byte cannot be known before the input ends).
+    with _streams(args) as (fin, fout):
+        source = fin if fin.seekable() else _spooled(fin, args.chunk_size)
+        with contextlib.ExitStack() as stack:
+            if source is not fin:
+                stack.enter_context(source)
+            position = source.seek(0, os.SEEK_END)
+            while position > 0:
+                size = min(args.chunk_size, position)
+                position -= size
+                source.seek(position)
+                fout.write(source.read(size)[::-1])
+
+
+def cmd_otp(args):
+    from keypool import random_bytes
+    from otp import otp_xor
+
+    if args.generate_key:
+        # Encrypt with a fresh random pad, written to --key-file as we go
+        with open(args.key_file, "wb") as key_out:
+            def encrypt(chunk):
+                pad = random_bytes(len(chunk))
+                key_out.write(pad)
+                return otp_xor(chunk, pad)
+            _pipe(args, encrypt)
+        return
+
+    with open(args.key_file, "rb") as key_in:
+        def xor(chunk):
+            pad = key_in.read(len(chunk))
+            if len(pad) < len(chunk):
+                raise CommandError("the key file is shorter than the input (a pad must not be reused)")
+            return otp_xor(chunk, pad)
+        _pipe(args, xor)
+
+
+def _read_key(args, text=False):
+    """Key bytes from --key-file (exact bytes; text=True strips the line end) or --key"""
+    if args.key_file:
+        with open(args.key_file, "rb") as f:
+            key = f.read()
+        return key.strip() if text else key
+    if args.key is not None:
+        return args.key.encode("utf-8")
+    raise CommandError("a key is needed: use --key or --key-file")
+
+
+def cmd_fernet(args):
+    import fernet_stream
+
+    if args.mode == "genkey":
+        sys.stdout.write(fernet_stream.generate_key().decode() + "\n")
+        return
+    key = _read_key(args, text=True)  # base64 text, usually with a newline
+    with _streams(args) as (fin, fout):
+        if args.mode == "encrypt":
+            fernet_stream.encrypt_stream(fin, fout, key, args.segment_size, args.threads)
+        else:
+            try:
+                fernet_stream.decrypt_stream(fin, fout, key, args.threads)
+            except ValueError as e:
+                raise CommandError(str(e)) from None
+
+
+# ---------------------------------------------------------------
+# Hashes
+# ---------------------------------------------------------------
+
+def _print_digests(name, result, algorithms):
+    if len(algorithms) == 1:
+        print(f"{result[algorithms[0]]}  {name}")
+    else:
+        for algorithm in algorithms:
+            print(f"{algorithm.upper()} ({name}) = {result[algorithm]}")
+
+
+def cmd_hash(args):
+    algorithms = args.algorithms.split(",")
+    for algorithm in algorithms:
+        if algorithm not in hashlib.algorithms_available:
+            raise CommandError(f"unknown hash algorithm {algorithm!r}")
+
+    files = [f for f in args.files if f != "-"]
+    if files:
+        from filehash import hash_files
+        for name, result in zip(files, hash_files(files, algorithms, args.threads, args.chunk_size)):
+            _print_digests(name, result, algorithms)
+    if not args.files or "-" in args.files:
+        hashers = [hashlib.new(name) for name in algorithms]
+        for chunk in _chunks(sys.stdin.buffer, args.chunk_size):
+            for h in hashers:
+                h.update(chunk)
+        _print_digests("-", {name: h.hexdigest() for name, h in zip(algorithms, hashers)}, algorithms)
+
+
+def cmd_hmac(args):
+    key = _read_key(args)
+    mac = hmac.new(key, digestmod=args.digest)
+    with _streams(args) as (fin, _):
+        for chunk in _chunks(fin, args.chunk_size):
+            mac.update(chunk)
+    print(mac.hexdigest())
+
+
+# ---------------------------------------------------------------
+# Crackers
+# ---------------------------------------------------------------
+
+def cmd_crack_vigenere(args):
+    from vigenere_crack import crack_vigenere
+
+    with _streams(args) as (fin, fout):
+        # Estimate the key from the first part, then decrypt everything
+        # as a stream (statistics settle long before the end of big files)
+        sample = fin.read(args.sample)
+        if not sample:
+            return
+        key, _ = crack_vigenere(sample)
+        print(f"key: {key}", file=sys.stderr)
+        stream = VigenereStream(key, decrypt=True)
+        fout.write(stream.update(sample))
+        for chunk in _chunks(fin, args.chunk_size):
+            fout.write(stream.update(chunk))
+
+
+def _cmd_crack_classical(args, cipher):
+    from classical_crack import crack_many
+    from wordlist import batched
+
+    with _streams(args) as (fin, fout):
+        text_in = io.TextIOWrapper(fin, encoding="utf-8", errors="replace", newline="")
+        lines = (line.rstrip("\r\n") for line in text_in)
+        for batch in batched(lines, CRACK_BATCH):
+            out = []
+            for ranking in crack_many(batch, cipher, top=1):
+                key, confidence, _, plaintext = ranking[0]
+                if args.show_key:
+                    out.append(f"{key}\t{confidence:.1%}\t{plaintext}\n")
+                else:
+                    out.append(plaintext + "\n")
+            fout.write("".join(out).encode("utf-8"))
+        text_in.detach()
+
+
+def cmd_crack_affine(args):
+    _cmd_crack_classical(args, "affine")
+
+
+def cmd_crack_multiplicative(args):
+    _cmd_crack_classical(args, "multiplicative")
+
+
+def cmd_crack_des(args):
+    # breakingdes reports progress with print(); keep stdout for results
+    with contextlib.redirect_stdout(sys.stderr):
+        import breakingdes
+
+        targets = []
+        with _streams(args) as (fin, _):
+            for line_no, line in enumerate(io.TextIOWrapper(fin, encoding="utf-8"), 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    targets.append((f"line {line_no}", breakingdes.decode_ciphertext(line)))
+                except ValueError as e:
+                    print(f"Skipping line {line_no}: cannot decode ({e})")
+        solved = breakingdes.batch_crack(targets, args.max_length,
+                                         parity_reduction=not args.no_parity_reduction)
+    for label, _ in targets:
+        if label in solved:
+            key, plaintext = solved[label]
+            print(f"{label}\t{key}\t{plaintext}")
+
+
+# ---------------------------------------------------------------
+# Argument parsing
+# ---------------------------------------------------------------
+
+def _positive_int(text):
+    """argparse type: an integer of at least 1 (0 would read or write nothing)"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return value
+
+
+def _add_io(parser, output=True):
+    parser.add_argument("input", nargs="?", default="-", help="input file (default: stdin)")
+    if output:
+        parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    else:
+        parser.set_defaults(output="-")  # results are printed
+    parser.add_argument("--chunk-size", type=_positive_int, default=CHUNK_SIZE, help="bytes per read")
+
+
+def _add_alphabet(parser):
+    parser.add_argument("--alphabet", choices=sorted(ALPHABETS),
+                        help="work over this alphabet instead of the 26 letters")
+
+
+def _add_key(parser):
+    parser.add_argument("--key", help="key as text")
+    parser.add_argument("--key-file", help="read the key from this file")
+
+
+def build_parser():
+    """The argparse parser with one subcommand per operation"""
+    parser = argparse.ArgumentParser(
+        description="Streaming command line for the ciphers, hashes and crackers in this project")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("caesar", help="Caesar shift")
+    p.add_argument("--shift", type=int, required=True)
+    p.add_argument("-d", "--decrypt", action="store_true")
+    _add_alphabet(p)
+    _add_io(p)
+    p.set_defaults(func=cmd_caesar)
+
+    p = sub.add_parser("multiplicative", help="multiplicative cipher")
+    p.add_argument("--key", type=int, required=True)
+    p.add_argument("-d", "--decrypt", action="store_true")
+    _add_alphabet(p)
+    _add_io(p)
+    p.set_defaults(func=cmd_multiplicative)
+
+    p = sub.add_parser("affine", help="affine cipher (a * x + b)")
+    p.add_argument("-a", type=int, required=True)
+    p.add_argument("-b", type=int, required=True)
+    p.add_argument("-d", "--decrypt", action="store_true")
+    _add_alphabet(p)
+    _add_io(p)
+    p.set_defaults(func=cmd_affine)
+
+    p = sub.add_parser("vigenere", help="Vigenère cipher")
+    p.add_argument("--key", required=True)
+    p.add_argument("-d", "--decrypt", action="store_true")
+    _add_alphabet(p)
+    _add_io(p)
+    p.set_defaults(func=cmd_vigenere)
+
+    p = sub.add_parser("transposition",
+                       help="keyed columnar transposition in blocks (without --key: reverse the input)")
+    p.add_argument("-k", "--key", help="keyword (columnar transposition)")
+    p.add_argument("--key2", help="second keyword (double transposition)")
+    p.add_argument("-d", "--decrypt", action="store_true", help="undo a keyed transposition")
+    p.add_argument("--block-size", type=_positive_int, default=1 << 16,
+                   help="bytes transposed together; decrypt with the same size (default: 65536)")
+    _add_io(p)
+    p.set_defaults(func=cmd_transposition)
+
+    p = sub.add_parser("otp", help="one-time pad XOR with a key file")
+    p.add_argument("--key-file", required=True)
+    p.add_argument("--generate-key", action="store_true",
+                   help="write a fresh random pad to --key-file instead of reading it")
+    _add_io(p)
+    p.set_defaults(func=cmd_otp)
+
+    fernet = sub.add_parser("fernet", help="segmented streaming Fernet (see fernet_stream.py)")
+    modes = fernet.add_subparsers(dest="mode", required=True)
+    p = modes.add_parser("genkey", help="print a new key")
+    p.set_defaults(func=cmd_fernet)
+    for mode in ("encrypt", "decrypt"):
+        p = modes.add_parser(mode)
+        _add_key(p)
+        if mode == "encrypt":
+            p.add_argument("--segment-size", type=_positive_int, default=CHUNK_SIZE)
+        p.add_argument("--threads", type=_positive_int, default=os.cpu_count() or 1)
+        _add_io(p)
+        p.set_defaults(func=cmd_fernet)
+
+    for name, algorithms, help_text in (("hash", "md5,sha256", "hash files or stdin"),
+                                        ("md5", "md5", "MD5 of files or stdin"),
+                                        ("sha256", "sha256", "SHA-256 of files or stdin")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("files", nargs="*", help="files to hash ('-' or none = stdin)")
+        if name == "hash":
+            p.add_argument("-a", "--algorithms", default=algorithms,
+                           help="comma separated hashlib names (default: %(default)s)")
+        else:
+            p.set_defaults(algorithms=algorithms)
+        p.add_argument("--threads", type=_positive_int, default=min(32, (os.cpu_count() or 1) + 4))
+        p.add_argument("--chunk-size", type=_positive_int, default=CHUNK_SIZE)
+        p.set_defaults(func=cmd_hash)
+
+    p = sub.add_parser("hmac", help="HMAC of the input")
+    _add_key(p)
+    p.add_argument("--digest", default="sha256")
+    _add_io(p, output=False)
+    p.set_defaults(func=cmd_hmac)
+
+    p = sub.add_parser("crack-vigenere", help="find the Vigenère key and decrypt")
+    p.add_argument("--sample", type=int, default=VIGENERE_SAMPLE,
+                   help="bytes used to estimate the key (default: %(default)s)")
+    _add_io(p)
+    p.set_defaults(func=cmd_crack_vigenere)
+
+    for name, func in (("crack-affine", cmd_crack_affine),
+                       ("crack-multiplicative", cmd_crack_multiplicative)):
+        p = sub.add_parser(name, help=f"{name[6:]} cracker, one message per line")
+        p.add_argument("--show-key", action="store_true", help="prefix each line with key and confidence")
+        _add_io(p)
+        p.set_defaults(func=func)
+
+    p = sub.add_parser("crack-des", help="brute force DES-ECB ciphertexts (hex/base64, one per line)")
+    p.add_argument("--max-length", type=int, default=6)
+    p.add_argument("--no-parity-reduction", action="store_true")
+    _add_io(p, output=False)
+    p.set_defaults(func=cmd_crack_des)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.func(args)
+    except CommandError as e:
+        parser.exit(2, f"{parser.prog} {args.command}: error: {e}\n")
+    except BrokenPipeError:
+        # The reader went away (e.g. "| head"): stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
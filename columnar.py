@@ -0,0 +1,237 @@
+# ===============================================================
+# COLUMNAR TRANSPOSITION - CACHED PERMUTATIONS, ONE GATHER
+# ===============================================================
+# Libraries needed: numpy (optional, install with: pip install numpy)
+# Description: Keyed columnar transposition.  The text is written in
+# rows as wide as the key and read out column by column, in the
+# alphabetical order of the key letters (equal letters left to right):
+#
+#   key ZEBRAS, "WEAREDISCOVERED" ->  W E A R E D     order: A B E R S Z
+#                                     I S C O V E     (columns 4 2 1 3 5 0)
+#                                     R E D
+#
+#   read out: EV ACD ESE RO DE WIR -> "EVACDESERODEWIR"
+#
+# Whatever the text, this only moves characters, so for every
+# (key, length) it is a fixed permutation: output = input[index].  The
+# index array is computed once and kept in an LRU cache, and encrypting
+# or decrypting is ONE NumPy fancy-index gather over the bytes (the
+# inverse permutation for decryption).  Double transposition composes
+# the two permutations into one index, so it is a single gather as well.
+# Only lengths up to CACHE_LIMIT are cached, so the cache holds at most
+# PERMUTATION_CACHE x 8 bytes x CACHE_LIMIT positions (8 MB).
+#
+# Longer messages (and everything without NumPy) are moved column by
+# column with strided slices instead, which gives the same result
+# without building an index array as large as the message for every call.
+# ColumnarStream / columnar_file transpose fixed-size blocks one at a
+# time (many blocks per gather), each stream keeping the index of its
+# block size (up to INDEX_LIMIT positions), so files of any size use one
+# gather per chunk read.
+# ===============================================================
+
+from functools import lru_cache
+
+from lazy import optional_module
+
+np = optional_module("numpy")  # None if missing, imported on first use
+
+# Longest streaming block transposed with an index array (8 bytes / position)
+INDEX_LIMIT = 1 << 20
+# (keys, length) permutations kept, and the longest length cached
+PERMUTATION_CACHE = 16
+CACHE_LIMIT = 1 << 16
+# Block size of the streaming mode
+BLOCK_SIZE = 1 << 16
+
+
+def column_order(key):
+    """Column numbers in reading order: key symbols sorted, ties left to right"""
+    if not key:
+        raise ValueError("Columnar transposition needs a non-empty key")
+    return tuple(sorted(range(len(key)), key=lambda i: key[i]))
+
+
+def _key_tuple(key, key2):
+    """Hashable (key,) or (key, key2) for the permutation cache"""
+    keys = (key,) if key2 is None else (key, key2)
+    return tuple(k if isinstance(k, str) else tuple(k) for k in keys)
+
+
+def _single_index(key, length):
+    """Index array of one transposition of 'length' positions"""
+    order = column_order(key)
+    width = len(key)
+    rows = -(-length // width)
+    # Number the cells of the full grid, read them column by column and
+    # drop the empty cells of the short last row
+    grid = np.arange(rows * width, dtype=np.intp).reshape(rows, width)
+    index = grid[:, list(order)].T.ravel()
+    return index[index < length]
+
+
+def permutation(keys, length, decrypt=False):
+    """
+    Index array for transposing 'length' positions with 'keys', from the
+    cache for lengths up to CACHE_LIMIT.
+
+    Args:
+        keys: (key,) or (key1, key2) for double transposition
+        length: message length
+        decrypt: return the inverse permutation
+
+    Returns:
+        Read-only NumPy intp array: output = input[index]
+        (intp, not a smaller type: NumPy would convert it on every gather)
+    """
+    if length <= CACHE_LIMIT:
+        return _cached_permutation(keys, length, decrypt)
+    return _build_permutation(keys, length, decrypt)
+
+
+@lru_cache(maxsize=PERMUTATION_CACHE)
+def _cached_permutation(keys, length, decrypt):
+    return _build_permutation(keys, length, decrypt)
+
+
+def _build_permutation(keys, length, decrypt):
+    index = np.arange(length, dtype=np.intp)
+    for key in keys:
+        # Transposing the already transposed text: compose the permutations
+        index = index[_single_index(key, length)]
+    if decrypt:
+        inverse = np.empty_like(index)
+        inverse[index] = np.arange(length, dtype=np.intp)
+        index = inverse
+    index.flags.writeable = False
+    return index
+
+
+def _gather(data, index):
+    """data[index] for str or bytes-like data, as one NumPy gather"""
+    if isinstance(data, str):
+        if data.isascii():
+            return np.frombuffer(data.encode("ascii"), dtype=np.uint8)[index].tobytes().decode("ascii")
+        # One 4-byte code point per character keeps positions intact
+        codes = np.frombuffer(data.encode("utf-32-le"), dtype=np.uint32)
+        return codes[index].tobytes().decode("utf-32-le")
+    return np.frombuffer(data, dtype=np.uint8)[index].tobytes()
+
+
+def _by_columns(data, key, decrypt):
+    """One transposition with strided slices (no index array)"""
+    order = column_order(key)
+    width = len(key)
+    text = isinstance(data, str)
+    if not decrypt:
+        columns = [data[c::width] for c in order]
+        return "".join(columns) if text else b"".join(columns)
+
+    length = len(data)
+    out = [""] * length if text else bytearray(length)
+    pos = 0
+    for c in order:
+        size = len(range(c, length, width))
+        out[c::width] = data[pos:pos + size]
+        pos += size
+    return "".join(out) if text else bytes(out)
+
+
+def _transform(data, keys, decrypt):
+    length = len(data)
+    if length <= 1:
+        return data if isinstance(data, str) else bytes(data)
+    if np is not None and length <= CACHE_LIMIT:
+        return _gather(data, permutation(keys, length, decrypt))
+    if not isinstance(data, (str, bytes)):
+        data = bytes(data)
+    for key in (reversed(keys) if decrypt else keys):
+        data = _by_columns(data, key, decrypt)
+    return data
+
+
+def columnar_encrypt(data, key, key2=None):
+    """
+    Columnar transposition of data (double transposition with key2).
+
+    Args:
+        data: str, bytes, bytearray or memoryview
+        key: the keyword (any sequence of comparable symbols)
+        key2: optional second keyword
+
+    Returns:
+        str for str input, bytes otherwise
+    """
+    return _transform(data, _key_tuple(key, key2), decrypt=False)
+
+
+def columnar_decrypt(data, key, key2=None):
+    """Undo columnar_encrypt(data, key, key2)"""
+    return _transform(data, _key_tuple(key, key2), decrypt=True)
+
+
+# ===============================================================
+# STREAMING
+# ===============================================================
+
+class ColumnarStream:
+    """
+    Block-by-block columnar transposition of a byte stream.
+
+    Every block_size bytes are transposed on their own (the last block
+    may be shorter), so the output is NOT the same as one
+    columnar_encrypt() over the whole input - decrypt with the same
+    block size.  update() returns the finished blocks, final() the rest.
+    """
+
+    def __init__(self, key, key2=None, decrypt=False, block_size=BLOCK_SIZE):
+        self.keys = _key_tuple(key, key2)
+        self.decrypt = decrypt
+        self.block_size = block_size
+        self.buffer = bytearray()
+        self._index = None  # block permutation, kept even when too long for the cache
+
+    def _blocks(self, data):
+        size = self.block_size
+        if np is not None and size <= INDEX_LIMIT:
+            if self._index is None:
+                self._index = permutation(self.keys, size, self.decrypt)
+            # All full blocks of the chunk in one gather
+            return np.frombuffer(data, dtype=np.uint8).reshape(-1, size)[:, self._index].tobytes()
+        return b"".join(_transform(data[i:i + size], self.keys, self.decrypt)
+                        for i in range(0, len(data), size))
+
+    def update(self, chunk):
+        """Add bytes; returns the transposed full blocks (possibly b"")"""
+        self.buffer += chunk
+        full = len(self.buffer) - len(self.buffer) % self.block_size
+        if not full:
+            return b""
+        blocks = bytes(self.buffer[:full])
+        del self.buffer[:full]
+        return self._blocks(blocks)
+
+    def final(self):
+        """Transpose and return the last, partial block"""
+        rest = bytes(self.buffer)
+        self.buffer.clear()
+        return _transform(rest, self.keys, self.decrypt)
+
+
+def columnar_file(src, dst, key, key2=None, decrypt=False, block_size=BLOCK_SIZE, chunk_size=1 << 20):
+    """
+    Transpose the file at path src into path dst, block by block.
+
+    Returns:
+        Number of bytes written
+    """
+    stream = ColumnarStream(key, key2, decrypt, block_size)
+    written = 0
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        while True:
+            chunk = fin.read(chunk_size)
+            if not chunk:
+                break
+            written += fout.write(stream.update(chunk))
+        written += fout.write(stream.final())
+    return written
@@ -0,0 +1,516 @@
+# ===============================================================
+# CRYPTO SERVICE - ASYNCIO SERVER WITH PER-KEY MICRO-BATCHING
+# ===============================================================
+# Libraries needed: asyncio, struct (built-in); cryptography for the
+# Fernet operations
+# Description: Serves the cipherss.py operations (hash, HMAC, Caesar,
+# Vigenère, Fernet) over TCP ("host:port") or a Unix socket (a path
+# containing "/", e.g. ./svc.sock).
+#
+#   - persistent connections, pipelined: a client may send any number of
+#     requests without waiting; every reply carries the request id and
+#     replies come back as soon as they are ready (not in order)
+#   - requests for the same (operation, key) that arrive together are
+#     gathered into one micro-batch and handled by one call, e.g.
+#     hmac_cache.sign_many() copies the cached keyed state per message,
+#     a Vigenère key's shifts and a Fernet object are built once per batch
+#   - a batch is collected until the event loop has read everything that
+#     is ready (plus --batch-delay, 0 by default) or MAX_BATCH requests;
+#     Fernet batches and batches over INLINE_LIMIT bytes run on a thread
+#     pool (OpenSSL / hashlib / NumPy release the GIL), small ones run
+#     inline where a thread hand-off would cost more than the work
+#
+# Frames (big-endian):
+#   request:  length:u32 | id:u32 | op:u8 | key length:u16 | key | payload
+#   reply:    length:u32 | id:u32 | status:u8 (0 ok, 1 error) | payload
+# (length counts the bytes after the length field)
+#
+# Usage:
+#   python crypto_service.py serve 127.0.0.1:7800
+#   python crypto_service.py load 127.0.0.1:7800 --op hmac --size 64
+#   python crypto_service.py load --local --op sha256 --connections 8
+# ===============================================================
+
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import stat
+import struct
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from hmac_cache import sign_many
+from lazy import optional_module
+from metrics import percentile
+from substitution import caesar_translate
+from vigenere import VigenereStream
+
+fernet_lib = optional_module("cryptography.fernet")  # None if missing, imported on first use
+
+LENGTH = struct.Struct(">I")
+REQUEST = struct.Struct(">IBH")  # id, op, key length
+REPLY = struct.Struct(">IB")     # id, status
+
+OK, ERROR = 0, 1
+# Largest accepted frame
+MAX_FRAME = 64 << 20
+# Requests per micro-batch
+MAX_BATCH = 256
+# Batches with more payload bytes than this go to the thread pool
+INLINE_LIMIT = 64 << 10
+# Unanswered requests per connection before reading pauses
+MAX_INFLIGHT = 1024
+# Buffered reply bytes per connection before the reader waits for drain
+WRITE_HIGH_WATER = 1 << 20
+WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+class ServiceError(Exception):
+    """Error reply from the service"""
+
+
+# ---------------------------------------------------------------
+# Operations: each handles a whole batch for one key
+# ---------------------------------------------------------------
+
+def _hash_batch(name):
+    def batch(key, payloads):
+        return [hashlib.new(name, p).hexdigest().encode("ascii") for p in payloads]
+    return batch
+
+
+def _hmac_batch(key, payloads):
+    return [tag.encode("ascii") for tag in sign_many(key, payloads, hexdigest=True)]
+
+
+def _caesar_batch(decrypt):
+    def batch(key, payloads):
+        shift = int(key)
+        if decrypt:
+            shift = -shift
+        return [caesar_translate(p, shift) for p in payloads]
+    return batch
+
+
+def _vigenere_batch(decrypt):
+    def batch(key, payloads):
+        stream = VigenereStream(key.decode("ascii"), decrypt)  # key shifts once per batch
+        results = []
+        for p in payloads:
+            stream.position = 0
+            results.append(stream.update(p))
+        return results
+    return batch
+
+
+@lru_cache(maxsize=64)
+def _fernet(key):
+    if fernet_lib is None:
+        raise ImportError("Fernet needs the cryptography package: pip install cryptography")
+    return fernet_lib.Fernet(key)
+
+
+def _fernet_encrypt_batch(key, payloads):
+    encrypt = _fernet(key).encrypt
+    return [encrypt(p) for p in payloads]
+
+
+def _fernet_decrypt_batch(key, payloads):
+    fernet = _fernet(key)
+    results = []
+    for p in payloads:
+        try:
+            results.append(fernet.decrypt(p))
+        except fernet_lib.InvalidToken:
+            results.append(ValueError("invalid Fernet token"))
+    return results
+
+
+class Operation:
+    """
+    One service operation.
+
+    Args:
+        code: op byte on the wire
+        name: op name for clients
+        batch: batch(key, payloads) -> list of result bytes (or exceptions)
+        heavy: always run on the thread pool
+    """
+
+    def __init__(self, code, name, batch, heavy=False):
+        self.code = code
+        self.name = name
+        self.batch = batch
+        self.heavy = heavy
+
+
+OPERATIONS = [
+    Operation(1, "sha256", _hash_batch("sha256")),
+    Operation(2, "md5", _hash_batch("md5")),
+    Operation(3, "hmac", _hmac_batch),
+    Operation(4, "caesar_encrypt", _caesar_batch(False)),
+    Operation(5, "caesar_decrypt", _caesar_batch(True)),
+    Operation(6, "vigenere_encrypt", _vigenere_batch(False)),
+    Operation(7, "vigenere_decrypt", _vigenere_batch(True)),
+    Operation(8, "fernet_encrypt", _fernet_encrypt_batch, heavy=True),
+    Operation(9, "fernet_decrypt", _fernet_decrypt_batch, heavy=True),
+]
+BY_CODE = {op.code: op for op in OPERATIONS}
+BY_NAME = {op.name: op for op in OPERATIONS}
+STATS_OP = 0  # reply: server counters as JSON
+
+
+def run_batch(op, key, payloads):
+    """Run one batch; an exception fails every request of the batch"""
+    try:
+        return op.batch(key, payloads)
+    except Exception as e:
+        return [e] * len(payloads)
+
+
+def _reply(request_id, result):
+    if isinstance(result, Exception):
+        status, body = ERROR, f"{type(result).__name__}: {result}".encode("utf-8")
+    else:
+        status, body = OK, result
+    return LENGTH.pack(REPLY.size + len(body)) + REPLY.pack(request_id, status) + body
+
+
+# ---------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------
+
+class CryptoService:
+    """
+    Micro-batching request dispatcher and connection handler.
+
+    Args:
+        max_batch: requests per batch (1 disables batching)
+        batch_delay: extra seconds a batch waits for more requests
+        workers: thread pool size for heavy batches
+    """
+
+    def __init__(self, max_batch=MAX_BATCH, batch_delay=0.0, workers=WORKERS):
+        self.max_batch = max_batch
+        self.batch_delay = batch_delay
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.pending = {}  # (op code, key) -> (requests, timer handle)
+        self.stats = Counter()
+
+    def submit(self, op, key, payload, deliver):
+        """Queue one request; deliver(result) is called with its result"""
+        slot = (op.code, key)
+        entry = self.pending.get(slot)
+        if entry is None:
+            loop = asyncio.get_running_loop()
+            if self.batch_delay:
+                handle = loop.call_later(self.batch_delay, self._flush, slot)
+            else:
+                handle = loop.call_soon(self._flush, slot)  # after the reads now ready
+            entry = self.pending[slot] = ([], handle)
+        requests = entry[0]
+        requests.append((payload, deliver))
+        if len(requests) >= self.max_batch:
+            entry[1].cancel()
+            self._flush(slot)
+
+    def _flush(self, slot):
+        entry = self.pending.pop(slot, None)
+        if entry is None:
+            return
+        requests = entry[0]
+        op, key = BY_CODE[slot[0]], slot[1]
+        payloads = [payload for payload, _ in requests]
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(requests)
+        if op.heavy or sum(map(len, payloads)) > INLINE_LIMIT:
+            self.stats["pool_batches"] += 1
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor, run_batch, op, key, payloads)
+            future.add_done_callback(lambda f: self._deliver(requests, f.result()))
+        else:
+            self._deliver(requests, run_batch(op, key, payloads))
+
+    @staticmethod
+    def _deliver(requests, results):
+        for (_, deliver), result in zip(requests, results):
+            deliver(result)
+
+    def snapshot(self):
+        stats = dict(self.stats)
+        stats["mean_batch"] = self.stats["requests"] / max(self.stats["batches"], 1)
+        return stats
+
+    async def handle_connection(self, reader, writer):
+        inflight = asyncio.Semaphore(MAX_INFLIGHT)
+        transport = writer.transport
+
+        def responder(request_id):
+            def deliver(result):
+                inflight.release()
+                if not transport.is_closing():
+                    writer.write(_reply(request_id, result))
+            return deliver
+
+        try:
+            while True:
+                (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+                if not REQUEST.size <= length <= MAX_FRAME:
+                    break  # not our protocol
+                body = await reader.readexactly(length)
+                request_id, code, key_length = REQUEST.unpack_from(body)
+                key = body[REQUEST.size:REQUEST.size + key_length]
+                payload = body[REQUEST.size + key_length:]
+
+                if code == STATS_OP:
+                    writer.write(_reply(request_id, json.dumps(self.snapshot()).encode("utf-8")))
+                    continue
+                op = BY_CODE.get(code)
+                if op is None:
+                    writer.write(_reply(request_id, ValueError(f"unknown op {code}")))
+                    continue
+                await inflight.acquire()
+                self.submit(op, key, payload, responder(request_id))
+                if transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _is_unix(address):
+    """Unix socket paths contain a "/" (./svc.sock); anything else is host:port"""
+    return "/" in address
+
+
+def _split_tcp(address):
+    host, sep, port = address.rpartition(":")
+    if not sep:
+        raise ValueError(f"address {address!r} is neither host:port nor a socket path "
+                         f"(write ./{address} for a socket in this directory)")
+    return host or "127.0.0.1", int(port)
+
+
+def _remove_stale_socket(path):
+    """Remove a socket left by an earlier run; refuse to replace anything else"""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    os.remove(path)
+
+
+async def start_server(address, service=None):
+    """Start serving on address; returns the asyncio server"""
+    service = service or CryptoService()
+    if _is_unix(address):
+        _remove_stale_socket(address)
+        return await asyncio.start_unix_server(service.handle_connection, address)
+    host, port = _split_tcp(address)
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+def serve(address, max_batch=MAX_BATCH, batch_delay=0.0, workers=WORKERS):
+    """Run the service until interrupted"""
+    async def main():
+        server = await start_server(address, CryptoService(max_batch, batch_delay, workers))
+        async with server:
+            await server.serve_forever()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+# ---------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------
+
+class CryptoClient:
+    """
+    Pipelining client: request() may be awaited from many tasks at once
+    on the same connection.  Use 'await CryptoClient.connect(address)'.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.waiting = {}
+        self._ids = itertools.count(1)
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_replies())
+
+    @classmethod
+    async def connect(cls, address):
+        if _is_unix(address):
+            reader, writer = await asyncio.open_unix_connection(address)
+        else:
+            reader, writer = await asyncio.open_connection(*_split_tcp(address))
+        return cls(reader, writer)
+
+    async def _read_replies(self):
+        try:
+            while True:
+                (length,) = LENGTH.unpack(await self.reader.readexactly(LENGTH.size))
+                body = await self.reader.readexactly(length)
+                request_id, status = REPLY.unpack_from(body)
+                future = self.waiting.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if status == OK:
+                    future.set_result(body[REPLY.size:])
+                else:
+                    future.set_exception(ServiceError(body[REPLY.size:].decode("utf-8", "replace")))
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            for future in self.waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"service connection lost ({e})"))
+            self.waiting.clear()
+
+    async def request(self, op, payload=b"", key=b""):
+        """Send one request (op name or code); returns the reply payload"""
+        code = op if isinstance(op, int) else BY_NAME[op].code
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+        request_id = next(self._ids) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        self.writer.write(LENGTH.pack(REQUEST.size + len(key) + len(payload))
+                          + REQUEST.pack(request_id, code, len(key)) + key + payload)
+        if self.writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+            await self.writer.drain()
+        return await future
+
+    async def stats(self):
+        return json.loads(await self.request(STATS_OP))
+
+    async def close(self):
+        self.writer.close()
+        self._reader_task.cancel()
+
+
+# ---------------------------------------------------------------
+# Load generator
+# ---------------------------------------------------------------
+
+async def load_test(address, op, key=b"", size=64, requests=20000, connections=4, pipeline=32):
+    """
+    Keep 'pipeline' requests in flight on each of 'connections' connections.
+
+    Returns:
+        Dict with requests, seconds, rps, p50/p90/p99 latency in ms and the
+        server's batching counters
+    """
+    payload = (b"the quick brown fox jumps over the lazy dog " * (size // 44 + 1))[:size]
+    if op == "fernet_decrypt":
+        probe = await CryptoClient.connect(address)
+        payload = await probe.request("fernet_encrypt", payload, key)
+        await probe.close()
+    clients = [await CryptoClient.connect(address) for _ in range(connections)]
+    before = await clients[0].stats()
+    latencies = []
+    remaining = itertools.count(requests, -1)
+    clock = time.perf_counter
+
+    async def sender(client):
+        while next(remaining) > 0:
+            start = clock()
+            await client.request(op, payload, key)
+            latencies.append(clock() - start)
+
+    started = clock()
+    await asyncio.gather(*(sender(c) for c in clients for _ in range(pipeline)))
+    elapsed = clock() - started
+    after = await clients[0].stats()
+    for client in clients:
+        await client.close()
+
+    latencies.sort()
+    batches = after.get("batches", 0) - before.get("batches", 0)
+    return {
+        "requests": len(latencies), "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p90_ms": percentile(latencies, 0.90) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+        "batches": batches,
+        "mean_batch": (after.get("requests", 0) - before.get("requests", 0)) / max(batches, 1),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import multiprocessing
+    import sys
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Batching crypto service")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("serve", help="run the service")
+    p.add_argument("address", help="host:port or Unix socket path (with a /, e.g. ./svc.sock)")
+    p.add_argument("--max-batch", type=int, default=MAX_BATCH, help="1 disables batching")
+    p.add_argument("--batch-delay", type=float, default=0.0, help="milliseconds to wait for more requests")
+    p.add_argument("--threads", type=int, default=WORKERS)
+
+    p = sub.add_parser("load", help="load generator")
+    p.add_argument("address", nargs="?", help="service to load (omit with --local)")
+    p.add_argument("--local", action="store_true", help="start a service in a child process")
+    p.add_argument("--max-batch", type=int, default=MAX_BATCH, help="--local service batch size")
+    p.add_argument("--op", default="hmac", choices=sorted(BY_NAME))
+    p.add_argument("--key", default=None, help="key (default: one that suits --op)")
+    p.add_argument("--size", type=int, default=64, help="payload bytes")
+    p.add_argument("--requests", type=int, default=20000)
+    p.add_argument("--connections", type=int, default=4)
+    p.add_argument("--pipeline", type=int, default=32, help="requests in flight per connection")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        print(f"Serving on {args.address}", file=sys.stderr)
+        try:
+            serve(args.address, args.max_batch, args.batch_delay / 1000, args.threads)
+        except (ValueError, OSError) as e:
+            parser.exit(1, f"crypto_service: {e}\n")
+        sys.exit(0)
+
+    if args.op.startswith("fernet") and fernet_lib is None:
+        parser.error(f"--op {args.op} needs the cryptography package: pip install cryptography")
+    if args.key is not None:
+        key = args.key.encode("utf-8")
+    elif args.op.startswith("fernet"):
+        key = fernet_lib.Fernet.generate_key()
+    elif args.op.startswith("caesar"):
+        key = b"3"
+    elif args.op.startswith("vigenere"):
+        key = b"lemon"
+    else:
+        key = b"my_secret_key"
+
+    server = None
+    address = args.address
+    if args.local:
+        address = os.path.join(tempfile.mkdtemp(), "crypto.sock")
+        server = multiprocessing.Process(target=serve, args=(address, args.max_batch), daemon=True)
+        server.start()
+        while not os.path.exists(address):
+            time.sleep(0.05)
+    elif not address:
+        parser.error("give the service address or --local")
+
+    try:
+        result = asyncio.run(load_test(address, args.op, key, args.size, args.requests,
+                                       args.connections, args.pipeline))
+    finally:
+        if server is not None:
+            server.terminate()
+    print(f"{args.op}: {result['requests']:,} requests of {args.size} B over {args.connections} connections "
+          f"x {args.pipeline} in flight")
+    print(f"  {result['rps']:,.0f} requests/sec in {result['seconds']:.2f}s")
+    print(f"  latency p50 {result['p50_ms']:.2f} ms  p90 {result['p90_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms")
+    print(f"  {result['batches']:,} batches, {result['mean_batch']:.1f} requests per batch")
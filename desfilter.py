@@ -0,0 +1,194 @@
+# ===============================================================
+# DES CANDIDATE FILTER - STAGED EARLY REJECTION
+# ===============================================================
+# Libraries needed: pycryptodome (install with: pip install pycryptodome)
+# Description: Almost every key tried in a brute force is wrong, so the
+# check is split into stages ordered from cheapest to most expensive and
+# a candidate leaves at the first stage it fails:
+#
+#   1. padding  - decrypt ONLY the last block (ECB blocks are independent)
+#                 and check the PKCS#7 padding
+#   2. tail     - the unpadded last block must be printable text
+#   3. body     - decrypt the remaining blocks, must be printable too
+#   4. english  - one pass over the text looking for any common word
+#
+# Printable checks use bytes.translate (deletes every allowed byte in C,
+# anything left over is bad) instead of a per-byte Python generator.
+# The word check is a single compiled alternation regex: the regex
+# engine scans the text once for all words instead of ~35 'in' scans.
+# Per-stage rejection counters show where the time goes.
+# ===============================================================
+
+import re
+
+from lazy import lazy_module
+
+DES = lazy_module("Crypto.Cipher.DES", "install with: pip install pycryptodome")
+
+# Words that make a decryption "likely English"
+ENGLISH_WORDS = ['the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'its', 'may', 'new', 'now', 'old', 'see', 'two', 'who', 'boy', 'did', 'man', 'men', 'put', 'too', 'use']
+
+# Bytes allowed in a readable plaintext: printable ASCII, \n and \r
+PRINTABLE = bytes(range(32, 127)) + b"\n\r"
+
+BLOCK_SIZE = 8  # DES block size (known without importing PyCryptodome)
+
+STAGES = ("padding", "tail", "body", "english")
+
+
+def des_key(key_candidate):
+    """Turn a str / bytes key candidate into an 8-byte DES key"""
+    if isinstance(key_candidate, str):
+        key_candidate = key_candidate.encode('utf-8')
+    if len(key_candidate) == 8:
+        return key_candidate
+    return bytes(key_candidate[:8]).ljust(8, b'\x00')
+
+
+# ===============================================================
+# PARITY-BIT KEY EQUIVALENCE
+# ===============================================================
+# DES ignores the lowest bit of every key byte (it was meant as a parity
+# bit), so e.g. '0' (0x30) and '1' (0x31) select the same 56-bit key.
+# Testing both is wasted work.
+
+# bytes.translate table that clears the low (parity) bit of every byte
+PARITY_TABLE = bytes(b & 0xFE for b in range(256))
+
+
+def effective_key(key_candidate):
+    """Return the 8-byte DES key with the ignored parity bits cleared"""
+    return bytes(des_key(key_candidate)).translate(PARITY_TABLE)
+
+
+def reduce_charset(charset):
+    """
+    Keep one character per parity class, in charset order.
+
+    Each kept character is the FIRST member of its class, so the first
+    hit of a search over the reduced charset is exactly the first hit a
+    search over the full charset would report.
+    """
+    seen = set()
+    kept = []
+    for ch in charset:
+        effective = ord(ch) & 0xFE
+        if effective not in seen:
+            seen.add(effective)
+            kept.append(ch)
+    return "".join(kept)
+
+
+def reduction_ratio(charset, reduced, lengths):
+    """How many times fewer keys the reduced charset needs for 'lengths'"""
+    full = sum(len(charset) ** n for n in lengths)
+    return full / sum(len(reduced) ** n for n in lengths)
+
+
+def word_pattern(words):
+    """Compile a list of words into one case-insensitive matcher"""
+    words = sorted(set(words), key=len, reverse=True)
+    alternation = "|".join(re.escape(w) for w in words)
+    return re.compile(alternation.encode('utf-8'), re.IGNORECASE)
+
+
+class CandidateFilter:
+    """
+    Staged plaintext check for one DES-ECB ciphertext.
+
+    Args:
+        ciphertext: the encrypted bytes
+        words: words that confirm an English plaintext
+    """
+
+    def __init__(self, ciphertext, words=ENGLISH_WORDS):
+        self.ciphertext = ciphertext
+        # ECB with PKCS#7 needs at least one whole block
+        self.valid = len(ciphertext) > 0 and len(ciphertext) % BLOCK_SIZE == 0
+        self.last_block = bytes(ciphertext[-BLOCK_SIZE:])
+        self.body = bytes(ciphertext[:-BLOCK_SIZE])
+        self.pattern = word_pattern(words)
+
+        self.tested = 0
+        self.rejected_padding = 0
+        self.rejected_tail = 0
+        self.rejected_body = 0
+        self.rejected_english = 0
+
+    def readable(self, cipher):
+        """
+        Stages 1-3: return the unpadded plaintext bytes if it is
+        printable text, else None.  'cipher' is a DES-ECB cipher object.
+        """
+        self.tested += 1
+        if not self.valid:
+            self.rejected_padding += 1
+            return None
+
+        # Stage 1: decrypt the last block and check the padding
+        tail = cipher.decrypt(self.last_block)
+        pad_len = tail[-1]
+        if not 1 <= pad_len <= BLOCK_SIZE or tail[-pad_len:] != bytes((pad_len,)) * pad_len:
+            self.rejected_padding += 1
+            return None
+
+        # Stage 2: the rest of the last block must be printable
+        tail = tail[:-pad_len]
+        if tail.translate(None, PRINTABLE):
+            self.rejected_tail += 1
+            return None
+
+        # Stage 3: decrypt everything else, also printable
+        if not self.body:
+            return tail
+        body = cipher.decrypt(self.body)
+        if body.translate(None, PRINTABLE):
+            self.rejected_body += 1
+            return None
+        return body + tail
+
+    def decrypt_text(self, key_candidate):
+        """Stages 1-3 for a key: the readable plaintext as str, or None"""
+        plaintext = self.readable(DES.new(des_key(key_candidate), DES.MODE_ECB))
+        if plaintext is None:
+            return None
+        return plaintext.decode('utf-8', errors='ignore')
+
+    def test_cipher(self, cipher):
+        """All stages: return the plaintext str if it looks English, else None"""
+        plaintext = self.readable(cipher)
+        if plaintext is None:
+            return None
+        # Stage 4: non-blank and contains a common English word
+        if not plaintext.strip() or not self.pattern.search(plaintext):
+            self.rejected_english += 1
+            return None
+        return plaintext.decode('utf-8', errors='ignore')
+
+    def test(self, key_candidate):
+        """All stages for a str / bytes key candidate"""
+        return self.test_cipher(DES.new(des_key(key_candidate), DES.MODE_ECB))
+
+    def stats(self):
+        """Return tested / rejected-per-stage / passed counters"""
+        rejected = {
+            "padding": self.rejected_padding,
+            "tail": self.rejected_tail,
+            "body": self.rejected_body,
+            "english": self.rejected_english,
+        }
+        return {
+            "tested": self.tested,
+            "rejected": rejected,
+            "passed": self.tested - sum(rejected.values()),
+        }
+
+    def report(self):
+        """Print the per-stage rejection counters"""
+        stats = self.stats()
+        tested = stats["tested"] or 1
+        print(f"Candidates tested: {stats['tested']}")
+        for stage in STAGES:
+            count = stats["rejected"][stage]
+            print(f"  rejected at {stage:<8}: {count:>12} ({100 * count / tested:.2f}%)")
+        print(f"  passed all stages  : {stats['passed']:>12}")
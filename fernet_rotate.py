@@ -0,0 +1,349 @@
+# ===============================================================
+# BULK FERNET KEY ROTATION - PROCESS POOL, BATCHED, RESUMABLE
+# ===============================================================
+# Libraries needed: cryptography (install with: pip install cryptography),
+#                   sqlite3, multiprocessing (built-in)
+# Description: Re-encrypts stored Fernet tokens under a new key, the way
+# MultiFernet.rotate() does: decrypt with whichever key (new or old)
+# fits, encrypt with the new key.
+#
+#   - tokens are read in batches and rotated on a process pool (Fernet is
+#     CPU bound, so processes instead of threads); only a few batches
+#     are in flight, so memory stays flat for any number of records
+#   - results are written back one batch per transaction
+#   - progress is saved with every batch: an SQLite run stores the last
+#     finished id in the same transaction as the updates, a token file
+#     run stores line / output offset in a Checkpoint (keyspace.py)
+#   - tokens that already verify under the new key are left alone, so
+#     running the tool again (or after a crash) never double-rotates
+#
+# Stores:
+#   SQLiteStore(path, table, id_column, token_column)
+#   TokenFileStore(src, dst)     - one token per line
+# ===============================================================
+
+import multiprocessing
+import os
+import re
+import sqlite3
+import time
+from collections import deque
+
+from keyspace import Checkpoint
+from lazy import optional_module
+
+fernet_lib = optional_module("cryptography.fernet")  # None if missing, imported on first use
+
+# Records per batch (one worker task, one transaction)
+BATCH_SIZE = 2000
+# Failed record ids kept in the summary (the count is always exact)
+MAX_REPORTED_FAILURES = 100
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class Rotator:
+    """
+    Rotates single tokens to the new key.
+
+    Args:
+        new_key: key tokens are re-encrypted with
+        old_keys: keys the existing tokens may be encrypted with
+    """
+
+    def __init__(self, new_key, old_keys):
+        if fernet_lib is None:
+            raise ImportError("Key rotation needs the cryptography package: pip install cryptography")
+        self.current = fernet_lib.Fernet(new_key)
+        self.multi = fernet_lib.MultiFernet([self.current] + [fernet_lib.Fernet(k) for k in old_keys])
+
+    def rotate(self, token):
+        """
+        Return ("current", None), ("rotated", new token) or ("failed", None).
+        """
+        try:
+            # Only checks the HMAC (no decryption): cheap idempotency test
+            self.current.extract_timestamp(token)
+            return "current", None
+        except fernet_lib.InvalidToken:
+            pass
+        try:
+            return "rotated", self.multi.rotate(token)
+        except fernet_lib.InvalidToken:
+            return "failed", None
+
+    def rotate_batch(self, batch):
+        """
+        Rotate a list of (record id, token).
+
+        Returns:
+            (updates, current, failed) - updates is a list of
+            (record id, new token), failed a list of record ids
+        """
+        updates, failed = [], []
+        current = 0
+        for record_id, token in batch:
+            status, new_token = self.rotate(token)
+            if status == "rotated":
+                updates.append((record_id, new_token))
+            elif status == "current":
+                current += 1
+            else:
+                failed.append(record_id)
+        return updates, current, failed
+
+
+_rotator = None
+
+
+def _init_worker(new_key, old_keys):
+    """Pool initializer: build the Fernet objects once per process"""
+    global _rotator
+    _rotator = Rotator(new_key, old_keys)
+
+
+def _rotate_batch(batch):
+    """Worker: rotate one batch"""
+    return _rotator.rotate_batch(batch)
+
+
+# ---------------------------------------------------------------
+# Stores
+# ---------------------------------------------------------------
+
+class SQLiteStore:
+    """
+    Tokens in an SQLite table, read in id order.
+
+    Progress lives in a 'fernet_rotation' table of the same database and
+    is updated in the same transaction as the tokens.
+    """
+
+    def __init__(self, path, table, id_column="id", token_column="token"):
+        for name in (table, id_column, token_column):
+            if not _IDENTIFIER.match(name):
+                raise ValueError(f"Invalid SQL identifier {name!r}")
+        self.conn = sqlite3.connect(path)
+        self.table = table
+        self.id_column = id_column
+        self.token_column = token_column
+        self.name = f"{table}.{token_column}"
+        # Ids (of batches not yet written) whose token was read as a BLOB:
+        # it is written back as a BLOB, TEXT tokens as TEXT
+        self._blob_ids = set()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS fernet_rotation (name TEXT PRIMARY KEY, last_id)")
+        self.conn.commit()
+
+    def resume_point(self):
+        """Last id finished by an interrupted run, or None"""
+        row = self.conn.execute(
+            "SELECT last_id FROM fernet_rotation WHERE name = ?", (self.name,)).fetchone()
+        return row[0] if row else None
+
+    def batches(self, size):
+        """Yield lists of (id, token) after the resume point"""
+        last = self.resume_point()
+        query = (f"SELECT {self.id_column}, {self.token_column} FROM {self.table} "
+                 f"WHERE {self.token_column} IS NOT NULL")
+        while True:
+            if last is None:
+                rows = self.conn.execute(
+                    f"{query} ORDER BY {self.id_column} LIMIT ?", (size,)).fetchall()
+            else:
+                rows = self.conn.execute(
+                    f"{query} AND {self.id_column} > ? ORDER BY {self.id_column} LIMIT ?",
+                    (last, size)).fetchall()
+            if not rows:
+                return
+            self._blob_ids.update(record_id for record_id, token in rows if isinstance(token, bytes))
+            yield [(record_id, _as_bytes(token)) for record_id, token in rows]
+            last = rows[-1][0]
+
+    def write(self, batch, updates):
+        """Store the rotated tokens of a batch and its progress in one transaction"""
+        with self.conn:
+            self.conn.executemany(
+                f"UPDATE {self.table} SET {self.token_column} = ? WHERE {self.id_column} = ?",
+                [(token if record_id in self._blob_ids else token.decode("ascii"), record_id)
+                 for record_id, token in updates])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO fernet_rotation (name, last_id) VALUES (?, ?)",
+                (self.name, batch[-1][0]))
+        self._blob_ids.difference_update(record_id for record_id, _ in batch)
+
+    def finish(self):
+        """Drop the progress row (run complete) and close"""
+        with self.conn:
+            self.conn.execute("DELETE FROM fernet_rotation WHERE name = ?", (self.name,))
+        self.conn.close()
+
+
+class TokenFileStore:
+    """
+    Tokens one per line in 'src'; the rotated file is written to 'dst'
+    (same lines, same order).  Progress goes to dst + ".progress".
+    """
+
+    def __init__(self, src, dst):
+        self.src = src
+        self.dst = dst
+        self.checkpoint = Checkpoint(dst + ".progress")
+        state = self.checkpoint.load()
+        if state and os.path.exists(dst):
+            self.lines = state["lines"]
+            self.out = open(dst, "r+b")
+            self.out.truncate(state["output_bytes"])
+            self.out.seek(state["output_bytes"])
+        else:
+            self.lines = 0
+            self.out = open(dst, "wb")
+
+    def resume_point(self):
+        """Lines already finished by an interrupted run"""
+        return self.lines or None
+
+    def batches(self, size):
+        """Yield lists of (line number, token) after the resume point"""
+        batch = []
+        with open(self.src, "rb") as f:
+            for number, line in enumerate(f):
+                if number < self.lines:
+                    continue
+                batch.append((number, line.strip()))
+                if len(batch) == size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def write(self, batch, updates):
+        """Append the batch (rotated where possible) and save progress"""
+        new_tokens = dict(updates)
+        self.out.write(b"".join(new_tokens.get(n, token) + b"\n" for n, token in batch))
+        self.out.flush()
+        os.fsync(self.out.fileno())
+        self.lines = batch[-1][0] + 1
+        self.checkpoint.save({"lines": self.lines, "output_bytes": self.out.tell()})
+
+    def finish(self):
+        """Close the output and drop the progress file (run complete)"""
+        self.out.close()
+        self.checkpoint.clear()
+
+
+def _as_bytes(token):
+    return token.encode("ascii") if isinstance(token, str) else bytes(token)
+
+
+# ---------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------
+
+def rotate_store(store, new_key, old_keys, workers=None, batch_size=BATCH_SIZE, progress=None):
+    """
+    Rotate every token of a store to new_key.
+
+    Args:
+        store: SQLiteStore or TokenFileStore
+        new_key: the new Fernet key
+        old_keys: keys the existing tokens may be encrypted with
+        workers: processes (default: CPU count; 1 = no pool)
+        batch_size: records per batch / transaction
+        progress: optional callable(summary) after every batch
+
+    Returns:
+        Summary dict: records, rotated, current, failed, failed_ids,
+        seconds, records_per_sec, resumed_from
+    """
+    workers = workers or multiprocessing.cpu_count()
+    summary = {"records": 0, "rotated": 0, "current": 0, "failed": 0, "failed_ids": [],
+               "resumed_from": store.resume_point()}
+    started = time.perf_counter()
+
+    def record(batch, result):
+        updates, current, failed = result
+        store.write(batch, updates)
+        summary["records"] += len(batch)
+        summary["rotated"] += len(updates)
+        summary["current"] += current
+        summary["failed"] += len(failed)
+        room = MAX_REPORTED_FAILURES - len(summary["failed_ids"])
+        summary["failed_ids"].extend(failed[:max(room, 0)])
+        if progress:
+            progress(summary)
+
+    batches = store.batches(batch_size)
+    if workers <= 1:
+        rotator = Rotator(new_key, old_keys)
+        for batch in batches:
+            record(batch, rotator.rotate_batch(batch))
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(new_key, old_keys)) as pool:
+            # Bounded in-flight window; results are written in batch order,
+            # so the saved progress never skips an unwritten batch
+            pending = deque()
+            for batch in batches:
+                pending.append((batch, pool.apply_async(_rotate_batch, (batch,))))
+                if len(pending) >= 2 * workers:
+                    batch, result = pending.popleft()
+                    record(batch, result.get())
+            while pending:
+                batch, result = pending.popleft()
+                record(batch, result.get())
+
+    store.finish()
+    summary["seconds"] = max(time.perf_counter() - started, 1e-9)
+    summary["records_per_sec"] = summary["records"] / summary["seconds"]
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Bulk Fernet key rotation")
+    parser.add_argument("--new-key-file", required=True)
+    parser.add_argument("--old-key-file", action="append", default=[],
+                        help="key the current tokens may use (repeat for several)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    sub = parser.add_subparsers(dest="store", required=True)
+
+    db = sub.add_parser("sqlite", help="tokens in an SQLite table")
+    db.add_argument("database")
+    db.add_argument("table")
+    db.add_argument("--id-column", default="id")
+    db.add_argument("--token-column", default="token")
+
+    tf = sub.add_parser("file", help="one token per line")
+    tf.add_argument("src")
+    tf.add_argument("dst")
+    args = parser.parse_args()
+
+    def read_key(path):
+        with open(path, "rb") as f:
+            return f.read().strip()
+
+    if args.store == "sqlite":
+        store = SQLiteStore(args.database, args.table, args.id_column, args.token_column)
+    else:
+        store = TokenFileStore(args.src, args.dst)
+
+    def show(summary):
+        print(f"\r{summary['records']:,} records ({summary['rotated']:,} rotated, "
+              f"{summary['current']:,} already current, {summary['failed']:,} failed)",
+              end="", file=sys.stderr)
+
+    summary = rotate_store(store, read_key(args.new_key_file), [read_key(p) for p in args.old_key_file],
+                           args.workers, args.batch_size, progress=show)
+    print(file=sys.stderr)
+    if summary["resumed_from"] is not None:
+        print(f"Resumed after {summary['resumed_from']}")
+    print(f"{summary['records']:,} records in {summary['seconds']:.1f}s "
+          f"({summary['records_per_sec']:,.0f} records/sec)")
+    if summary["failed"]:
+        print(f"{summary['failed']} tokens could not be decrypted with any key, e.g. "
+              f"{summary['failed_ids'][:10]}")
+        sys.exit(1)
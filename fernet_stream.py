@@ -0,0 +1,312 @@
+# ===============================================================
+# STREAMING FERNET - SEGMENTED FORMAT FOR LARGE FILES
+# ===============================================================
+# Libraries needed: cryptography (install with: pip install cryptography)
+# Description: A Fernet token holds its whole plaintext, so a multi-GB
+# file cannot be one token.  This format splits the input into fixed
+# size segments and encrypts each one as its own Fernet token:
+#
+#   header : MAGIC | version | segment size | file id (16 random bytes)
+#   records: token length (4 bytes) | Fernet token      (one per segment)
+#
+# Inside every token the segment data is prefixed with
+#
+#   file id | segment index | final flag
+#
+# so the segments are bound to this file and to their position: swapping,
+# dropping, duplicating or splicing in segments from another file, or
+# cutting the file after any segment, is detected on decryption.
+#
+# Encryption and decryption run as a pipeline: segments are read one
+# after another, processed on a thread pool and written in order, with
+# only a few segments in flight.  Memory therefore depends on the
+# segment size, not on the file size.  Every full segment has the same
+# record length, so FernetStreamReader can decrypt any single segment
+# (or byte range) without touching the rest of the file.
+# ===============================================================
+
+import os
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from lazy import optional_module
+
+fernet_lib = optional_module("cryptography.fernet")  # None if missing, imported on first use
+
+MAGIC = b"FSEG"
+VERSION = 1
+# Plaintext bytes per segment (1 MB)
+SEGMENT_SIZE = 1 << 20
+# Encryption threads
+WORKERS = min(8, os.cpu_count() or 1)
+
+# MAGIC, version, segment size, file id
+HEADER = struct.Struct(">4sBI16s")
+# Length prefix of every record
+RECORD_LENGTH = struct.Struct(">I")
+# file id, segment index, final flag (inside each token)
+SEGMENT_PREFIX = struct.Struct(">16sQB")
+
+
+def _require_fernet():
+    if fernet_lib is None:
+        raise ImportError("Streaming Fernet needs the cryptography package: pip install cryptography")
+
+
+def _fernet(key):
+    _require_fernet()
+    return key if isinstance(key, fernet_lib.Fernet) else fernet_lib.Fernet(key)
+
+
+def generate_key():
+    """Return a new Fernet key"""
+    _require_fernet()
+    return fernet_lib.Fernet.generate_key()
+
+
+def _read_full(f, size):
+    """Read exactly 'size' bytes unless EOF comes first"""
+    data = f.read(size)
+    if len(data) == size or not data:
+        return data
+    parts = [data]
+    remaining = size - len(data)
+    while remaining:
+        more = f.read(remaining)
+        if not more:
+            break
+        parts.append(more)
+        remaining -= len(more)
+    return b"".join(parts)
+
+
+def _pipeline(func, items, workers):
+    """func() over items on a thread pool, results in order, bounded in flight"""
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _plain_segments(fin, segment_size):
+    """Yield (index, data, final) for the input, reading one segment ahead"""
+    index = 0
+    data = _read_full(fin, segment_size)
+    while True:
+        following = _read_full(fin, segment_size) if len(data) == segment_size else b""
+        yield index, data, not following
+        if not following:
+            return
+        index += 1
+        data = following
+
+
+def encrypt_stream(fin, fout, key, segment_size=SEGMENT_SIZE, workers=WORKERS):
+    """
+    Encrypt a binary file object into the segmented format.
+
+    Args:
+        fin, fout: binary file objects to read from / write to
+        key: Fernet key (or a Fernet object)
+        segment_size: plaintext bytes per segment
+        workers: encryption threads
+
+    Returns:
+        Number of segments written
+    """
+    if not 0 < segment_size < 1 << 32:
+        raise ValueError(f"Segment size must be between 1 and 2**32 - 1 bytes, got {segment_size}")
+    fernet = _fernet(key)
+    file_id = os.urandom(16)
+    fout.write(HEADER.pack(MAGIC, VERSION, segment_size, file_id))
+
+    def encrypt(segment):
+        index, data, final = segment
+        return fernet.encrypt(SEGMENT_PREFIX.pack(file_id, index, final) + data)
+
+    count = 0
+    for token in _pipeline(encrypt, _plain_segments(fin, segment_size), workers):
+        fout.write(RECORD_LENGTH.pack(len(token)))
+        fout.write(token)
+        count += 1
+    return count
+
+
+def _read_header(f):
+    header = f.read(HEADER.size)
+    if len(header) != HEADER.size:
+        raise ValueError("Not a segmented Fernet stream (header too short)")
+    magic, version, segment_size, file_id = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a segmented Fernet stream (bad magic or version)")
+    if segment_size == 0:
+        raise ValueError("Corrupt segmented Fernet stream (segment size 0)")
+    return segment_size, file_id
+
+
+def _open_segment(fernet, token, file_id, index):
+    """Decrypt one token and check that it is segment 'index' of this file"""
+    plain = fernet.decrypt(token)
+    seg_file, seg_index, final = SEGMENT_PREFIX.unpack_from(plain)
+    if seg_file != file_id or seg_index != index:
+        raise ValueError(f"Segment {index} is out of order or from another file")
+    return plain[SEGMENT_PREFIX.size:], bool(final)
+
+
+def _records(fin):
+    """Yield every token of the stream"""
+    while True:
+        prefix = _read_full(fin, RECORD_LENGTH.size)
+        if not prefix:
+            return
+        if len(prefix) != RECORD_LENGTH.size:
+            raise ValueError("Truncated record length")
+        (length,) = RECORD_LENGTH.unpack(prefix)
+        token = _read_full(fin, length)
+        if len(token) != length:
+            raise ValueError("Truncated record")
+        yield token
+
+
+def decrypt_stream(fin, fout, key, workers=WORKERS):
+    """
+    Decrypt a segmented stream written by encrypt_stream().
+
+    Raises cryptography.fernet.InvalidToken for a tampered segment and
+    ValueError for reordered, foreign or missing (truncated) segments.
+
+    Returns:
+        Number of plaintext bytes written
+    """
+    fernet = _fernet(key)
+    _, file_id = _read_header(fin)
+
+    def decrypt(record):
+        index, token = record
+        return _open_segment(fernet, token, file_id, index)
+
+    written = 0
+    final = False
+    for data, seg_final in _pipeline(decrypt, enumerate(_records(fin)), workers):
+        if final:
+            raise ValueError("Data after the final segment")
+        fout.write(data)
+        written += len(data)
+        final = seg_final
+    if not final:
+        raise ValueError("Stream is truncated (final segment missing)")
+    return written
+
+
+def encrypt_file(src, dst, key, segment_size=SEGMENT_SIZE, workers=WORKERS):
+    """Encrypt the file at path src into path dst; returns the segment count"""
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        return encrypt_stream(fin, fout, key, segment_size, workers)
+
+
+def decrypt_file(src, dst, key, workers=WORKERS):
+    """Decrypt the file at path src into path dst; returns the byte count"""
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        return decrypt_stream(fin, fout, key, workers)
+
+
+class FernetStreamReader:
+    """
+    Random access to a segmented Fernet file.
+
+    Every segment except the last holds exactly segment_size bytes and
+    has the same record length, so segment i starts at a fixed offset.
+
+        with open(path, "rb") as f:
+            reader = FernetStreamReader(f, key)
+            reader.segment(10)          # plaintext of segment 10
+            reader.read_at(5 << 20, 100)  # 100 bytes at offset 5 MB
+    """
+
+    def __init__(self, fileobj, key):
+        self.file = fileobj
+        self.fernet = _fernet(key)
+        self.file.seek(0)
+        self.segment_size, self.file_id = _read_header(self.file)
+        self.data_start = self.file.tell()
+
+        end = self.file.seek(0, os.SEEK_END)
+        self.file.seek(self.data_start)
+        prefix = self.file.read(RECORD_LENGTH.size)
+        if len(prefix) != RECORD_LENGTH.size:
+            raise ValueError("Stream has no segments")
+        # Length of a full segment's record (the first one, unless it is
+        # also the last; then there is only one segment anyway)
+        self.record_size = RECORD_LENGTH.size + RECORD_LENGTH.unpack(prefix)[0]
+        self.count = max(1, -(-(end - self.data_start) // self.record_size))
+
+    def __len__(self):
+        return self.count
+
+    def segment(self, index):
+        """Decrypt and return the plaintext of one segment"""
+        if not 0 <= index < self.count:
+            raise IndexError(f"Segment {index} out of range (0..{self.count - 1})")
+        self.file.seek(self.data_start + index * self.record_size)
+        token = next(_records(self.file), None)
+        if token is None:
+            raise ValueError(f"Segment {index} is missing")
+        data, final = _open_segment(self.fernet, token, self.file_id, index)
+        if final != (index == self.count - 1):
+            raise ValueError(f"Segment {index} has the wrong final flag (truncated stream?)")
+        return data
+
+    def read_at(self, offset, size):
+        """Return up to 'size' plaintext bytes starting at 'offset'"""
+        parts = []
+        index = offset // self.segment_size
+        skip = offset % self.segment_size
+        while size > 0 and index < self.count:
+            data = self.segment(index)[skip:skip + size]
+            parts.append(data)
+            size -= len(data)
+            index += 1
+            skip = 0
+        return b"".join(parts)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Segmented streaming Fernet encryption")
+    parser.add_argument("mode", choices=["encrypt", "decrypt", "genkey"])
+    parser.add_argument("src", nargs="?")
+    parser.add_argument("dst", nargs="?")
+    parser.add_argument("--key-file", help="file holding the Fernet key")
+    parser.add_argument("--segment-size", type=int, default=SEGMENT_SIZE)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args()
+
+    if args.mode == "genkey":
+        print(generate_key().decode())
+        sys.exit(0)
+    if not (args.src and args.dst and args.key_file):
+        parser.error("encrypt/decrypt need SRC DST and --key-file")
+    with open(args.key_file, "rb") as f:
+        key = f.read().strip()
+
+    started = time.perf_counter()
+    if args.mode == "encrypt":
+        segments = encrypt_file(args.src, args.dst, key, args.segment_size, args.workers)
+        print(f"{segments} segments", file=sys.stderr)
+    else:
+        decrypt_file(args.src, args.dst, key, args.workers)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    size = os.path.getsize(args.src)
+    print(f"{size / 1e6:,.1f} MB in {elapsed:.2f}s ({size / 1e6 / elapsed:,.1f} MB/s)", file=sys.stderr)
@@ -0,0 +1,231 @@
+# ===============================================================
+# FILE AND DIRECTORY HASHING - STREAMING, PARALLEL, MULTI-ALGORITHM
+# ===============================================================
+# Libraries needed: hashlib, mmap, json, concurrent.futures (all built-in)
+# Description: md5_hash / sha256_hash in cipherss.py hash a string that
+# is already in memory.  This module fingerprints whole files and trees:
+#
+#   - files are read in large chunks into one reused buffer (or mapped
+#     with mmap when they are big), never loaded whole
+#   - every chunk is fed to ALL requested algorithms, so md5 + sha256
+#     cost one read of the file instead of two
+#   - many files are hashed at once on a thread pool; hashlib releases
+#     the GIL while it hashes a large buffer, so threads really run in
+#     parallel (and overlap with disk reads)
+#
+# hash_tree() builds a manifest {relative path: {size, md5, sha256, ...}}
+# that can be saved as JSON; verify_manifest() re-hashes the files and
+# reports which ones changed or disappeared.  Both return throughput
+# stats.
+# ===============================================================
+
+import hashlib
+import json
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_ALGORITHMS = ("md5", "sha256")
+
+# Read size for normal files (1 MB)
+CHUNK_SIZE = 1 << 20
+# Files at least this big are hashed through mmap (64 MB)
+MMAP_THRESHOLD = 64 << 20
+# Hashing threads (I/O bound work, so more than the number of CPUs)
+WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def _hashers(algorithms):
+    """One fresh hash object per algorithm name"""
+    return [hashlib.new(name) for name in algorithms]
+
+
+def hash_file(path, algorithms=DEFAULT_ALGORITHMS, chunk_size=CHUNK_SIZE):
+    """
+    Hash one file with several algorithms in a single read pass.
+
+    Args:
+        path: file to hash
+        algorithms: hashlib algorithm names
+        chunk_size: bytes per read
+
+    Returns:
+        {"size": bytes, <algorithm>: hex digest, ...}
+    """
+    hashers = _hashers(algorithms)
+    size = os.path.getsize(path)
+    with open(path, "rb", buffering=0) as f:
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for start in range(0, size, chunk_size):
+                        block = view[start:start + chunk_size]
+                        for h in hashers:
+                            h.update(block)
+                        block.release()
+                finally:
+                    view.release()
+        else:
+            buffer = bytearray(chunk_size)
+            view = memoryview(buffer)
+            size = 0
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                block = view[:n]
+                for h in hashers:
+                    h.update(block)
+                size += n
+
+    result = {"size": size}
+    for name, h in zip(algorithms, hashers):
+        result[name] = h.hexdigest()
+    return result
+
+
+def iter_files(root):
+    """Yield (relative path, full path) of every file under root, sorted"""
+    if os.path.isfile(root):
+        yield os.path.basename(root), root
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            full = os.path.join(dirpath, name)
+            if os.path.isfile(full):
+                yield os.path.relpath(full, root).replace(os.sep, "/"), full
+
+
+def _stats(files, total_bytes, started):
+    seconds = max(time.perf_counter() - started, 1e-9)
+    return {
+        "files": files,
+        "bytes": total_bytes,
+        "seconds": seconds,
+        "mb_per_sec": total_bytes / seconds / 1e6,
+    }
+
+
+def hash_files(paths, algorithms=DEFAULT_ALGORITHMS, workers=WORKERS, chunk_size=CHUNK_SIZE):
+    """hash_file() for many paths on a thread pool; results in the same order"""
+    def job(path):
+        return hash_file(path, algorithms, chunk_size)
+
+    if workers <= 1:
+        return [job(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(job, paths))
+
+
+def hash_tree(root, algorithms=DEFAULT_ALGORITHMS, workers=WORKERS, chunk_size=CHUNK_SIZE):
+    """
+    Hash every file under root (or a single file).
+
+    Returns:
+        (manifest, stats) - manifest is
+        {"algorithms": [...], "files": {relative path: hash_file() result}}
+    """
+    started = time.perf_counter()
+    entries = list(iter_files(root))
+    results = hash_files([full for _, full in entries], algorithms, workers, chunk_size)
+    manifest = {
+        "algorithms": list(algorithms),
+        "files": {rel: result for (rel, _), result in zip(entries, results)},
+    }
+    total = sum(result["size"] for result in results)
+    return manifest, _stats(len(entries), total, started)
+
+
+def save_manifest(manifest, path):
+    """Write a manifest as JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+
+def load_manifest(path):
+    """Read a manifest written by save_manifest()"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def verify_manifest(manifest, root, workers=WORKERS, chunk_size=CHUNK_SIZE):
+    """
+    Re-hash the files of a manifest and compare.
+
+    Args:
+        manifest: dict from hash_tree() / load_manifest()
+        root: directory the relative paths are resolved against
+
+    Returns:
+        (report, stats) - report has lists "ok", "changed", "missing"
+        (files in the manifest) and "extra" (new files under root)
+    """
+    started = time.perf_counter()
+    algorithms = manifest["algorithms"]
+    expected = manifest["files"]
+
+    present = dict(iter_files(root))
+    report = {"ok": [], "changed": [], "missing": [], "extra": sorted(set(present) - set(expected))}
+    to_check = []
+    for rel in sorted(expected):
+        if rel in present:
+            to_check.append(rel)
+        else:
+            report["missing"].append(rel)
+
+    results = hash_files([present[rel] for rel in to_check], algorithms, workers, chunk_size)
+    for rel, result in zip(to_check, results):
+        report["ok" if result == expected[rel] else "changed"].append(rel)
+
+    total = sum(result["size"] for result in results)
+    return report, _stats(len(to_check), total, started)
+
+
+def _print_stats(stats, file=None):
+    print(f"{stats['files']} files, {stats['bytes'] / 1e6:,.1f} MB in {stats['seconds']:.2f}s "
+          f"({stats['mb_per_sec']:,.1f} MB/s)", file=file)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Parallel file / directory hashing")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    make = sub.add_parser("manifest", help="hash a file or directory tree")
+    make.add_argument("root")
+    make.add_argument("-o", "--output", help="write the manifest here (default: stdout)")
+    make.add_argument("-a", "--algorithms", default=",".join(DEFAULT_ALGORITHMS),
+                      help="comma separated hashlib names (default: %(default)s)")
+
+    check = sub.add_parser("verify", help="check files against a manifest")
+    check.add_argument("manifest")
+    check.add_argument("root")
+
+    for p in (make, check):
+        p.add_argument("--workers", type=int, default=WORKERS)
+        p.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.command == "manifest":
+        manifest, stats = hash_tree(args.root, args.algorithms.split(","), args.workers, args.chunk_size)
+        if args.output:
+            save_manifest(manifest, args.output)
+        else:
+            json.dump(manifest, sys.stdout, indent=1, sort_keys=True)
+            print()
+        _print_stats(stats, file=sys.stderr)
+    else:
+        report, stats = verify_manifest(load_manifest(args.manifest), args.root,
+                                        args.workers, args.chunk_size)
+        for status in ("changed", "missing", "extra"):
+            for rel in report[status]:
+                print(f"{status.upper():8} {rel}")
+        print(f"{len(report['ok'])} ok, {len(report['changed'])} changed, "
+              f"{len(report['missing'])} missing, {len(report['extra'])} extra")
+        _print_stats(stats)
+        sys.exit(0 if not (report["changed"] or report["missing"]) else 1)
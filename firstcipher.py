@@ -1,32 +1,20 @@
 
-msg = "Bilal Zafar"
-shift = 3
+from substitution import caesar_translate
 
 def encrypt(text, shift):
-    result = ""
-    for ch in text:
-        if ch.isalpha():  # only letters
-            # shift the letter
-            new_pos = (ord(ch) - ord('a') + shift) % 26
-            result += chr(new_pos + ord('a'))
-        else:
-            result += ch  # keep space same
-    return result
+    # shift every letter (counted from 'a') in one pass, keep spaces same
+    return caesar_translate(text, shift, mode="lower")
 
 def decrypt(text, shift):
-    result = ""
-    for ch in text:
-        if ch.isalpha():
-            new_pos = (ord(ch) - ord('a') - shift) % 26
-            result += chr(new_pos + ord('a'))
-        else:
-            result += ch
-    return result
+    return caesar_translate(text, -shift, mode="lower")
 
 
+if __name__ == "__main__":
+    msg = "Bilal Zafar"
+    shift = 3
 
-enc = encrypt(msg, shift)
-print("Encrypted:", enc)
+    enc = encrypt(msg, shift)
+    print("Encrypted:", enc)
 
-dec = decrypt(enc, shift)
-print("Decrypted:", dec)
\ No newline at end of file
+    dec = decrypt(enc, shift)
+    print("Decrypted:", dec)
\ No newline at end of file
@@ -1,6 +1,3 @@
-# Example usage
-input_string = "Hello, World!"
-hash_result = md5_hash(input_string)
 import hashlib
 
 def md5_hash(input_string):
@@ -15,5 +12,9 @@ def md5_hash(input_string):
 
     return hash_value
 
-print(f"Input: {input_string}")
-print(f"MD5 Hash: {hash_result}")
\ No newline at end of file
+# Example usage (md5_hash has to be defined before it is called)
+if __name__ == "__main__":
+    input_string = "Hello, World!"
+    hash_result = md5_hash(input_string)
+    print(f"Input: {input_string}")
+    print(f"MD5 Hash: {hash_result}")
@@ -0,0 +1,123 @@
+# ===============================================================
+# HMAC SIGNER - CACHED KEYED STATE, BATCH SIGN / VERIFY
+# ===============================================================
+# Libraries needed: hashlib, hmac, functools (all built-in)
+# Description: HMAC(K, m) = H((K ^ opad) + H((K ^ ipad) + m)).
+# hmac.new() pads the key and hashes both pad blocks again for every
+# message, although they only depend on the key.  Here the two hash
+# states after absorbing K ^ ipad and K ^ opad are computed once per key
+# and kept in a bounded LRU cache; signing a message only copies them
+# and hashes the message itself.  Digests are identical to hmac.new().
+#
+# sign_many / verify_many sign a whole batch under one key with a single
+# cache lookup; verification uses hmac.compare_digest (constant time).
+# ===============================================================
+
+import hashlib
+import hmac
+from functools import lru_cache
+
+DEFAULT_DIGEST = "sha256"
+
+# How many keys keep their precomputed state (least recently used first out)
+KEY_CACHE_SIZE = 128
+
+_IPAD = bytes(x ^ 0x36 for x in range(256))
+_OPAD = bytes(x ^ 0x5C for x in range(256))
+
+
+def _new_hash(digestmod, data=b""):
+    """hashlib object from a name ("sha256") or a constructor (hashlib.sha256)"""
+    if isinstance(digestmod, str):
+        return hashlib.new(digestmod, data)
+    return digestmod(data)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def keyed_state(key, digestmod=DEFAULT_DIGEST):
+    """
+    Return the (inner, outer) hash states for key.
+
+    The returned objects are shared: only ever use copies of them.
+    """
+    block_size = _new_hash(digestmod).block_size
+    if len(key) > block_size:
+        key = _new_hash(digestmod, key).digest()
+    key = key.ljust(block_size, b"\0")
+    return _new_hash(digestmod, key.translate(_IPAD)), _new_hash(digestmod, key.translate(_OPAD))
+
+
+def _state(key, digestmod):
+    # lru_cache needs a hashable key
+    return keyed_state(key if isinstance(key, bytes) else bytes(key), digestmod)
+
+
+def sign(key, message, digestmod=DEFAULT_DIGEST):
+    """HMAC digest (bytes) of one message (None = empty, like hmac.new)"""
+    inner, outer = _state(key, digestmod)
+    inner = inner.copy()
+    if message is not None:
+        inner.update(message)
+    outer = outer.copy()
+    outer.update(inner.digest())
+    return outer.digest()
+
+
+def hexsign(key, message, digestmod=DEFAULT_DIGEST):
+    """HMAC digest of one message as a hex string"""
+    return sign(key, message, digestmod).hex()
+
+
+def sign_many(key, messages, digestmod=DEFAULT_DIGEST, hexdigest=False):
+    """
+    Sign many messages under the same key.
+
+    Args:
+        key: secret key (bytes-like)
+        messages: iterable of bytes-like messages
+        digestmod: hash name or hashlib constructor
+        hexdigest: return hex strings instead of bytes
+
+    Returns:
+        List of digests, one per message
+    """
+    inner, outer = _state(key, digestmod)
+    inner_copy = inner.copy
+    outer_copy = outer.copy
+    digests = []
+    append = digests.append
+    for message in messages:
+        h = inner_copy()
+        h.update(message)
+        o = outer_copy()
+        o.update(h.digest())
+        append(o.hexdigest() if hexdigest else o.digest())
+    return digests
+
+
+def verify(key, message, tag, digestmod=DEFAULT_DIGEST):
+    """Check one tag (bytes or hex string) in constant time"""
+    return verify_many(key, [message], [tag], digestmod)[0]
+
+
+def verify_many(key, messages, tags, digestmod=DEFAULT_DIGEST):
+    """
+    Check many (message, tag) pairs under the same key.
+
+    Tags may be raw digests (bytes) or hex strings.  Every comparison
+    uses hmac.compare_digest, so timing does not reveal where a wrong
+    tag differs.
+
+    Returns:
+        List of booleans, one per message
+    """
+    messages = list(messages)
+    tags = list(tags)
+    if len(messages) != len(tags):
+        raise ValueError("messages and tags must have the same length")
+    results = []
+    for tag, digest in zip(tags, sign_many(key, messages, digestmod)):
+        if isinstance(tag, str):
+            digest = digest.hex()
+        results.append(hmac.compare_digest(digest, tag))
+    return results
@@ -0,0 +1,179 @@
+# ===============================================================
+# KEY MATERIAL POOL - BULK CSPRNG BYTES FOR ONE-TIME PADS
+# ===============================================================
+# Libraries needed: os, threading, queue (all built-in)
+# Description: os.urandom is a cryptographically secure generator, but
+# calling it (or random.randint) once per key byte is slow.  KeyPool
+# pulls key material from os.urandom in large blocks on a background
+# thread and keeps a few blocks ready, so handing out a key is just a
+# slice of a buffer that already exists.
+#
+# Every block is used once and never refilled in place, so the
+# memoryviews returned by take_view() stay valid and are never reused.
+# A forked child drops everything it inherited (the current block, the
+# prefetched blocks and the refill thread, which does not exist in the
+# child) and draws its own blocks from os.urandom, so parent and child
+# never hand out the same key bytes.
+# ===============================================================
+
+import os
+import queue
+import threading
+import weakref
+
+# Size of each block pulled from os.urandom (1 MB)
+BLOCK_SIZE = 1 << 20
+
+# How many full blocks the background thread keeps ready
+PREFETCH_BLOCKS = 4
+
+# Every live pool, reset in the child after os.fork()
+_pools = weakref.WeakSet()
+
+
+class KeyPool:
+    """
+    Pool of cryptographically secure random bytes.
+
+    Args:
+        block_size: bytes generated per os.urandom call
+        prefetch: number of blocks kept ready by the refill thread
+        background: refill on a background thread (False = refill inline)
+    """
+
+    def __init__(self, block_size=BLOCK_SIZE, prefetch=PREFETCH_BLOCKS, background=True):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._ready = queue.Queue(maxsize=max(1, prefetch))
+        self._block = b""
+        self._offset = 0
+        self._closed = threading.Event()
+
+        # Usage counters (see stats())
+        self.consumed = 0   # bytes handed out
+        self.requests = 0   # take() / take_view() calls
+        self.blocks = 0     # blocks taken from the ready queue
+        self.stalls = 0     # times a caller had to wait for a block
+
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._refill, name="keypool-refill", daemon=True)
+            self._thread.start()
+        _pools.add(self)
+
+    def _after_fork(self):
+        """In a forked child: drop the parent's key material and refill inline"""
+        self._lock = threading.Lock()
+        self._ready = queue.Queue(maxsize=self._ready.maxsize)
+        self._block = b""
+        self._offset = 0
+        self._thread = None
+
+    def _refill(self):
+        """Background thread: keep the ready queue full"""
+        while not self._closed.is_set():
+            block = os.urandom(self.block_size)
+            while not self._closed.is_set():
+                try:
+                    self._ready.put(block, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def _next_block(self):
+        """Get the next fresh block (caller holds the lock)"""
+        self.blocks += 1
+        if self._thread is None:
+            return os.urandom(self.block_size)
+        try:
+            return self._ready.get_nowait()
+        except queue.Empty:
+            self.stalls += 1
+            return self._ready.get()
+
+    def take_view(self, length):
+        """
+        Return 'length' random bytes as a read-only memoryview.
+
+        The common case (the key fits in the current block) does not copy
+        anything; a key that spans blocks is assembled into a new buffer.
+        """
+        if length < 0:
+            raise ValueError("Key length must not be negative")
+        with self._lock:
+            self.requests += 1
+            self.consumed += length
+            end = self._offset + length
+            if end <= len(self._block):
+                view = memoryview(self._block)[self._offset:end]
+                self._offset = end
+                return view
+
+            parts = [self._block[self._offset:]]
+            needed = length - len(parts[0])
+            while needed > 0:
+                self._block = self._next_block()
+                chunk = self._block[:needed]
+                parts.append(chunk)
+                needed -= len(chunk)
+                self._offset = len(chunk)
+            return memoryview(b"".join(parts))
+
+    def take(self, length):
+        """Return 'length' random bytes"""
+        return self.take_view(length).tobytes()
+
+    def stats(self):
+        """Return usage counters, useful for sizing block_size / prefetch"""
+        with self._lock:
+            return {
+                "consumed_bytes": self.consumed,
+                "requests": self.requests,
+                "blocks_used": self.blocks,
+                "generated_bytes": self.blocks * self.block_size,
+                "stalls": self.stalls,
+                "ready_blocks": self._ready.qsize(),
+            }
+
+    def close(self):
+        """Stop the refill thread"""
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def default_pool():
+    """Shared KeyPool, created on first use"""
+    global _default_pool
+    if _default_pool is None:
+        with _default_lock:
+            if _default_pool is None:
+                _default_pool = KeyPool()
+    return _default_pool
+
+
+def random_bytes(length):
+    """Return 'length' bytes of key material from the shared pool"""
+    return default_pool().take(length)
+
+
+def _reset_after_fork():
+    global _default_lock
+    _default_lock = threading.Lock()
+    for pool in list(_pools):
+        pool._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,139 @@
+# ===============================================================
+# KEYSPACE - RANDOM-ACCESS KEY ENUMERATION WITH CHECKPOINTS
+# ===============================================================
+# Libraries needed: json, os, time (all built-in)
+# Description: Numbers every key of a brute force search so that
+#
+#   Keyspace(charset, length).key_at(i)
+#       == ''.join(list(itertools.product(charset, repeat=length))[i])
+#
+# without walking itertools.product.  iter_range() builds the keys one
+# after another in a single reused bytearray (an "odometer"), so the
+# hot loop does not allocate a new string per key.
+#
+# Checkpoint stores the last finished index in a small JSON file at
+# regular intervals, so an interrupted run can resume from there.
+# ===============================================================
+
+import json
+import os
+import time
+
+
+class Keyspace:
+    """
+    All keys of one length over a character set, in itertools.product order.
+
+    Args:
+        charset: the key characters (single-byte / ASCII characters)
+        length: key length
+        pad_to: pad the iter_range() buffer with NUL bytes up to this
+                size (e.g. 8 for a ready-to-use DES key)
+    """
+
+    def __init__(self, charset, length, pad_to=0):
+        self.charset = charset
+        self.length = length
+        self.symbols = charset.encode("utf-8")
+        if len(self.symbols) != len(charset):
+            raise ValueError("Keyspace characters must be single-byte (ASCII)")
+        self.base = len(charset)
+        self.size = self.base ** length
+        self.pad_to = max(pad_to, length)
+
+    def __len__(self):
+        return self.size
+
+    def digits_at(self, index):
+        """Return the charset positions of key 'index' (most significant first)"""
+        if not 0 <= index < self.size:
+            raise IndexError("key index out of range")
+        digits = [0] * self.length
+        for pos in range(self.length - 1, -1, -1):
+            index, digits[pos] = divmod(index, self.base)
+        return digits
+
+    def key_at(self, index):
+        """Return key number 'index' as a str"""
+        return "".join(self.charset[d] for d in self.digits_at(index))
+
+    def iter_range(self, start=0, stop=None):
+        """
+        Yield keys start..stop-1 as bytes in ONE reused bytearray.
+
+        The same buffer object is yielded every time and changed in place,
+        so copy it (bytes(buf)) if a key has to be kept.
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        if start >= stop:
+            return
+        symbols = self.symbols
+        base = self.base
+        first = symbols[0]
+        digits = self.digits_at(start)
+        buf = bytearray(symbols[d] for d in digits).ljust(self.pad_to, b"\x00")
+        last = self.length - 1
+
+        for _ in range(start, stop):
+            yield buf
+            # Advance the odometer by one
+            pos = last
+            while pos >= 0:
+                d = digits[pos] + 1
+                if d < base:
+                    digits[pos] = d
+                    buf[pos] = symbols[d]
+                    break
+                digits[pos] = 0
+                buf[pos] = first
+                pos -= 1
+
+
+# Seconds between checkpoint saves
+CHECKPOINT_INTERVAL = 30.0
+
+
+class Checkpoint:
+    """
+    Small JSON state file for resuming long searches.
+
+    Call maybe_save(state) as often as you like from the search loop; it
+    only writes when 'interval' seconds have passed.  The file is written
+    to a temporary name and renamed, so a crash never leaves it half
+    written.
+    """
+
+    def __init__(self, path, interval=CHECKPOINT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._last_save = time.monotonic()
+
+    def load(self):
+        """Return the saved state dict, or None if there is none"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, state):
+        """Write state now"""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+        self._last_save = time.monotonic()
+
+    def maybe_save(self, state):
+        """Write state if the interval has passed; returns True if written"""
+        if time.monotonic() - self._last_save < self.interval:
+            return False
+        self.save(state)
+        return True
+
+    def clear(self):
+        """Remove the state file (search finished)"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
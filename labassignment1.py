@@ -6,6 +6,10 @@
 # Valid keys: 1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25
 # ===============================================================
 
+from alphabet import mod_inverse as _mod_inverse
+from substitution import multiplicative_translate
+
+
 def mod_inverse(a, m):
     """
     Find multiplicative inverse of 'a' under modulo 'm'.
@@ -23,17 +27,12 @@ def mod_inverse(a, m):
     Returns:
         The multiplicative inverse, or None if it doesn't exist
     """
-    # Try all possible values from 1 to m-1
-    for x in range(1, m):
-        # Check if this value is the multiplicative inverse
-        if (a * x) % m == 1:
-            return x  # Found it! Return the inverse
-    
-    # No inverse exists (happens when a and m share common factors)
-    return None
+    # Extended Euclid (alphabet.mod_inverse) finds it in O(log m) steps,
+    # no need to try every value from 1 to m-1
+    return _mod_inverse(a, m)
 
 
-def encrypt(plaintext, key):
+def encrypt(plaintext, key, alphabet=None):
     """
     Encrypt plaintext using multiplicative cipher.
     
@@ -43,34 +42,22 @@ def encrypt(plaintext, key):
     Args:
         plaintext: The message to encrypt
         key: The multiplication key (must be coprime with 26)
+        alphabet: Optional Alphabet (alphabet.py) to use instead of A-Z;
+                  the text is then NOT upper-cased
     
     Returns:
         Encrypted message in uppercase
     """
-    ciphertext = ""  # Empty string to store encrypted message
-    
-    # Process each character in the message
-    for char in plaintext.upper():  # Convert to uppercase first
-        
-        # Check if character is a letter (A-Z)
-        if char.isalpha():
-            # Step 1: Convert letter to number (A=0, B=1, ..., Z=25)
-            p = ord(char) - 65  # ord('A') = 65, so A becomes 0
-            
-            # Step 2: Apply encryption formula: multiply by key and mod 26
-            c = (p * key) % 26
-            
-            # Step 3: Convert number back to letter and add to ciphertext
-            ciphertext += chr(c + 65)  # Add 65 to get back to ASCII range
-        
-        else:
-            # If not a letter (space, punctuation), keep it unchanged
-            ciphertext += char
-    
-    return ciphertext
+    if alphabet is not None:
+        return multiplicative_translate(plaintext, key, alphabet=alphabet)
+    
+    # Convert to uppercase first, then map every letter A-Z to
+    # (P * key) % 26 through a cached translation table in one pass.
+    # Non-letters (space, punctuation) are kept unchanged.
+    return multiplicative_translate(plaintext.upper(), key, mode="upper")
 
 
-def decrypt(ciphertext, key):
+def decrypt(ciphertext, key, alphabet=None):
     """
     Decrypt ciphertext using multiplicative cipher.
     
@@ -80,38 +67,27 @@ def decrypt(ciphertext, key):
     Args:
         ciphertext: The encrypted message
         key: The original encryption key
+        alphabet: Optional Alphabet (alphabet.py) to use instead of A-Z
     
     Returns:
         Decrypted original message
     """
     # Step 1: Find the multiplicative inverse of the key
-    inv_key = mod_inverse(key, 26)
+    # (an Alphabet has the inverse of every number precomputed)
+    if alphabet is not None:
+        inv_key = alphabet.inverse(key)
+    else:
+        inv_key = mod_inverse(key, 26)
     
     # Step 2: Check if inverse exists
     if inv_key is None:
         raise ValueError("No multiplicative inverse exists for this key!")
     
-    plaintext = ""  # Empty string to store decrypted message
-    
-    # Process each character in the encrypted message
-    for char in ciphertext.upper():
-        
-        # Check if character is a letter
-        if char.isalpha():
-            # Step 1: Convert letter to number (0-25)
-            c = ord(char) - 65
-            
-            # Step 2: Apply decryption formula: multiply by inverse key
-            p = (c * inv_key) % 26
-            
-            # Step 3: Convert number back to letter
-            plaintext += chr(p + 65)
-        
-        else:
-            # Keep non-letters unchanged
-            plaintext += char
-    
-    return plaintext
+    # Step 3: Multiplying by the inverse key is just another
+    # multiplicative table, so decryption is a single pass too
+    if alphabet is not None:
+        return multiplicative_translate(ciphertext, inv_key, alphabet=alphabet)
+    return multiplicative_translate(ciphertext.upper(), inv_key, mode="upper")
 
 
 def brute_force_attack(ciphertext):
@@ -0,0 +1,69 @@
+# ===============================================================
+# LAZY IMPORTS FOR HEAVY OPTIONAL BACKENDS
+# ===============================================================
+# Libraries needed: importlib (built-in)
+# Description: NumPy, cryptography and PyCryptodome take 30-120 ms each
+# to import, which every worker paid at startup even when it never used
+# them.  lazy_module() returns a stand-in that imports the real module
+# the first time one of its attributes is used:
+#
+#   np = optional_module("numpy")   # None if NumPy is not installed
+#   ...
+#   np.frombuffer(...)              # NumPy is imported here, once
+#
+# After loading, the module's names are copied onto the stand-in, so
+# later attribute lookups cost the same as on the real module.
+# optional_module() only checks that the top-level package can be found
+# (no code is run), so "if np is None" fallbacks keep working.
+# ===============================================================
+
+import importlib
+import importlib.util
+
+
+class LazyModule:
+    """Stand-in for a module, imported on first attribute access"""
+
+    def __init__(self, name, hint=None):
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_hint", hint)
+
+    def _load(self):
+        try:
+            module = importlib.import_module(self._lazy_name)
+        except ImportError as e:
+            if self._lazy_hint:
+                raise ImportError(f"{e} ({self._lazy_hint})") from e
+            raise
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr):
+        # Only called for names not copied in yet, i.e. before loading
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if "__name__" in self.__dict__ else "not loaded"
+        return f"<lazy module {self._lazy_name!r} ({state})>"
+
+
+def lazy_module(name, hint=None):
+    """
+    Return a LazyModule for a required dependency.
+
+    Args:
+        name: dotted module name, e.g. "Crypto.Cipher.DES"
+        hint: added to the ImportError if the module is missing
+              (e.g. "install with: pip install pycryptodome")
+    """
+    return LazyModule(name, hint)
+
+
+def is_available(name):
+    """True if the top-level package of 'name' is installed (nothing is imported)"""
+    return importlib.util.find_spec(name.partition(".")[0]) is not None
+
+
+def optional_module(name, hint=None):
+    """LazyModule for 'name' if its package is installed, else None"""
+    return LazyModule(name, hint) if is_available(name) else None
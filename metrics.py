@@ -0,0 +1,355 @@
+# ===============================================================
+# METRICS - CHEAP COUNTERS, TIMED PROGRESS, JSON STATS, PROFILER HOOK
+# ===============================================================
+# Libraries needed: threading, json, time (built-in)
+# Description: Instrumentation for long cracking runs without paying for
+# it in the hot loop.
+#
+#   - Counter: a slot holding an int.  Hot loops keep a local count and
+#     store it into the counter every few thousand iterations (one
+#     attribute store); nothing is formatted or printed there.
+#   - ProgressReporter: a daemon thread that renders one status line
+#     (count, %, rate, ETA) at a fixed rate - twice a second on a
+#     terminal, every LOG_INTERVAL seconds when stderr is a file - so
+#     terminal I/O no longer grows with the number of keys tried.
+#   - Metrics.stage(name): wall time per stage of an attack.
+#   - Metrics.snapshot() / save_json(): final stats as JSON.
+#   - SamplingProfiler: looks at the main thread's stack every few ms and
+#     counts the stacks it sees (collapsed "a;b;c count" lines, the input
+#     format of flamegraph.pl and speedscope).  Switched on without code
+#     changes by setting METRICS_PROFILE=out.txt for any script that
+#     runs inside "with Metrics(...)".
+#
+#   with Metrics("brute force") as metrics:
+#       keys = metrics.counter("keys", total=26 ** 4)
+#       with metrics.stage("search"), metrics.progress(keys):
+#           for i, key in enumerate(candidates, 1):
+#               if i % 4096 == 0:
+#                   keys.value = i
+#               ...
+#   metrics.save_json("stats.json")
+# ===============================================================
+
+import collections
+import contextlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+# Seconds between progress lines on a terminal / in a log file
+REFRESH_INTERVAL = 0.5
+LOG_INTERVAL = 10.0
+# Smoothing of the displayed rate (weight of the newest interval)
+RATE_SMOOTHING = 0.3
+
+# Environment switches for the sampling profiler
+PROFILE_ENV = "METRICS_PROFILE"
+PROFILE_INTERVAL_ENV = "METRICS_PROFILE_INTERVAL"
+PROFILE_INTERVAL = 0.005
+
+
+class Counter:
+    """
+    A named count, written by the hot loop and read by the reporter.
+
+    Args:
+        name: label used in progress lines and JSON
+        total: expected final value (enables % and ETA), or None
+        stage: stage the counter belongs to (its rate uses that stage's time)
+    """
+
+    __slots__ = ("name", "value", "total", "stage")
+
+    def __init__(self, name, total=None, stage=None):
+        self.name = name
+        self.value = 0
+        self.total = total
+        self.stage = stage
+
+    def add(self, n=1):
+        self.value += n
+
+
+class Metrics:
+    """
+    Counters, stage timings and free-form results of one run.
+
+    Args:
+        name: run name (first field of the JSON)
+        progress: False disables the progress reporter
+        stream: where progress goes (default: sys.stderr at start time)
+    """
+
+    def __init__(self, name, progress=True, stream=None):
+        self.name = name
+        self.show_progress = progress
+        self.stream = stream
+        self.counters = {}
+        self.stages = {}     # stage name -> seconds, in first-entered order
+        self.info = {}       # results worth keeping (key found, filter stats...)
+        self.started = time.perf_counter()
+        self.start_time = time.time()
+        self.finished = None
+        self.profiler = None
+        self._active = []    # stack of open stage names
+
+    # -- counters and stages -------------------------------------
+
+    def counter(self, name, total=None):
+        """Return the counter 'name', created in the current stage if new"""
+        counter = self.counters.get(name)
+        if counter is None:
+            stage = self._active[-1] if self._active else None
+            counter = self.counters[name] = Counter(name, total, stage)
+        elif total is not None:
+            counter.total = total
+        return counter
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a block; nested stages are named "outer/inner" """
+        if self._active:
+            name = f"{self._active[-1]}/{name}"
+        self.stages.setdefault(name, 0.0)
+        self._active.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - start
+            self._active.pop()
+
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    def rate(self, counter):
+        """Average units per second of a counter over its stage (or the run)"""
+        seconds = self.stages.get(counter.stage) or self.elapsed()
+        return counter.value / max(seconds, 1e-9)
+
+    # -- progress ------------------------------------------------
+
+    @contextlib.contextmanager
+    def progress(self, counter, *extra):
+        """Render progress of 'counter' (and the 'extra' counters) while the block runs"""
+        if not self.show_progress:
+            yield
+            return
+        reporter = ProgressReporter(self, counter, extra, self.stream)
+        reporter.start()
+        try:
+            yield
+        finally:
+            reporter.stop()
+
+    # -- results -------------------------------------------------
+
+    def snapshot(self):
+        """All stats as a JSON-serialisable dict"""
+        return {
+            "name": self.name,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.start_time)),
+            "seconds": self.elapsed(),
+            "counters": {c.name: c.value for c in self.counters.values()},
+            "totals": {c.name: c.total for c in self.counters.values() if c.total is not None},
+            "rates": {c.name: self.rate(c) for c in self.counters.values()},
+            "stages": dict(self.stages),
+            "info": self.info,
+        }
+
+    def save_json(self, path):
+        """Write snapshot() to path ("-" = stdout)"""
+        text = json.dumps(self.snapshot(), indent=1, default=str)
+        if path == "-":
+            print(text)
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    def finish(self):
+        """Stop the clock (and the profiler, writing its output)"""
+        if self.finished is None:
+            self.finished = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profiler.save(self.profiler.path)
+            self.info["profile"] = self.profiler.path
+            self.profiler = None
+
+    def __enter__(self):
+        self.profiler = profiler_from_env()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.finish()
+
+
+# ---------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+# ---------------------------------------------------------------
+# Progress rendering
+# ---------------------------------------------------------------
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours}:{rest // 60:02d}:{rest % 60:02d}"
+
+
+def format_count(counter):
+    if counter.total:
+        return f"{counter.value:,}/{counter.total:,} ({100 * counter.value / counter.total:.1f}%)"
+    return f"{counter.value:,}"
+
+
+class ProgressReporter:
+    """
+    Prints the state of a counter at a fixed rate from a daemon thread.
+
+    The hot loop never waits for it: the thread only reads counter
+    values, and the shown rate is smoothed over the last intervals.
+    """
+
+    def __init__(self, metrics, counter, extra=(), stream=None):
+        self.metrics = metrics
+        self.counter = counter
+        self.extra = extra
+        self.stream = stream or sys.stderr
+        self.tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.interval = REFRESH_INTERVAL if self.tty else LOG_INTERVAL
+        self.rate = None
+        self._last = (time.perf_counter(), counter.value)
+        self._width = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Stop the thread and print the final line"""
+        self._stop.set()
+        self._thread.join()
+        self.render(final=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.render()
+
+    def line(self, final=False):
+        counter = self.counter
+        now = time.perf_counter()
+        last_time, last_value = self._last
+        self._last = (now, counter.value)
+        if final:
+            rate = self.metrics.rate(counter)
+        else:
+            current = (counter.value - last_value) / max(now - last_time, 1e-9)
+            if self.rate is None:
+                self.rate = current
+            else:
+                self.rate += RATE_SMOOTHING * (current - self.rate)
+            rate = self.rate
+
+        parts = [f"{counter.name}: {format_count(counter)}", f"{rate:,.0f}/s"]
+        for other in self.extra:
+            parts.append(f"{other.name} {format_count(other)}")
+        if final:
+            parts.append(f"in {format_duration(self.metrics.elapsed())}")
+        elif counter.total and rate > 0:
+            parts.append(f"ETA {format_duration((counter.total - counter.value) / rate)}")
+        return "  ".join(parts)
+
+    def render(self, final=False):
+        text = self.line(final)
+        if self.tty:
+            # Rewrite the same line; pad over a longer previous line
+            padding = " " * max(0, self._width - len(text))
+            self._width = len(text)
+            self.stream.write("\r" + text + padding + ("\n" if final else ""))
+        else:
+            self.stream.write(text + "\n")
+        self.stream.flush()
+
+
+# ---------------------------------------------------------------
+# Sampling profiler
+# ---------------------------------------------------------------
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for one thread (by default the one starting it).
+
+    Every 'interval' seconds a daemon thread reads the target thread's
+    current stack and counts it.  The overhead does not depend on how
+    many calls the profiled code makes, unlike cProfile.  Only the
+    sampled process is seen (not pool workers).
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL, path=None):
+        self.interval = interval
+        self.path = path
+        self.samples = collections.Counter()
+        self.thread_id = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id=None):
+        self.thread_id = thread_id or threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def top(self, n=10):
+        """Functions with the most samples at the top of the stack: [(label, samples)]"""
+        own = collections.Counter()
+        for stack, count in self.samples.items():
+            own[stack.rpartition(";")[2]] += count
+        return own.most_common(n)
+
+    def save(self, path):
+        """Write collapsed stacks ("outer;...;inner count"), most frequent first"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def profiler_from_env():
+    """Start a SamplingProfiler if METRICS_PROFILE names an output file, else None"""
+    path = os.environ.get(PROFILE_ENV)
+    if not path:
+        return None
+    interval = float(os.environ.get(PROFILE_INTERVAL_ENV) or PROFILE_INTERVAL)
+    return SamplingProfiler(interval, path).start()
@@ -0,0 +1,188 @@
+# ===============================================================
+# ENGLISH QUADGRAM MODEL - SCORING CANDIDATE PLAINTEXTS
+# ===============================================================
+# Libraries needed: numpy (optional, install with: pip install numpy)
+# Description: A quadgram model scores text by how English its 4-letter
+# sequences look: score = sum of log10 P(quadgram).  The correct
+# decryption of a classical cipher scores far higher than the gibberish
+# produced by every wrong key.
+#
+# The model is built ONCE (default_model() caches it).  It can be loaded
+# from a standard "QUAD COUNT" quadgram file, or trained from any English
+# text; without a file it is trained from the built-in sample below.
+# Quadgrams never seen get a small floor probability.
+#
+# Scores are stored as a flat 26^4 float32 table (small enough to stay
+# cache friendly) indexed by
+#   a*17576 + b*676 + c*26 + d   (letters a..d as 0-25)
+# so with NumPy a whole batch of texts is scored with one gather + sum.
+# ===============================================================
+
+import math
+import re
+
+from lazy import optional_module
+
+np = optional_module("numpy")  # None if missing, imported on first use
+
+QUADGRAMS = 26 ** 4
+
+# Training text for the built-in model (plain, everyday English)
+SAMPLE_TEXT = """
+The history of secret writing is as old as writing itself. Whenever people
+have had something to hide, they have looked for a way to send a message that
+only the right reader could understand. A general would send orders to his
+officers in the field, a merchant would write to a partner in another city, and
+a spy would report back to the people who had sent him. In every case the
+problem was the same: the message had to travel through hands that could not
+be trusted, and the meaning had to stay hidden from anyone who was not meant to
+read it.
+
+The simplest methods replace every letter with another letter. In the cipher
+that is named after Julius Caesar, each letter is moved a fixed number of
+places along the alphabet, so that the word attack might become dwwdfn when
+the shift is three. This was good enough when most of the enemy could not read
+at all, but it is easy to break. There are only twenty five possible shifts,
+and anyone with a little patience can try them all in a few minutes and see
+which one turns the message back into plain language.
+
+Later writers tried to make the job harder. They multiplied the position of
+each letter by a number, or added a second number after the multiplication,
+which gives the affine cipher. Others used a whole keyword and shifted each
+letter by a different amount, so that the same letter in the message could
+turn into many different letters in the cipher text. For a long time this was
+thought to be impossible to break, and it was called the indecipherable
+cipher. It was finally broken when people noticed that the keyword repeats,
+and that the letters which fall under the same part of the key behave just
+like a simple shift.
+
+The weakness of all these methods is that they leave the patterns of the
+language in place. In English the letter e is far more common than any other,
+and words such as the, and, of, to, in, that, is and for appear again and
+again. Pairs and groups of letters follow their own rules as well: q is almost
+always followed by u, and th, he, in, er and an are some of the most frequent
+pairs. An analyst who counts these patterns can often recover the message
+without ever knowing the key, simply by asking which guess produces text that
+looks the most like the language it was written in.
+
+Modern systems are built in a very different way. They work on blocks of data
+rather than single letters, they mix and spread every bit of the message over
+many rounds, and their keys are so long that trying every one of them would
+take longer than the age of the universe. Even so, the old lessons still
+matter. A strong algorithm can be ruined by a weak key, by a password that is
+short or easy to guess, or by a system that reuses the same key for too many
+messages. Most real attacks do not break the mathematics at all; they find a
+mistake in the way the system has been put together and used.
+
+Good security is therefore a habit as much as a technology. It means choosing
+keys with care and keeping them secret, changing them when there is any reason
+to think they have been exposed, checking that every message really comes from
+the person it claims to come from, and never trusting a method just because it
+looks complicated. The people who design and use these systems should know how
+the older ciphers were broken, because the same kind of thinking is still used
+to find the weak points in the systems we depend on every day.
+"""
+
+
+def letter_values(text):
+    """Return the ASCII letters of text as a list of 0-25 values"""
+    if not isinstance(text, str):
+        text = bytes(text).decode("latin-1")
+    return [ord(c) - 97 for c in re.sub(r"[^a-z]", "", text.lower())]
+
+
+class QuadgramModel:
+    """
+    log10 quadgram probabilities of English.
+
+    Use QuadgramModel.from_text() / from_file() or default_model().
+    """
+
+    def __init__(self, counts):
+        counts = {q: c for q, c in counts.items() if c > 0}
+        total = sum(counts.values())
+        if not total:
+            raise ValueError("Quadgram model needs at least one quadgram with a positive count")
+        self.floor = math.log10(0.01 / total)
+        self.logp = {q: math.log10(c / total) for q, c in counts.items()}
+        self._array = None
+
+    @classmethod
+    def from_text(cls, text):
+        """Train the model from English text"""
+        values = letter_values(text)
+        counts = {}
+        for i in range(len(values) - 3):
+            q = values[i] * 17576 + values[i + 1] * 676 + values[i + 2] * 26 + values[i + 3]
+            counts[q] = counts.get(q, 0) + 1
+        return cls(counts)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a 'QUAD COUNT' quadgram file (e.g. 'TION 13168375')"""
+        counts = {}
+        with open(path, "r", encoding="ascii") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 2 or len(parts[0]) != 4 or not parts[0].isalpha():
+                    continue
+                a, b, c, d = (ord(ch) - 65 for ch in parts[0].upper())
+                counts[a * 17576 + b * 676 + c * 26 + d] = int(parts[1])
+        if not any(c > 0 for c in counts.values()):
+            raise ValueError(f"No 'QUAD COUNT' lines with a positive count in {path}")
+        return cls(counts)
+
+    def array(self):
+        """Flat NumPy table of all 26^4 log10 probabilities (built once)"""
+        if self._array is None:
+            table = np.full(QUADGRAMS, self.floor, dtype=np.float32)
+            table[np.fromiter(self.logp.keys(), dtype=np.int64)] = np.fromiter(
+                self.logp.values(), dtype=np.float32)
+            self._array = table
+        return self._array
+
+    def score_values(self, values):
+        """Score a list of 0-25 letter values (pure Python)"""
+        logp = self.logp
+        floor = self.floor
+        score = 0.0
+        for i in range(len(values) - 3):
+            q = values[i] * 17576 + values[i + 1] * 676 + values[i + 2] * 26 + values[i + 3]
+            score += logp.get(q, floor)
+        return score
+
+    def score_batch(self, rows):
+        """
+        Score many equal-length texts at once.
+
+        Args:
+            rows: NumPy int array of shape (texts, letters), values 0-25
+
+        Returns:
+            NumPy array with one score per row
+        """
+        if rows.shape[1] < 4:
+            return np.zeros(rows.shape[0])
+        codes = rows[:, :-3] * 17576 + rows[:, 1:-2] * 676 + rows[:, 2:-1] * 26 + rows[:, 3:]
+        return self.array()[codes].sum(axis=1, dtype=np.float64)
+
+    def score(self, text):
+        """Score a text (higher = more like English)"""
+        return self.score_values(letter_values(text))
+
+
+_default_model = None
+
+
+def default_model(path=None):
+    """
+    Shared model, loaded once: from 'path' if given (first call only),
+    otherwise trained from SAMPLE_TEXT.
+    """
+    global _default_model
+    if _default_model is None:
+        if path:
+            _default_model = QuadgramModel.from_file(path)
+        else:
+            _default_model = QuadgramModel.from_text(SAMPLE_TEXT)
+    return _default_model
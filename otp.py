@@ -0,0 +1,83 @@
+# ===============================================================
+# ONE-TIME PAD - BYTES-LEVEL XOR ENGINE
+# ===============================================================
+# Libraries needed: numpy (optional, install with: pip install numpy)
+# Description: XORs any buffer (bytes, bytearray, memoryview, mmap,
+# array ...) with a pad of at least the same length.  Inputs are only
+# viewed through memoryview, never copied; the result is written
+# straight into an output buffer, which the caller may supply.
+#
+# With NumPy the XOR is one bitwise_xor call over the whole buffer.
+# Without it we XOR big blocks at once as Python integers, which still
+# works on thousands of bytes per operation instead of one.
+# ===============================================================
+
+from lazy import optional_module
+
+np = optional_module("numpy")  # None if missing, imported on first use
+
+# Block size for the pure Python (big integer) XOR
+XOR_BLOCK = 1 << 16
+
+
+def _byte_view(buffer):
+    """Flat unsigned-byte memoryview of any buffer (no copy)"""
+    view = memoryview(buffer)
+    if view.format != "B" or view.ndim != 1:
+        view = view.cast("B")
+    return view
+
+
+def otp_xor(data, key, out=None):
+    """
+    XOR data with the one-time pad key.
+
+    Args:
+        data: bytes-like object (bytes, bytearray, memoryview, mmap ...)
+        key: bytes-like pad, at least len(data) bytes (extra is ignored)
+        out: optional writable buffer of at least len(data) bytes;
+             may be data itself to encrypt in place
+
+    Returns:
+        out, or a new bytearray when out is not given
+    """
+    data = _byte_view(data)
+    key = _byte_view(key)
+    size = len(data)
+    if len(key) < size:
+        raise ValueError("Key must be at least as long as the message!")
+
+    if out is None:
+        out = bytearray(size)
+    target = _byte_view(out)
+    if target.readonly:
+        raise TypeError("Output buffer must be writable")
+    if len(target) < size:
+        raise ValueError("Output buffer is smaller than the message!")
+    if size == 0:
+        return out
+
+    if np is not None:
+        np.bitwise_xor(
+            np.frombuffer(data, dtype=np.uint8),
+            np.frombuffer(key[:size], dtype=np.uint8),
+            out=np.frombuffer(target[:size], dtype=np.uint8),
+        )
+        return out
+
+    for start in range(0, size, XOR_BLOCK):
+        stop = min(start + XOR_BLOCK, size)
+        a = int.from_bytes(data[start:stop], "little")
+        b = int.from_bytes(key[start:stop], "little")
+        target[start:stop] = (a ^ b).to_bytes(stop - start, "little")
+    return out
+
+
+def otp_encrypt_bytes(data, key, out=None):
+    """Encrypt a bytes-like message with a one-time pad"""
+    return otp_xor(data, key, out)
+
+
+def otp_decrypt_bytes(cipher, key, out=None):
+    """Decrypt a bytes-like cipher text (XOR is its own inverse)"""
+    return otp_xor(cipher, key, out)
@@ -0,0 +1,719 @@
+# ===============================================================
+# JOB SCHEDULER - KEYSPACE CHUNKS LEASED TO WORKERS OVER A SOCKET
+# ===============================================================
+# Libraries needed: socketserver, socket, json, threading (built-in);
+# pycryptodome for DES jobs
+# Description: Queues cracking jobs and shares them between any number of
+# worker processes, on this machine or on other hosts.
+#
+#   - a job (DES brute force as in breakingdes.py, or a multiplicative /
+#     affine key search as in labassignment1.py) is cut into keyspace
+#     chunks (key length, first index, stop index)
+#   - workers ask the coordinator for a lease on the next chunk, test it
+#     and report how many keys they tried and the hit, if any
+#   - a lease expires after LEASE_TIMEOUT seconds without a heartbeat,
+#     and immediately if the worker's connection drops; its chunk goes
+#     back to the front of the queue for the next worker
+#   - the first hit finishes the job: its queued chunks are dropped and
+#     workers still busy on it are told to stop at their next heartbeat
+#   - a worker that cannot test a chunk (an error, not a lost connection)
+#     reports it with "fail": the job fails with that error, and the
+#     worker goes on with other jobs
+#
+# Protocol: one JSON object per line, request then reply, over TCP
+# ("host:port") or a Unix socket (a path with a "/").  Worker requests
+# are lease / heartbeat / done / fail; clients use submit / status /
+# cancel / shutdown.
+#
+# Usage:
+#   python scheduler.py serve 127.0.0.1:7700
+#   python scheduler.py worker 127.0.0.1:7700          (once per core / host)
+#   python scheduler.py submit 127.0.0.1:7700 des QPmYtnxcXR7w3LgmlsAUIE6INgvEGts --wait
+#   python scheduler.py local --workers 4 affine "Rclla oaplx" --crib hello
+# ===============================================================
+
+import itertools
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import deque
+
+import breakingdes
+from classical_crack import KEYS, decrypt_with
+from desfilter import CandidateFilter, reduce_charset
+from keyspace import Keyspace
+
+# Keys per chunk (one lease)
+CHUNK_SIZE = 50000
+# Seconds a lease lives without a heartbeat
+LEASE_TIMEOUT = 30.0
+# Seconds between worker heartbeats (well below LEASE_TIMEOUT)
+HEARTBEAT_INTERVAL = 5.0
+# Keys tested between heartbeat-time checks in a worker
+CHECK_INTERVAL = 1024
+# Seconds a worker waits before asking again when there is no work
+IDLE_WAIT = 0.5
+
+
+class SchedulerError(Exception):
+    """Error reply from the coordinator"""
+
+
+# ---------------------------------------------------------------
+# Searches: how a job is cut into chunks and how a chunk is tested.
+# Built from the job spec on both sides (coordinator and worker).
+# ---------------------------------------------------------------
+
+class DesSearch:
+    """
+    DES-ECB brute force over short keys (breakingdes.brute_force_short).
+
+    Spec: {"type": "des", "ciphertext": hex or base64, "max_length": 6,
+    "min_length": 1, "charset": ..., "parity_reduction": true}
+    """
+
+    def __init__(self, spec):
+        self.ciphertext = breakingdes.decode_ciphertext(spec["ciphertext"])
+        if not CandidateFilter(self.ciphertext).valid:
+            raise ValueError(f"ciphertext length {len(self.ciphertext)} is not a multiple of 8")
+        charset = spec.get("charset", breakingdes.CHARSET)
+        self.charset = reduce_charset(charset) if spec.get("parity_reduction", True) else charset
+        self.lengths = range(spec.get("min_length", 1), spec.get("max_length", 6) + 1)
+        # Built here so a bad charset fails the submit, not every worker
+        self.keyspaces = {n: Keyspace(self.charset, n, pad_to=8) for n in self.lengths}
+        self.total = sum(len(keyspace) for keyspace in self.keyspaces.values())
+
+    def chunks(self, size):
+        for length in self.lengths:
+            total = len(self.charset) ** length
+            for start in range(0, total, size):
+                yield [length, start, min(start + size, total)]
+
+    def run(self, chunk, keep_going):
+        """
+        Test one chunk; keep_going() is called every CHECK_INTERVAL keys.
+
+        Returns:
+            (keys tested, hit dict or None)
+        """
+        # Same staged CandidateFilter path as try_decrypt_des, plus the
+        # English check that the brute force uses against false positives
+        breakingdes.ciphertext = self.ciphertext
+        length, start, stop = chunk
+        tested = 0
+        for index, key_buffer in enumerate(self.keyspaces[length].iter_range(start, stop), start):
+            if tested % CHECK_INTERVAL == 0 and tested and not keep_going():
+                break
+            tested += 1
+            result = breakingdes.check_key(key_buffer)
+            if result:
+                return tested, {"key": key_buffer[:length].decode(), "plaintext": result, "index": index}
+        return tested, None
+
+
+class ClassicalSearch:
+    """
+    Multiplicative / affine key search (labassignment1.brute_force_attack)
+    that stops at the first key whose decryption contains the crib.
+
+    Spec: {"type": "classical", "cipher": "affine", "ciphertext": ..., "crib": ...}
+    """
+
+    def __init__(self, spec):
+        self.cipher = spec["cipher"]
+        if self.cipher not in KEYS:
+            raise ValueError(f"unknown cipher {self.cipher!r}, expected one of {sorted(KEYS)}")
+        if not spec.get("crib"):
+            raise ValueError("a classical job needs a crib (a word the plaintext contains)")
+        self.ciphertext = spec["ciphertext"]
+        self.crib = spec["crib"].upper()
+        self.keys = KEYS[self.cipher]
+        self.total = len(self.keys)
+
+    def chunks(self, size):
+        for start in range(0, self.total, size):
+            yield [0, start, min(start + size, self.total)]
+
+    def run(self, chunk, keep_going):
+        _, start, stop = chunk
+        for index in range(start, stop):
+            plaintext = decrypt_with(self.ciphertext, self.cipher, self.keys[index])
+            if self.crib in plaintext.upper():
+                return index - start + 1, {"key": self.keys[index], "plaintext": plaintext, "index": index}
+        return stop - start, None
+
+
+SEARCHES = {"des": DesSearch, "classical": ClassicalSearch}
+
+
+def make_search(spec):
+    search = SEARCHES.get(spec.get("type"))
+    if search is None:
+        raise ValueError(f"unknown job type {spec.get('type')!r}, expected one of {sorted(SEARCHES)}")
+    return search(spec)
+
+
+# ---------------------------------------------------------------
+# Coordinator state
+# ---------------------------------------------------------------
+
+class Job:
+    """One submitted search: its chunk queue and progress"""
+
+    def __init__(self, job_id, spec, search, chunk_size):
+        self.id = job_id
+        self.spec = spec
+        self.search = search
+        self.status = "queued"
+        self.fresh = enumerate(search.chunks(chunk_size))
+        self.retry = deque()  # (chunk id, chunk) of expired leases
+        self.leases = set()
+        self.chunks_done = 0
+        self.tested = 0
+        self.reissued = 0
+        self.hit = None
+        self.failure = None  # error reported by a worker
+        self.created = time.time()
+        self.finished = None
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+    def next_chunk(self):
+        if self.retry:
+            return self.retry.popleft()
+        return next(self.fresh, None)
+
+    def state(self):
+        elapsed = (self.finished or time.time()) - self.created
+        return {
+            "id": self.id, "status": self.status, "spec": self.spec,
+            "tested": self.tested, "total": self.search.total,
+            "chunks_done": self.chunks_done, "leases": len(self.leases),
+            "reissued": self.reissued, "hit": self.hit, "failure": self.failure,
+            "seconds": elapsed, "keys_per_sec": self.tested / max(elapsed, 1e-9),
+        }
+
+
+class Lease:
+    __slots__ = ("id", "job", "chunk_id", "chunk", "worker", "deadline")
+
+    def __init__(self, lease_id, job, chunk_id, chunk, worker, deadline):
+        self.id = lease_id
+        self.job = job
+        self.chunk_id = chunk_id
+        self.chunk = chunk
+        self.worker = worker
+        self.deadline = deadline
+
+
+class Coordinator:
+    """
+    Thread-safe job queue; handle(message) answers one protocol request.
+
+    Args:
+        chunk_size: keys per lease (a job spec may override it)
+        lease_timeout: seconds a lease lives without a heartbeat
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE, lease_timeout=LEASE_TIMEOUT):
+        self.chunk_size = chunk_size
+        self.lease_timeout = lease_timeout
+        self.jobs = {}
+        self.leases = {}
+        self.stopping = False
+        self.lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+        self._lease_ids = itertools.count(1)
+
+    def submit(self, spec):
+        search = make_search(spec)  # validates the spec before queueing
+        chunk_size = spec.get("chunk_size", self.chunk_size)
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError(f"chunk_size must be a positive integer, got {chunk_size!r}")
+        if search.total <= 0:
+            raise ValueError("the job's key range is empty")
+        with self.lock:
+            job_id = next(self._job_ids)
+            job = self.jobs[job_id] = Job(job_id, spec, search, chunk_size)
+            if self._drained(job):
+                # Nothing to lease, so no done() will ever finish it
+                self._finish(job, "exhausted")
+        return {"job": job_id}
+
+    def lease(self, worker):
+        with self.lock:
+            if self.stopping:
+                return {"shutdown": True}
+            self._reap(time.monotonic())
+            for job in self.jobs.values():
+                if not job.active:
+                    continue
+                item = job.next_chunk()
+                if item is None:
+                    continue
+                chunk_id, chunk = item
+                lease = Lease(next(self._lease_ids), job, chunk_id, chunk, worker,
+                              time.monotonic() + self.lease_timeout)
+                self.leases[lease.id] = lease
+                job.leases.add(lease.id)
+                job.status = "running"
+                return {"lease": {"id": lease.id, "job": job.id, "spec": job.spec, "chunk": chunk,
+                                  "heartbeat": min(HEARTBEAT_INTERVAL, self.lease_timeout / 3)}}
+            return {"wait": IDLE_WAIT}
+
+    def heartbeat(self, lease_id):
+        with self.lock:
+            lease = self.leases.get(lease_id)
+            if lease is None or not lease.job.active:
+                return {"cancelled": True}  # expired and re-issued, or job over
+            lease.deadline = time.monotonic() + self.lease_timeout
+            return {"cancelled": False}
+
+    def done(self, lease_id, tested, hit=None):
+        with self.lock:
+            lease = self.leases.pop(lease_id, None)
+            if lease is None:
+                return {"ok": False}  # expired: the chunk was handed out again
+            job = lease.job
+            job.leases.discard(lease_id)
+            job.tested += tested
+            job.chunks_done += 1
+            if hit and job.active:
+                job.hit = hit
+                self._finish(job, "found")
+            elif job.active and not job.leases and not job.retry and self._drained(job):
+                self._finish(job, "exhausted")
+            return {"ok": True}
+
+    def fail(self, lease_id, error):
+        """A worker could not test its chunk: the job fails (re-issuing would fail again)"""
+        with self.lock:
+            lease = self.leases.pop(lease_id, None)
+            if lease is None:
+                return {"ok": False}
+            job = lease.job
+            job.leases.discard(lease_id)
+            if job.active:
+                job.failure = error
+                self._finish(job, "failed")
+            return {"ok": True}
+
+    def cancel(self, job_id):
+        with self.lock:
+            job = self._job(job_id)
+            if job.active:
+                self._finish(job, "cancelled")
+            return job.state()
+
+    def status(self, job_id=None):
+        with self.lock:
+            self._reap(time.monotonic())
+            if job_id is None:
+                return {"jobs": [job.state() for job in self.jobs.values()]}
+            return self._job(job_id).state()
+
+    def release_worker(self, worker):
+        """The worker's connection closed: re-issue its chunks now"""
+        with self.lock:
+            for lease in [lease for lease in self.leases.values() if lease.worker == worker]:
+                self._requeue(lease)
+
+    def handle(self, message):
+        """Dispatch one request dict; errors become {"error": ...}"""
+        op = message.get("op")
+        try:
+            if op == "lease":
+                return self.lease(message.get("worker"))
+            if op == "heartbeat":
+                return self.heartbeat(message["lease"])
+            if op == "done":
+                return self.done(message["lease"], message.get("tested", 0), message.get("hit"))
+            if op == "fail":
+                return self.fail(message["lease"], str(message.get("error")))
+            if op == "submit":
+                return self.submit(message["job"])
+            if op == "status":
+                return self.status(message.get("job"))
+            if op == "cancel":
+                return self.cancel(message["job"])
+            if op == "shutdown":
+                self.stopping = True
+                return {"ok": True}
+            return {"error": f"unknown op {op!r}"}
+        except (KeyError, TypeError, ValueError) as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    # -- internals (lock held) -----------------------------------
+
+    def _job(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"no job {job_id}")
+        return job
+
+    def _drained(self, job):
+        """True if the job has no fresh chunks left (peeks one ahead)"""
+        item = next(job.fresh, None)
+        if item is None:
+            return True
+        job.retry.appendleft(item)
+        return False
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished = time.time()
+        job.retry.clear()
+        job.fresh = iter(())
+        # Leases stay until done or expiry; heartbeats now answer "cancelled"
+
+    def _requeue(self, lease):
+        del self.leases[lease.id]
+        job = lease.job
+        job.leases.discard(lease.id)
+        if job.active:
+            job.retry.appendleft((lease.chunk_id, lease.chunk))
+            job.reissued += 1
+
+    def _reap(self, now):
+        for lease in [lease for lease in self.leases.values() if lease.deadline < now]:
+            self._requeue(lease)
+
+
+# ---------------------------------------------------------------
+# Network
+# ---------------------------------------------------------------
+
+def _is_unix(address):
+    """Unix socket paths contain a "/" (./sched.sock); anything else is host:port"""
+    return "/" in address
+
+
+def _split_tcp(address):
+    host, sep, port = address.rpartition(":")
+    if not sep:
+        raise ValueError(f"address {address!r} is neither host:port nor a socket path "
+                         f"(write ./{address} for a socket in this directory)")
+    return host or "127.0.0.1", int(port)
+
+
+def _remove_stale_socket(path):
+    """Remove a socket left by an earlier run; refuse to replace anything else"""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    os.remove(path)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        coordinator = self.server.coordinator
+        workers = set()
+        try:
+            for line in self.rfile:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    reply = {"error": "invalid JSON"}
+                else:
+                    if message.get("worker"):
+                        workers.add(message["worker"])
+                    reply = coordinator.handle(message)
+                self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+                if coordinator.stopping and message.get("op") == "shutdown":
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+        except ConnectionError:
+            pass
+        finally:
+            for worker in workers:
+                coordinator.release_worker(worker)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def make_server(address, coordinator=None):
+    """
+    Bind a coordinator server ("host:port" = TCP, a path = Unix socket).
+    Call serve_forever() on the result; server.address is the bound
+    address (useful with port 0).
+    """
+    coordinator = coordinator or Coordinator()
+    if _is_unix(address):
+        _remove_stale_socket(address)
+        server = _UnixServer(address, _Handler)
+        server.address = address
+    else:
+        server = _TCPServer(_split_tcp(address), _Handler)
+        host, port = server.server_address[:2]
+        server.address = f"{host}:{port}"
+    server.coordinator = coordinator
+    return server
+
+
+class Client:
+    """Connection to a coordinator; request() sends one message, returns the reply"""
+
+    def __init__(self, address, timeout=None):
+        if _is_unix(address):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(address)
+        else:
+            self.sock = socket.create_connection(_split_tcp(address), timeout)
+        self.file = self.sock.makefile("rwb")
+
+    def request(self, op, **fields):
+        fields["op"] = op
+        self.file.write(json.dumps(fields).encode("utf-8") + b"\n")
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("coordinator closed the connection")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise SchedulerError(reply["error"])
+        return reply
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ---------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------
+
+def run_worker(address, worker_id=None):
+    """
+    Lease and test chunks until the coordinator shuts down.
+
+    Returns:
+        (chunks done, keys tested)
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    chunks = tested = 0
+    search_job, search = None, None
+    with Client(address) as client:
+        while True:
+            reply = client.request("lease", worker=worker_id)
+            if reply.get("shutdown"):
+                return chunks, tested
+            if "wait" in reply:
+                time.sleep(reply["wait"])
+                continue
+            lease = reply["lease"]
+            if lease["job"] != search_job:
+                try:
+                    search_job, search = lease["job"], make_search(lease["spec"])
+                except Exception as e:
+                    client.request("fail", lease=lease["id"], error=f"{type(e).__name__}: {e}")
+                    continue
+
+            next_beat = time.monotonic() + lease["heartbeat"]
+
+            def keep_going():
+                nonlocal next_beat
+                if time.monotonic() < next_beat:
+                    return True
+                next_beat = time.monotonic() + lease["heartbeat"]
+                return not client.request("heartbeat", lease=lease["id"])["cancelled"]
+
+            try:
+                count, hit = search.run(lease["chunk"], keep_going)
+            except (ConnectionError, OSError):
+                raise  # coordinator gone (heartbeat failed)
+            except Exception as e:
+                # One bad job must not take the worker (and the pool) down
+                client.request("fail", lease=lease["id"], error=f"{type(e).__name__}: {e}")
+                continue
+            client.request("done", lease=lease["id"], tested=count, hit=hit)
+            chunks += 1
+            tested += count
+
+
+def _worker_process(address):
+    try:
+        run_worker(address)
+    except (ConnectionError, OSError):
+        pass  # coordinator gone
+
+
+# ---------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------
+
+def job_spec(args):
+    """Job spec dict from the submit / local arguments"""
+    if args.kind == "des":
+        spec = {"type": "des", "ciphertext": args.ciphertext, "min_length": args.min_length,
+                "max_length": args.max_length, "parity_reduction": not args.no_parity_reduction}
+        if args.charset:
+            spec["charset"] = args.charset
+    else:
+        spec = {"type": "classical", "cipher": args.kind, "ciphertext": args.ciphertext, "crib": args.crib}
+    if args.chunk_size is not None:
+        spec["chunk_size"] = args.chunk_size
+    return spec
+
+
+def wait_for(client, job_id, interval=0.5):
+    """Poll a job until it is over, showing progress; returns its final state"""
+    from metrics import Metrics
+
+    metrics = Metrics(f"job {job_id}")
+    state = client.request("status", job=job_id)
+    keys = metrics.counter("keys", total=state["total"])
+    with metrics.progress(keys):
+        while state["status"] in ("queued", "running"):
+            time.sleep(interval)
+            state = client.request("status", job=job_id)
+            keys.value = state["tested"]
+    return state
+
+
+def _print_state(state):
+    hit = state["hit"]
+    print(f"Job {state['id']}: {state['status']} after {state['tested']:,}/{state['total']:,} keys "
+          f"in {state['seconds']:.1f}s ({state['keys_per_sec']:,.0f} keys/sec, "
+          f"{state['reissued']} chunks re-issued)")
+    if hit:
+        print(f"Key: {hit['key']}")
+        print(f"Plaintext: {hit['plaintext']}")
+    if state.get("failure"):
+        print(f"Failure: {state['failure']}")
+
+
+def _add_job_args(parser):
+    parser.add_argument("kind", choices=["des", "multiplicative", "affine"])
+    parser.add_argument("ciphertext", help="hex / base64 for des, text otherwise")
+    parser.add_argument("--max-length", type=int, default=6, help="des: longest key")
+    parser.add_argument("--min-length", type=int, default=1, help="des: shortest key")
+    parser.add_argument("--charset", help="des: key characters (default: a-z0-9)")
+    parser.add_argument("--no-parity-reduction", action="store_true")
+    parser.add_argument("--crib", help="multiplicative / affine: a word the plaintext contains")
+    parser.add_argument("--chunk-size", type=int, help=f"keys per lease (default: {CHUNK_SIZE})")
+
+
+if __name__ == "__main__":
+    import argparse
+    import multiprocessing
+    import sys
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Distributed cracking job scheduler")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("serve", help="run the coordinator")
+    p.add_argument("address", help="host:port or Unix socket path")
+    p.add_argument("--lease-timeout", type=float, default=LEASE_TIMEOUT)
+
+    p = sub.add_parser("worker", help="run one worker")
+    p.add_argument("address")
+
+    p = sub.add_parser("submit", help="queue a job")
+    p.add_argument("address")
+    _add_job_args(p)
+    p.add_argument("--wait", action="store_true", help="show progress until the job ends")
+
+    for name in ("status", "cancel"):
+        p = sub.add_parser(name, help=f"{name} a job (status without a job: all jobs)")
+        p.add_argument("address")
+        p.add_argument("job", type=int, nargs="?" if name == "status" else None)
+
+    p = sub.add_parser("shutdown", help="stop the coordinator and its workers")
+    p.add_argument("address")
+
+    p = sub.add_parser("local", help="coordinator + worker processes on this machine, one job")
+    p.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    _add_job_args(p)
+    args = parser.parse_args()
+
+    try:
+        if args.command == "serve":
+            server = make_server(args.address, Coordinator(lease_timeout=args.lease_timeout))
+            print(f"Coordinator listening on {server.address}", file=sys.stderr)
+            with server:
+                server.serve_forever()
+
+        elif args.command == "worker":
+            chunks, tested = run_worker(args.address)
+            print(f"Worker done: {chunks} chunks, {tested:,} keys", file=sys.stderr)
+
+        elif args.command == "submit":
+            with Client(args.address) as client:
+                job_id = client.request("submit", job=job_spec(args))["job"]
+                print(f"Submitted job {job_id}")
+                if args.wait:
+                    _print_state(wait_for(client, job_id))
+
+        elif args.command in ("status", "cancel"):
+            with Client(args.address) as client:
+                if args.command == "cancel":
+                    _print_state(client.request("cancel", job=args.job))
+                elif args.job is None:
+                    for state in client.request("status")["jobs"]:
+                        _print_state(state)
+                else:
+                    _print_state(client.request("status", job=args.job))
+
+        elif args.command == "shutdown":
+            with Client(args.address) as client:
+                client.request("shutdown")
+
+        else:  # local
+            spec = job_spec(args)
+            tmpdir = tempfile.mkdtemp()
+            address = os.path.join(tmpdir, "scheduler.sock") if hasattr(socket, "AF_UNIX") else "127.0.0.1:0"
+            server = make_server(address)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            with Client(server.address) as client:
+                # Submit first: a rejected spec must not leave workers waiting
+                try:
+                    job_id = client.request("submit", job=spec)["job"]
+                except SchedulerError:
+                    server.server_close()
+                    if _is_unix(server.address):
+                        os.remove(server.address)
+                    os.rmdir(tmpdir)
+                    raise
+                workers = [multiprocessing.Process(target=_worker_process, args=(server.address,))
+                           for _ in range(args.workers)]
+                for w in workers:
+                    w.start()
+                state = wait_for(client, job_id)
+                client.request("shutdown")
+            for w in workers:
+                w.join()
+            server.server_close()
+            if _is_unix(server.address):
+                os.remove(server.address)
+            os.rmdir(tmpdir)
+            _print_state(state)
+    except SchedulerError as e:
+        parser.exit(1, f"scheduler: {e}\n")
+    except (ValueError, FileExistsError) as e:
+        parser.exit(1, f"scheduler: {e}\n")
+    except (ConnectionError, FileNotFoundError) as e:
+        parser.exit(1, f"scheduler: cannot reach the coordinator ({e})\n")
@@ -0,0 +1,170 @@
+# ===============================================================
+# SUBSTITUTION ENGINE - TABLE-DRIVEN CAESAR / MULTIPLICATIVE / AFFINE
+# ===============================================================
+# Libraries needed: None (uses built-in Python functions)
+# Description: Caesar, multiplicative and affine ciphers are all the
+# same letter map  x -> (a * x + b) % 26.  Instead of running
+# ord/isalpha/chr for every character, we build the translation table
+# once per (a, b) key and let str.translate / bytes.translate apply it
+# in a single pass written in C.
+#
+#   Caesar         : a = 1,   b = shift
+#   Multiplicative : a = key, b = 0
+#   Affine         : a = a,   b = b
+#
+# Decryption is just another affine map (see affine_inverse), so it
+# shares the same cached tables.
+#
+# Every function also takes an optional 'alphabet' (see alphabet.py):
+# then the map works on that alphabet's positions modulo its size
+# instead of on the 26 letters.
+# ===============================================================
+
+from functools import lru_cache
+
+from alphabet import mod_inverse as _egcd_inverse
+
+# How many (a, b, mode) tables to keep around (least recently used
+# tables are evicted first)
+TABLE_CACHE_SIZE = 256
+
+# Which base letter a character is shifted against:
+#   "mixed" - 'A' for uppercase letters, 'a' for everything else
+#             (cipherss.py, Labassignment2.py)
+#   "upper" - always 'A' (labassignment1.py works on upper-cased text)
+#   "lower" - always 'a' (firstcipher.py)
+MODES = ("mixed", "upper", "lower")
+
+
+def mod_inverse(a, m=26):
+    """Return the multiplicative inverse of a modulo m, or None (extended Euclid)"""
+    return _egcd_inverse(a, m)
+
+
+def affine_inverse(a, b, m=26):
+    """
+    Return the (a, b) pair that undoes the affine map x -> (a * x + b) % m.
+
+    Since y = a*x + b, we get x = a_inv * (y - b) = a_inv*y - a_inv*b.
+    """
+    a_inv = mod_inverse(a, m)
+    if a_inv is None:
+        raise ValueError("No multiplicative inverse exists for this key!")
+    return a_inv, (-a_inv * b) % m
+
+
+def _letter_base(ch, mode):
+    """Return ord() of the letter that 'ch' is counted from"""
+    if mode == "upper":
+        return 65
+    if mode == "lower":
+        return 97
+    return 65 if ch.isupper() else 97
+
+
+class _StrTable(dict):
+    """
+    str.translate table for one affine key.
+
+    ASCII is filled in up front.  Any other character is worked out the
+    first time it is seen (via __missing__) and then remembered, so
+    non-ASCII letters are still handled exactly like the old per-character
+    loops did (str.isalpha is Unicode aware).
+    """
+
+    def __init__(self, a, b, mode):
+        super().__init__()
+        self.a = a
+        self.b = b
+        self.mode = mode
+        for code in range(128):
+            self[code] = self._map(code)
+
+    def _map(self, code):
+        ch = chr(code)
+        if not ch.isalpha():
+            return code  # keep non-alphabetic characters same
+        base = _letter_base(ch, self.mode)
+        return (self.a * (code - base) + self.b) % 26 + base
+
+    def __missing__(self, code):
+        value = self._map(code)
+        self[code] = value
+        return value
+
+
+def _bytes_table(a, b, mode):
+    """Build the 256-entry bytes.translate table (ASCII letters only)"""
+    table = bytearray(range(256))
+    for code in range(256):
+        ch = chr(code)
+        if ch.isascii() and ch.isalpha():
+            base = _letter_base(ch, mode)
+            table[code] = (a * (code - base) + b) % 26 + base
+    return bytes(table)
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def affine_tables(a, b, mode="mixed"):
+    """
+    Return the (str table, bytes table) pair for x -> (a * x + b) % 26.
+
+    Results are cached, so each key only pays for its tables once.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+    return _StrTable(a, b, mode), _bytes_table(a, b, mode)
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def alphabet_tables(a, b, alphabet):
+    """
+    Return the (str table, bytes table) pair for x -> (a * x + b) % m over
+    an Alphabet.  The bytes table is None if the alphabet has symbols
+    outside latin-1 (bytes input cannot be supported then).
+    """
+    str_table = alphabet.affine_map(a, b)
+    if not alphabet.single_byte:
+        return str_table, None
+    table = bytearray(range(256))
+    for code, value in str_table.items():
+        table[code] = value
+    return str_table, bytes(table)
+
+
+def affine_translate(data, a, b, mode="mixed", alphabet=None):
+    """
+    Apply x -> (a * x + b) % 26 to every letter of data in one pass.
+
+    Args:
+        data: str, bytes, bytearray or memoryview
+        a, b: the affine key
+        mode: which base letter to count from (see MODES)
+        alphabet: Alphabet to work over instead (mode is then ignored);
+                  symbols outside it are kept unchanged
+
+    Returns:
+        Same type as data (memoryview input gives bytes)
+    """
+    if alphabet is None:
+        str_table, bytes_table = affine_tables(a % 26, b % 26, mode)
+    else:
+        m = alphabet.size
+        str_table, bytes_table = alphabet_tables(a % m, b % m, alphabet)
+    if isinstance(data, str):
+        return data.translate(str_table)
+    if bytes_table is None:
+        raise ValueError(f"{alphabet!r} has non-latin-1 symbols, bytes input is not supported")
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return data.translate(bytes_table)
+
+
+def caesar_translate(data, shift, mode="mixed", alphabet=None):
+    """Shift every letter of data by 'shift' positions"""
+    return affine_translate(data, 1, shift, mode, alphabet)
+
+
+def multiplicative_translate(data, key, mode="mixed", alphabet=None):
+    """Multiply every letter position of data by 'key'"""
+    return affine_translate(data, key, 0, mode, alphabet)
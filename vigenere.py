@@ -0,0 +1,287 @@
+# ===============================================================
+# VIGENÈRE ENGINE - VECTORIZED BACKEND WITH PURE PYTHON FALLBACK
+# ===============================================================
+# Libraries needed: numpy (optional, install with: pip install numpy)
+# Description: Vigenère shifts the n-th letter of the text by the
+# (n % len(key))-th key letter; non-letters are copied and do NOT
+# advance the key.  With NumPy we find all letters with a mask, get each
+# letter's key phase from a cumulative count of the letters before it,
+# and shift every letter with one array expression.
+#
+# Without NumPy (or for short inputs / non-ASCII text, where Unicode
+# str.isalpha rules apply) the pure Python loop is used instead.  Both
+# paths give exactly the same output as the original cipherss.py loops.
+#
+# VigenereStream / vigenere_stream / vigenere_file process input chunk
+# by chunk and carry the key position across chunks, so output does not
+# depend on where the chunk boundaries fall and memory stays constant.
+#
+# An optional 'alphabet' (see alphabet.py) replaces the 26 letters: only
+# its symbols are shifted (modulo its size) and advance the key.
+# ===============================================================
+
+from lazy import optional_module
+
+np = optional_module("numpy")  # None if missing, imported on first use
+
+# Below this many characters the Python loop beats NumPy's setup cost
+NUMPY_THRESHOLD = 4096
+
+
+def key_shifts(key, decrypt=False, alphabet=None):
+    """Return the shift (0-25) for every key letter ('a' = 0)"""
+    if alphabet is not None:
+        m = alphabet.size
+        shifts = alphabet.key_shifts(key)
+        return [-s % m for s in shifts] if decrypt else shifts
+    shifts = [ord(k) - ord('a') for k in key.lower()]
+    if decrypt:
+        return [-s % 26 for s in shifts]
+    return [s % 26 for s in shifts]
+
+
+def _transform_str(text, shifts, start):
+    """Pure Python Vigenère over a str (Unicode aware, like the original)"""
+    result = []
+    klen = len(shifts)
+    key_index = start
+    for ch in text:
+        if ch.isalpha():
+            base = 65 if ch.isupper() else 97
+            result.append(chr((ord(ch) - base + shifts[key_index % klen]) % 26 + base))
+            key_index += 1
+        else:
+            result.append(ch)
+    return "".join(result), key_index
+
+
+def _transform_bytes(data, shifts, start):
+    """Pure Python Vigenère over bytes (ASCII letters only)"""
+    result = bytearray(data)
+    klen = len(shifts)
+    key_index = start
+    for i, c in enumerate(result):
+        if 65 <= c <= 90:
+            result[i] = (c - 65 + shifts[key_index % klen]) % 26 + 65
+            key_index += 1
+        elif 97 <= c <= 122:
+            result[i] = (c - 97 + shifts[key_index % klen]) % 26 + 97
+            key_index += 1
+    return bytes(result), key_index
+
+
+def _transform_numpy(data, shifts, start):
+    """Vectorized Vigenère over a bytes-like object (ASCII letters only)"""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    folded = buf | 0x20  # 'A'-'Z' -> 'a'-'z'
+    letters = folded >= 97
+    letters &= folded <= 122
+    positions = np.flatnonzero(letters)
+    count = len(positions)
+    if count == 0:
+        return bytes(data), start
+
+    # Key phase of a letter = cumulative count of letters before it
+    # (+ start).  Non-letters are not in 'positions', so the n-th letter
+    # always has phase start + n: the key just repeats over the letters.
+    klen = len(shifts)
+    key = np.roll(np.asarray(shifts, dtype=np.uint8), -(start % klen))
+    shift = np.tile(key, count // klen + 1)[:count]
+
+    chars = buf[positions]
+    case = chars & 0x20  # 0x20 for lowercase, 0 for uppercase
+    x = chars & 0x1f     # A/a = 1 ... Z/z = 26
+    x -= 1
+    x += shift           # 0 ... 50
+    # (x % 26): if x < 26, x - 26 wraps around to >= 230 so min() keeps x
+    np.minimum(x, x - 26, out=x)
+    x += 65
+    x |= case
+
+    out = buf.copy()
+    out[positions] = x
+    return out.tobytes(), start + count
+
+
+def _transform_alphabet(text, shifts, start, alphabet):
+    """Pure Python Vigenère over a str using an Alphabet"""
+    index = alphabet.index
+    rows = alphabet.rows
+    m = alphabet.size
+    result = []
+    klen = len(shifts)
+    key_index = start
+    for ch in text:
+        hit = index.get(ch)
+        if hit is None:
+            result.append(ch)
+        else:
+            row, pos = hit
+            result.append(rows[row][(pos + shifts[key_index % klen]) % m])
+            key_index += 1
+    return "".join(result), key_index
+
+
+# Per-alphabet NumPy lookup arrays, built once
+_alphabet_arrays = {}
+
+
+def _lookup_arrays(alphabet):
+    """(position of every byte or -1, row of every byte, rows x size symbol codes)"""
+    if alphabet not in _alphabet_arrays:
+        position = np.full(256, -1, dtype=np.int16)
+        row_of = np.zeros(256, dtype=np.intp)
+        for ch, (row, pos) in alphabet.index.items():
+            position[ord(ch)] = pos
+            row_of[ord(ch)] = row
+        symbols = np.asarray([[ord(ch) for ch in row] for row in alphabet.rows], dtype=np.uint8)
+        _alphabet_arrays[alphabet] = (position, row_of, symbols)
+    return _alphabet_arrays[alphabet]
+
+
+def _transform_alphabet_numpy(data, shifts, start, alphabet):
+    """Vectorized Vigenère over bytes using a single-byte Alphabet"""
+    position, row_of, symbols = _lookup_arrays(alphabet)
+    buf = np.frombuffer(data, dtype=np.uint8)
+    pos = position[buf]
+    positions = np.flatnonzero(pos >= 0)
+    count = len(positions)
+    if count == 0:
+        return bytes(data), start
+
+    klen = len(shifts)
+    key = np.roll(np.asarray(shifts, dtype=np.int16), -(start % klen))
+    x = pos[positions] + np.tile(key, count // klen + 1)[:count]
+    x %= alphabet.size
+
+    out = buf.copy()
+    out[positions] = symbols[row_of[buf[positions]], x]
+    return out.tobytes(), start + count
+
+
+def vigenere_transform(data, key, decrypt=False, start=0, alphabet=None):
+    """
+    Encrypt (or decrypt) data with the Vigenère key.
+
+    Args:
+        data: str, bytes, bytearray or memoryview
+        key: the keyword (only its letters' positions matter)
+        decrypt: shift backwards instead of forwards
+        start: key position of the first letter in data
+        alphabet: Alphabet to work over instead of the 26 letters
+                  (key symbols must then be in the alphabet)
+
+    Returns:
+        (result, next key position) - result is str for str input,
+        bytes otherwise
+    """
+    return _transform(data, key_shifts(key, decrypt, alphabet), start, alphabet)
+
+
+def _transform(data, shifts, start, alphabet=None):
+    """Pick the fastest backend for data"""
+    use_numpy = np is not None and shifts and len(data) >= NUMPY_THRESHOLD
+    if alphabet is not None:
+        return _transform_with(data, shifts, start, alphabet, use_numpy)
+
+    if isinstance(data, str):
+        if use_numpy and data.isascii():
+            result, key_index = _transform_numpy(data.encode("ascii"), shifts, start)
+            return result.decode("ascii"), key_index
+        return _transform_str(data, shifts, start)
+
+    if use_numpy:
+        return _transform_numpy(data, shifts, start)
+    return _transform_bytes(data, shifts, start)
+
+
+def _transform_with(data, shifts, start, alphabet, use_numpy):
+    """_transform() for an Alphabet"""
+    if isinstance(data, str):
+        if use_numpy and alphabet.single_byte and data.isascii():
+            result, key_index = _transform_alphabet_numpy(data.encode("ascii"), shifts, start, alphabet)
+            return result.decode("ascii"), key_index
+        return _transform_alphabet(data, shifts, start, alphabet)
+
+    if not alphabet.single_byte:
+        raise ValueError(f"{alphabet!r} has non-latin-1 symbols, bytes input is not supported")
+    if use_numpy:
+        return _transform_alphabet_numpy(data, shifts, start, alphabet)
+    result, key_index = _transform_alphabet(bytes(data).decode("latin-1"), shifts, start, alphabet)
+    return result.encode("latin-1"), key_index
+
+
+def vigenere_encrypt(data, key, alphabet=None):
+    """Encrypt data using Vigenère cipher"""
+    return vigenere_transform(data, key, alphabet=alphabet)[0]
+
+
+def vigenere_decrypt(data, key, alphabet=None):
+    """Decrypt data using Vigenère cipher"""
+    return vigenere_transform(data, key, decrypt=True, alphabet=alphabet)[0]
+
+
+# ===============================================================
+# STREAMING
+# ===============================================================
+
+# Default read size for files (1 MB)
+CHUNK_SIZE = 1 << 20
+
+
+class VigenereStream:
+    """
+    Incremental Vigenère encryptor / decryptor.
+
+    Feed it chunks with update(); the key position is carried from one
+    chunk to the next, so
+
+        stream.update(a) + stream.update(b) == vigenere_encrypt(a + b, key)
+
+    for any split of the text.  Chunks may be str or bytes (bytes only
+    shift ASCII letters, exactly like the one-shot functions do).
+    """
+
+    def __init__(self, key, decrypt=False, alphabet=None):
+        self.shifts = key_shifts(key, decrypt, alphabet)
+        self.alphabet = alphabet
+        self.position = 0  # number of letters processed so far
+
+    def update(self, chunk):
+        """Transform the next chunk and return the result"""
+        result, self.position = _transform(chunk, self.shifts, self.position, self.alphabet)
+        return result
+
+
+def iter_chunks(fileobj, chunk_size=CHUNK_SIZE):
+    """Yield chunks read from a file object until EOF"""
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def vigenere_stream(chunks, key, decrypt=False, alphabet=None):
+    """Generator: transform an iterable of chunks one chunk at a time"""
+    stream = VigenereStream(key, decrypt, alphabet)
+    for chunk in chunks:
+        yield stream.update(chunk)
+
+
+def vigenere_file(src, dst, key, decrypt=False, chunk_size=CHUNK_SIZE, alphabet=None):
+    """
+    Encrypt (or decrypt) the file at path src into path dst.
+
+    Files are processed as bytes, so only ASCII letters are shifted.
+    Only one chunk is held in memory at a time.
+
+    Returns:
+        Number of bytes written
+    """
+    written = 0
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        for block in vigenere_stream(iter_chunks(fin, chunk_size), key, decrypt, alphabet):
+            fout.write(block)
+            written += len(block)
+    return written
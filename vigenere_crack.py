@@ -0,0 +1,294 @@
+# ===============================================================
+# VIGENÈRE CRACKER - KEY LENGTH + KEY RECOVERY FROM STATISTICS
+# ===============================================================
+# Libraries needed: numpy (optional, install with: pip install numpy)
+# Description: Breaks a Vigenère ciphertext without the key.
+#
+#   1. Key length - for every candidate length L the letters are split
+#      into L columns (column = letter number % L).  With the right L
+#      every column is a plain Caesar shift of English, so its index of
+#      coincidence (IoC) is close to English (~0.066) instead of random
+#      (~0.038).  Kasiski analysis adds evidence: distances between
+#      repeated trigrams tend to be multiples of the key length.
+#   2. Key letters - each column is decrypted with all 26 shifts and the
+#      shift whose letter counts are closest to English (lowest
+#      chi-squared) gives that key letter.
+#
+# With NumPy the histograms for ALL candidate lengths come from a single
+# bincount, Kasiski distances come from one sort of the trigram codes and
+# the chi-squared scores for all columns x shifts are one array expression.
+# Without NumPy the same statistics are computed with plain Python.
+# Non-letters do not advance the key, exactly like vigenere.py.
+# ===============================================================
+
+from lazy import optional_module
+from metrics import Metrics
+from vigenere import vigenere_decrypt
+
+np = optional_module("numpy")  # None if missing, imported on first use
+
+# Relative letter frequencies of English text (a-z)
+ENGLISH_FREQ = [
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015,
+    0.06094, 0.06966, 0.00153, 0.00772, 0.04025, 0.02406, 0.06749,
+    0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056, 0.02758,
+    0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+]
+ENGLISH_IOC = sum(f * f for f in ENGLISH_FREQ)  # ~0.066
+RANDOM_IOC = 1 / 26                              # ~0.038
+
+MAX_KEY_LENGTH = 40
+# Letters used for the key length statistics (plenty for a stable estimate)
+SAMPLE_LETTERS = 50000
+# Weight of the Kasiski evidence next to the IoC score
+KASISKI_WEIGHT = 0.5
+# Fewest letters per column for a candidate length to be considered
+MIN_COLUMN_LETTERS = 8
+
+
+# ---------------------------------------------------------------
+# Letter extraction
+# ---------------------------------------------------------------
+
+def _letters_numpy(text):
+    """Letter values 0-25 of an ASCII str / bytes as a NumPy array"""
+    data = text.encode("ascii") if isinstance(text, str) else bytes(text)
+    folded = np.frombuffer(data, dtype=np.uint8) | 0x20
+    return (folded[(folded >= 97) & (folded <= 122)] - 97).astype(np.int64)
+
+
+def _letters_python(text):
+    """
+    Letter values 0-25 as a list.  Non-ASCII letters still advance the
+    key (str.isalpha), so they are kept as -1 and ignored by the stats.
+    """
+    if not isinstance(text, str):
+        text = bytes(text).decode("latin-1")
+    values = []
+    for ch in text:
+        if ch.isalpha():
+            values.append(ord(ch.lower()) - 97 if ch.isascii() else -1)
+    return values
+
+
+def _use_numpy(text):
+    return np is not None and (not isinstance(text, str) or text.isascii())
+
+
+# ---------------------------------------------------------------
+# Key length: index of coincidence + Kasiski
+# ---------------------------------------------------------------
+
+def _ioc_numpy(letters, lengths):
+    """Average column IoC for every length, from one bincount"""
+    lengths = np.asarray(lengths)
+    offsets = np.concatenate(([0], np.cumsum(lengths * 26)[:-1]))
+    positions = np.arange(len(letters))
+    # Bin of (length L, column pos % L, letter) for every L at once
+    bins = offsets[:, None] + (positions[None, :] % lengths[:, None]) * 26 + letters[None, :]
+    counts = np.bincount(bins.ravel(), minlength=int(np.sum(lengths * 26))).astype(np.float64)
+
+    scores = []
+    for L, start in zip(lengths, offsets):
+        hist = counts[start:start + L * 26].reshape(L, 26)
+        n = hist.sum(axis=1)
+        pairs = (hist * (hist - 1)).sum(axis=1)
+        valid = n > 1
+        scores.append(float(np.mean(pairs[valid] / (n[valid] * (n[valid] - 1)))) if valid.any() else 0.0)
+    return scores
+
+
+def _ioc_python(letters, lengths):
+    scores = []
+    for L in lengths:
+        columns = [[0] * 26 for _ in range(L)]
+        for i, value in enumerate(letters):
+            if value >= 0:
+                columns[i % L][value] += 1
+        total = 0.0
+        used = 0
+        for hist in columns:
+            n = sum(hist)
+            if n > 1:
+                total += sum(c * (c - 1) for c in hist) / (n * (n - 1))
+                used += 1
+        scores.append(total / used if used else 0.0)
+    return scores
+
+
+def _kasiski_numpy(letters, lengths):
+    """Fraction of repeated-trigram distances divisible by each length"""
+    if len(letters) < 4:
+        return [0.0] * len(lengths)
+    codes = letters[:-2] * 676 + letters[1:-1] * 26 + letters[2:]
+    order = np.argsort(codes, kind="stable")
+    ordered = codes[order]
+    repeat = ordered[1:] == ordered[:-1]
+    # Stable sort keeps equal trigrams in text order -> positive distances
+    distances = (order[1:] - order[:-1])[repeat]
+    if len(distances) == 0:
+        return [0.0] * len(lengths)
+    lengths = np.asarray(lengths)
+    divisible = (distances[:, None] % lengths[None, :] == 0).mean(axis=0)
+    return [float(d) for d in divisible]
+
+
+def _kasiski_python(letters, lengths):
+    last_seen = {}
+    distances = []
+    for i in range(len(letters) - 2):
+        a, b, c = letters[i], letters[i + 1], letters[i + 2]
+        if a < 0 or b < 0 or c < 0:
+            continue
+        code = a * 676 + b * 26 + c
+        if code in last_seen:
+            distances.append(i - last_seen[code])
+        last_seen[code] = i
+    if not distances:
+        return [0.0] * len(lengths)
+    return [sum(d % L == 0 for d in distances) / len(distances) for L in lengths]
+
+
+def estimate_key_length(text, max_length=MAX_KEY_LENGTH):
+    """
+    Rank candidate key lengths for a Vigenère ciphertext.
+
+    Returns:
+        List of (length, score, ioc, kasiski) tuples, best first.  The
+        score is the normalised IoC plus KASISKI_WEIGHT times how much
+        more often than chance (1/L) trigram distances divide by L.
+    """
+    if _use_numpy(text):
+        letters = _letters_numpy(text)[:SAMPLE_LETTERS]
+        ioc_func, kasiski_func = _ioc_numpy, _kasiski_numpy
+    else:
+        letters = _letters_python(text)[:SAMPLE_LETTERS]
+        ioc_func, kasiski_func = _ioc_python, _kasiski_python
+
+    # Columns with only a few letters give noisy IoC values
+    max_length = max(1, min(max_length, len(letters) // MIN_COLUMN_LETTERS))
+    lengths = list(range(1, max_length + 1))
+    iocs = ioc_func(letters, lengths)
+    kasiski = kasiski_func(letters, lengths)
+
+    ranking = []
+    for L, ioc, kas in zip(lengths, iocs, kasiski):
+        ioc_score = (ioc - RANDOM_IOC) / (ENGLISH_IOC - RANDOM_IOC)
+        kas_score = (kas - 1 / L) / (1 - 1 / L) if L > 1 else 0.0
+        ranking.append((L, ioc_score + KASISKI_WEIGHT * kas_score, ioc, kas))
+    ranking.sort(key=lambda r: r[1], reverse=True)
+    return ranking
+
+
+def _pick_length(ranking):
+    """
+    Multiples of the key length score as well as the key length itself,
+    so prefer the smallest divisor of the best length that scores nearly
+    as high.
+    """
+    best_length, best_score = ranking[0][0], ranking[0][1]
+    scores = {r[0]: r[1] for r in ranking}
+    for L in range(1, best_length + 1):
+        if best_length % L == 0 and scores.get(L, 0) >= 0.9 * best_score:
+            return L
+    return best_length
+
+
+# ---------------------------------------------------------------
+# Key letters: chi-squared against English
+# A column without letters gives no evidence: its key letter is 'a'
+# (no shift), and the text has no letters for it to change anyway.
+# ---------------------------------------------------------------
+
+def _recover_key_numpy(letters, length):
+    columns = np.arange(len(letters)) % length
+    hist = np.bincount(columns * 26 + letters, minlength=length * 26)
+    hist = hist.reshape(length, 26).astype(np.float64)
+
+    # observed[c, s, p] = count of plaintext letter p in column c under shift s
+    shift_index = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+    observed = hist[:, shift_index]
+    # Empty columns count as one letter to avoid 0/0; their observed
+    # counts are all 0, so every shift scores the same and 'a' wins
+    n = np.maximum(hist.sum(axis=1), 1)
+    expected = n[:, None, None] * np.asarray(ENGLISH_FREQ)[None, None, :]
+    chi2 = ((observed - expected) ** 2 / expected).sum(axis=2)
+    return "".join(chr(97 + s) for s in chi2.argmin(axis=1))
+
+
+def _recover_key_python(letters, length):
+    key = []
+    for column in range(length):
+        hist = [0] * 26
+        for value in letters[column::length]:
+            if value >= 0:
+                hist[value] += 1
+        n = sum(hist)
+        if n == 0:
+            key.append("a")
+            continue
+        best_shift, best_chi2 = 0, float("inf")
+        for shift in range(26):
+            chi2 = 0.0
+            for p, freq in enumerate(ENGLISH_FREQ):
+                expected = n * freq
+                chi2 += (hist[(p + shift) % 26] - expected) ** 2 / expected
+            if chi2 < best_chi2:
+                best_shift, best_chi2 = shift, chi2
+        key.append(chr(97 + best_shift))
+    return "".join(key)
+
+
+def recover_key(text, length):
+    """Return the most likely key of the given length"""
+    if _use_numpy(text):
+        return _recover_key_numpy(_letters_numpy(text), length)
+    return _recover_key_python(_letters_python(text), length)
+
+
+def crack_vigenere(text, max_length=MAX_KEY_LENGTH, metrics=None):
+    """
+    Find the key of a Vigenère ciphertext automatically.
+
+    Args:
+        metrics: metrics.Metrics recording the time of each step
+
+    Returns:
+        (key, plaintext) - plaintext has the same type as text
+    """
+    metrics = metrics or Metrics("crack_vigenere", progress=False)
+    metrics.counter("characters").add(len(text))
+    with metrics.stage("key length"):
+        ranking = estimate_key_length(text, max_length)
+    with metrics.stage("key letters"):
+        key = recover_key(text, _pick_length(ranking))
+    with metrics.stage("decrypt"):
+        plaintext = vigenere_decrypt(text, key)
+    metrics.info["key"] = key
+    return key, plaintext
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Vigenère cracker")
+    parser.add_argument("file", metavar="CIPHERTEXT_FILE")
+    parser.add_argument("--metrics-json", metavar="FILE",
+                        help="write per-stage timings here as JSON")
+    args = parser.parse_args()
+
+    with open(args.file, "r", encoding="utf-8") as f:
+        ciphertext = f.read()
+
+    started = time.perf_counter()
+    ranking = estimate_key_length(ciphertext)
+    print("Top key lengths (length, score, IoC, Kasiski):")
+    for length, score, ioc, kas in ranking[:5]:
+        print(f"  {length:3d}  {score:6.3f}  {ioc:.4f}  {kas:.3f}")
+    with Metrics("vigenere_crack") as metrics:
+        key, plaintext = crack_vigenere(ciphertext, metrics=metrics)
+    print(f"Key: {key}  ({time.perf_counter() - started:.3f}s)")
+    if args.metrics_json:
+        metrics.save_json(args.metrics_json)
+    print(plaintext[:500])
@@ -0,0 +1,123 @@
+# ===============================================================
+# WORDLIST STREAMING, MANGLING RULES AND BOUNDED-MEMORY DEDUPLICATION
+# ===============================================================
+# Libraries needed: hashlib, itertools, math (all built-in)
+# Description: Helpers for dictionary attacks with real wordlists (tens
+# of millions of lines):
+#
+#   iter_words()  - reads the file with a large buffer, one line at a
+#                   time, never loading the whole list
+#   mangle()      - lazily yields rule-based variants of a word
+#                   (case toggles, digit suffixes, leetspeak)
+#   BloomFilter   - remembers which keys were already tried in a fixed
+#                   amount of memory (a small false-positive rate means
+#                   an occasional candidate is skipped; past its capacity
+#                   that rate climbs quickly, so callers check .full)
+#   batched()     - groups candidates into lists for the tester
+# ===============================================================
+
+import hashlib
+import itertools
+import math
+
+# Read buffer for wordlist files (1 MB)
+READ_BUFFER = 1 << 20
+
+# a -> 4, e -> 3, i -> 1, o -> 0, s -> 5, t -> 7
+LEET_TABLE = bytes.maketrans(b"aeiostAEIOST", b"431057431057")
+
+
+def iter_words(path):
+    """Yield every non-empty line of a wordlist as bytes (no line ending)"""
+    with open(path, "rb", buffering=READ_BUFFER) as f:
+        for line in f:
+            word = line.rstrip(b"\r\n")
+            if word:
+                yield word
+
+
+def digit_suffixes(max_digits=2):
+    """All digit strings of 1..max_digits digits: 0-9, 00-99, ..."""
+    for width in range(1, max_digits + 1):
+        for n in range(10 ** width):
+            yield b"%0*d" % (width, n)
+
+
+def mangle(word, max_digits=2):
+    """
+    Yield 'word' and its rule-based variants (may contain duplicates).
+
+    Rules: original, lower, upper, capitalized, swapped case,
+    leetspeak, and lower / capitalized with digit suffixes.
+    """
+    lower = word.lower()
+    capital = word.capitalize()
+    yield word
+    yield lower
+    yield word.upper()
+    yield capital
+    yield word.swapcase()
+    yield lower.translate(LEET_TABLE)
+    for suffix in digit_suffixes(max_digits):
+        yield lower + suffix
+        yield capital + suffix
+
+
+def batched(iterable, size):
+    """Yield lists of up to 'size' items from iterable"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class BloomFilter:
+    """
+    Set membership in fixed memory.
+
+    Args:
+        capacity: expected number of distinct items
+        error_rate: chance that a new item is wrongly reported as seen
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        """Bit positions for item (double hashing over one blake2b digest)"""
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item):
+        """Add item; returns True if it was (probably) not seen before"""
+        new = False
+        bits = self.bits
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not bits[p >> 3] & mask:
+                bits[p >> 3] |= mask
+                new = True
+        self.count += new
+        return new
+
+    @property
+    def full(self):
+        """True once 'capacity' items were added (error_rate no longer holds)"""
+        return self.count >= self.capacity
+
+    def memory_bytes(self):
+        """Size of the bit array"""
+        return len(self.bits)